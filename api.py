@@ -0,0 +1,220 @@
+"""
+JSON scoring API for AI ATS Resume Rater
+FastAPI routes that return the analysis as structured JSON instead of the
+UI's Markdown report; server.py mounts them next to the Gradio UI:
+- POST /v1/score: one resume as a multipart upload (``file`` or ``text``),
+  JSON (``{"text"}`` or ``{"filename", "content_base64"}``) or a text/plain body
+- POST /v1/score/batch: several resumes (multipart ``files``/``text`` fields or
+  JSON ``{"resumes": [...]}``), analyzed with shared batched model calls
+- GET /v1/health: model readiness
+
+``job_description`` is a form/JSON field or query parameter. Request bodies may
+be gzip-compressed (``Content-Encoding: gzip``).
+"""
+
+import base64
+import binascii
+import json
+import time
+import zlib
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+
+import app as ats_app
+from config import API_CONFIG, UPLOAD_CONFIG
+from extraction import FileTooLargeError, UnsupportedFormatError, extract_text
+from metrics import REQUEST_SECONDS, profiler
+
+
+def _max_body_bytes():
+    return int(API_CONFIG.get("max_body_mb", 50) * 1024 * 1024)
+
+
+def _too_large():
+    return HTTPException(status_code=413, detail="Request body too large")
+
+
+def _gunzip_chunk(decompressor, chunk, remaining):
+    """Decompress the next chunk of a gzip body, refusing to inflate past ``remaining`` bytes"""
+    try:
+        data = decompressor.decompress(chunk, remaining + 1)
+    except zlib.error:
+        raise HTTPException(status_code=400, detail="Invalid gzip request body")
+    if len(data) > remaining or decompressor.unconsumed_tail:
+        raise _too_large()
+    return data
+
+
+class GzipRequest(Request):
+    """Request whose body (and therefore form data) is transparently gunzipped"""
+
+    async def body(self):
+        if not hasattr(self, "_decoded_body"):
+            limit = _max_body_bytes()
+            declared = self.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > limit:
+                raise _too_large()
+            encoding = self.headers.get("content-encoding", "identity").strip().lower()
+            if encoding not in ("gzip", "identity"):
+                raise HTTPException(status_code=415, detail=f"Unsupported Content-Encoding: {encoding}")
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == "gzip" else None
+            # Counted as chunks arrive, so chunked uploads without a Content-Length stop at the limit too
+            chunks = []
+            received = size = 0
+            async for chunk in self.stream():
+                received += len(chunk)
+                if received > limit:
+                    raise _too_large()
+                if decompressor is not None:
+                    chunk = _gunzip_chunk(decompressor, chunk, limit - size)
+                size += len(chunk)
+                if size > limit:
+                    raise _too_large()
+                chunks.append(chunk)
+            body = b"".join(chunks)
+            # form() reads the stream, which replays _body once it is set
+            self._body = self._decoded_body = body
+        return self._decoded_body
+
+
+class GzipRoute(APIRoute):
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def gzip_handler(request):
+            return await handler(GzipRequest(request.scope, request.receive))
+
+        return gzip_handler
+
+
+router = APIRouter(prefix="/v1", route_class=GzipRoute)
+
+
+async def _read_submissions(request, job_description):
+    """``([(resume_id, filename, text_or_bytes)], job_description)`` from any supported body"""
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    submissions = []
+
+    if content_type in ("multipart/form-data", "application/x-www-form-urlencoded"):
+        form = await request.form()
+        job_description = form.get("job_description") or job_description
+        for upload in form.getlist("file") + form.getlist("files"):
+            if isinstance(upload, UploadFile):
+                submissions.append((upload.filename, upload.filename, await upload.read()))
+        for text in form.getlist("text"):
+            submissions.append((None, None, text))
+
+    elif content_type == "application/json":
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        if not isinstance(payload, dict):
+            raise HTTPException(status_code=400, detail="Expected a JSON object")
+        job_description = payload.get("job_description") or job_description
+        entries = payload["resumes"] if "resumes" in payload else [payload]
+        if not isinstance(entries, list):
+            raise HTTPException(status_code=400, detail='"resumes" must be a list')
+        for entry in entries:
+            if not isinstance(entry, dict):
+                raise HTTPException(status_code=400, detail="Each resume must be a JSON object")
+            resume_id = entry.get("id", entry.get("filename"))
+            if "content_base64" in entry:
+                try:
+                    content = base64.b64decode(entry["content_base64"], validate=True)
+                except (binascii.Error, TypeError):
+                    raise HTTPException(status_code=400, detail=f"Invalid base64 content for {resume_id!r}")
+                submissions.append((resume_id, entry.get("filename"), content))
+            else:
+                submissions.append((resume_id, None, str(entry.get("text") or "")))
+
+    elif content_type in ("text/plain", ""):
+        submissions.append((None, None, body.decode("utf-8", errors="ignore")))
+
+    else:
+        raise HTTPException(status_code=415, detail=f"Unsupported Content-Type: {content_type}")
+
+    if not isinstance(job_description, str):
+        raise HTTPException(status_code=400, detail="job_description must be a string")
+    return submissions, job_description
+
+
+def _submission_text(filename, content):
+    """Extracted text of one submission, raising ValueError when it cannot be used"""
+    if isinstance(content, str):
+        max_chars = UPLOAD_CONFIG.get("max_text_length")
+        return content[:max_chars] if max_chars else content
+    try:
+        return extract_text(content, filename=filename)
+    except (UnsupportedFormatError, FileTooLargeError):
+        raise
+    except Exception as e:
+        raise ValueError(f"Could not read {filename or 'the file'}: {str(e)}")
+
+
+def score_submissions(submissions, job_description=""):
+    """One result dict per submission: app.build_report() fields or an ``error``.
+
+    Timed and (when armed) profiled per request, like app.analyze_resume().
+    """
+    started = time.perf_counter()
+    with profiler.profile("score_submissions"):
+        results = _score_submissions(submissions, job_description)
+    REQUEST_SECONDS.observe(
+        time.perf_counter() - started, outcome="error" if all("error" in r for r in results) else "ok"
+    )
+    return results
+
+
+def _score_submissions(submissions, job_description):
+    results = [None] * len(submissions)
+    ready = []
+    for i, (resume_id, filename, content) in enumerate(submissions):
+        try:
+            text = _submission_text(filename, content)
+        except ValueError as e:
+            results[i] = {"id": resume_id, "error": str(e)}
+            continue
+        if len(text.strip()) < ats_app.MIN_TEXT_LENGTH:
+            results[i] = {"id": resume_id, "error": "Could not extract enough text from the resume"}
+            continue
+        ready.append((i, text))
+
+    if ready:
+        reports = ats_app.score_texts([text for _, text in ready], job_description)
+        for (i, _), report in zip(ready, reports):
+            results[i] = {"id": submissions[i][0], **report}
+    return results
+
+
+@router.post("/score")
+async def score(request: Request, job_description: str = ""):
+    submissions, job_description = await _read_submissions(request, job_description)
+    if len(submissions) != 1:
+        raise HTTPException(status_code=400, detail="Send exactly one resume (use /v1/score/batch for several)")
+    # Analysis blocks, so it runs off the event loop that serves other connections
+    result = (await run_in_threadpool(score_submissions, submissions, job_description))[0]
+    if "error" in result:
+        raise HTTPException(status_code=422, detail=result["error"])
+    return result
+
+
+@router.post("/score/batch")
+async def score_batch(request: Request, job_description: str = ""):
+    submissions, job_description = await _read_submissions(request, job_description)
+    if not submissions:
+        raise HTTPException(status_code=400, detail="No resumes in the request")
+    max_items = API_CONFIG.get("max_batch_items", 100)
+    if len(submissions) > max_items:
+        raise HTTPException(status_code=413, detail=f"At most {max_items} resumes per batch")
+    results = await run_in_threadpool(score_submissions, submissions, job_description)
+    return {"results": results}
+
+
+@router.get("/health")
+def health():
+    return {"status": "ok", "models_ready": ats_app.models.is_ready(), "models": ats_app.models.status()}
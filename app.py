@@ -1,219 +1,310 @@
+import functools
 import gradio as gr
-import PyPDF2
-import docx
-import io
+import os
 import re
-import nltk
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-from config import MODEL_CONFIG
-from sklearn.feature_extraction.text import TfidfVectorizer
+import threading
+import time
+from collections import OrderedDict
+from chunking import token_windows
+from config import (ANALYSIS_CONFIG, APP_CONFIG, CACHE_CONFIG, INFERENCE_SERVER_CONFIG, JOB_MATCH_CONFIG,
+                    MODEL_CONFIG, SECTION_CASCADE_CONFIG, TAXONOMY_CONFIG, UI_CONFIG)
+from document import as_document
+from extraction import SUPPORTED_EXTENSIONS, error_message, extract_text
+from inference_server import MicroBatcher
+from jd_matching import JobMatcher
+from metrics import (MODEL_BATCH_SIZE, MODEL_SECONDS, PARAGRAPHS, REQUEST_SECONDS, SECTION_PARAGRAPHS,
+                     STAGE_RESULTS, STAGE_SECONDS, profiler, register_cache_metrics, register_model_metrics)
+from models import ModelRegistry
+from section_classifier import (create_section_engine, section_candidate_indices, HeaderSectionDetector,
+                                SECTION_LABELS)
+from result_cache import AnalysisCache, config_version, make_cache_key
+from scheduler import AnalysisScheduler, Stage
+from taxonomy import TaxonomyStore
 import numpy as np
 import warnings
 warnings.filterwarnings("ignore")
 
-# Download NLTK data (done once)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+# NLTK data is checked (and downloaded if missing) on first use, not at import
+def _load_sentiment_analyzer():
+    from inference_backends import load_pipeline
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
-
-# Initialize AI models
-print("Loading AI models...")
-sentiment_analyzer = pipeline(
-    "sentiment-analysis",
-    model=MODEL_CONFIG.get("sentiment_model", "cardiffnlp/twitter-roberta-base-sentiment-latest")
+    return load_pipeline(
+        "sentiment-analysis",
+        MODEL_CONFIG.get("sentiment_model", "cardiffnlp/twitter-roberta-base-sentiment-latest"),
+        MODEL_CONFIG
+    )
+
+# AI models are loaded on first use, or by warm-up after the UI launches
+models = ModelRegistry(retry_after=MODEL_CONFIG.get("load_retry_seconds", 300))
+models.register("sentiment", _load_sentiment_analyzer)
+models.register("sections", lambda: create_section_engine(MODEL_CONFIG))
+register_model_metrics(models)
+
+# Keyword taxonomy (scored categories, related keywords, aliases), recompiled when its file changes
+keyword_taxonomy = TaxonomyStore(TAXONOMY_CONFIG.get("path"), TAXONOMY_CONFIG.get("reload_interval", 5))
+
+# Vectorizes each job description once and scores resumes against it; each
+# batch passes the phrases of the taxonomy it runs with
+job_matcher = JobMatcher(
+    ngram_range=JOB_MATCH_CONFIG.get("ngram_range", (1, 2)),
+    max_cached_jobs=JOB_MATCH_CONFIG.get("max_cached_jobs", 32),
+    top_missing_terms=JOB_MATCH_CONFIG.get("top_missing_terms", 10),
+    phrases=keyword_taxonomy.current().phrases
 )
-classifier = pipeline(
-    "zero-shot-classification",
-    model=MODEL_CONFIG.get("classification_model", "facebook/bart-large-mnli")
+
+# Analysis result cache; the version changes whenever models or config do (and
+# that of the stages reading the taxonomy whenever it does, see stage_cache_key)
+ANALYSIS_VERSION = config_version(
+    APP_CONFIG.get("version"), MODEL_CONFIG, JOB_MATCH_CONFIG, ANALYSIS_CONFIG.get("segmenter"),
+    SECTION_CASCADE_CONFIG
 )
+analysis_cache = None
+if CACHE_CONFIG.get("enabled", True):
+    analysis_cache = AnalysisCache(
+        max_entries=CACHE_CONFIG.get("max_entries", 512),
+        max_memory_mb=CACHE_CONFIG.get("max_memory_mb", 64),
+        disk_path=CACHE_CONFIG.get("disk_path"),
+        max_disk_entries=CACHE_CONFIG.get("max_disk_entries")
+    )
+    register_cache_metrics(analysis_cache)
 
-# ATS keywords and categories
-ATS_KEYWORDS = {
-    "technical_skills": [
-        "python", "java", "javascript", "react", "nodejs", "sql", "aws", "docker", 
-        "kubernetes", "git", "linux", "api", "html", "css", "mongodb", "postgresql",
-        "machine learning", "data analysis", "artificial intelligence", "tensorflow",
-        "pytorch", "pandas", "numpy", "scikit-learn", "cloud computing", "devops"
-    ],
-    "soft_skills": [
-        "leadership", "communication", "teamwork", "problem solving", "analytical",
-        "creative", "adaptable", "organized", "detail oriented", "time management",
-        "project management", "collaboration", "critical thinking", "innovation"
-    ],
-    "action_verbs": [
-        "achieved", "developed", "created", "managed", "led", "implemented", "designed",
-        "optimized", "improved", "analyzed", "collaborated", "coordinated", "executed",
-        "delivered", "built", "established", "increased", "reduced", "streamlined"
-    ],
-    "education": [
-        "bachelor", "master", "phd", "degree", "university", "college", "certification",
-        "course", "training", "education", "graduate", "undergraduate", "diploma"
-    ]
-}
+# Recent uploads, keyed by file identity and analysis version: the extracted
+# Document (with its segmentation) and the results of the stages that only read
+# the resume, so analyzing the same file again (e.g. with another job
+# description) neither parses it again nor reruns those stages, cache or not
+_uploads = OrderedDict()
+_uploads_lock = threading.Lock()
 
-def extract_text_from_file(file_input):
-    """Extract text from uploaded file (PDF, DOCX, or TXT).
+def load_upload(file):
+    """``(Document, stage memo)`` of an uploaded resume, reusing those of an unchanged file.
 
-    Supports Gradio 5 inputs which may be a string path, dict with 'path',
-    or a file-like object with .read() and .name.
+    The memo is a dict that run_analysis_batch() fills with the file's
+    resume-only stage results. Raises the extraction error (e.g.
+    UnsupportedFormatError) if the file cannot be read.
     """
-    if file_input is None:
-        return ""
-
-    # Normalize to a file path and extension if possible
-    file_path = None
-    filename_lower = None
-
-    if isinstance(file_input, str):
-        file_path = file_input
-        filename_lower = file_input.lower()
-    elif isinstance(file_input, dict) and 'path' in file_input:
-        file_path = file_input['path']
-        filename_lower = file_path.lower()
-    elif hasattr(file_input, 'name') and hasattr(file_input, 'read'):
-        # file-like object
+    path = file.get('path') if isinstance(file, dict) else getattr(file, 'name', file)
+    key = None
+    if ANALYSIS_CONFIG.get("memoized_uploads", 32) > 0:
         try:
-            content = file_input.read()
-            filename_lower = getattr(file_input, 'name', 'uploaded_file').lower()
-            if filename_lower.endswith('.pdf'):
-                try:
-                    reader = PyPDF2.PdfReader(io.BytesIO(content))
-                    pages_text = []
-                    for page in reader.pages:
-                        page_text = page.extract_text() or ""
-                        pages_text.append(page_text)
-                    return "\n".join(pages_text)
-                except Exception:
-                    pass  # fall through to error below
-            if filename_lower.endswith('.docx'):
-                try:
-                    doc = docx.Document(io.BytesIO(content))
-                    return "\n".join(p.text for p in doc.paragraphs)
-                except Exception:
-                    pass
-            if filename_lower.endswith('.txt'):
-                try:
-                    return content.decode('utf-8', errors='ignore')
-                except Exception:
-                    pass
-        except Exception as e:
-            return f"Error reading file: {str(e)}"
+            stat = os.stat(path)
+            key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, ANALYSIS_VERSION)
+        except (TypeError, ValueError, OSError):
+            pass
+    if key is not None:
+        with _uploads_lock:
+            if key in _uploads:
+                _uploads.move_to_end(key)
+                return _uploads[key]
+    
+    upload = (as_document(extract_text(file)), {})
+    if key is not None:
+        with _uploads_lock:
+            _uploads[key] = upload
+            while len(_uploads) > ANALYSIS_CONFIG.get("memoized_uploads", 32):
+                _uploads.popitem(last=False)
+    return upload
 
-    # If we have a file path, read from disk
-    if file_path and filename_lower:
-        try:
-            if filename_lower.endswith('.pdf'):
-                with open(file_path, 'rb') as f:
-                    reader = PyPDF2.PdfReader(f)
-                    pages_text = []
-                    for page in reader.pages:
-                        page_text = page.extract_text() or ""
-                        pages_text.append(page_text)
-                    return "\n".join(pages_text)
-            elif filename_lower.endswith('.docx'):
-                doc = docx.Document(file_path)
-                return "\n".join(p.text for p in doc.paragraphs)
-            elif filename_lower.endswith('.txt'):
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    return f.read()
-            else:
-                return "Unsupported file format. Please upload PDF, DOCX, or TXT files."
-        except Exception as e:
-            return f"Error reading file: {str(e)}"
+def analyze_ats_keywords(text, taxonomy=None):
+    """Analyze resume for ATS-friendly keywords (``text`` may be a Document)"""
+    taxonomy = taxonomy or keyword_taxonomy.current()
+    return taxonomy.analyze(as_document(text).text)
 
-    return "Error reading file: Unrecognized file input type"
+def tone_from_prediction(prediction):
+    """Turn one sentiment pipeline prediction into a professional tone result"""
+    # Normalize sentiment labels across different models
+    label = str(prediction.get('label', '')).lower()
+    score = float(prediction.get('score', 0.5))
+    is_positive = label in {"positive", "pos", "label_2", "label_1"}  # include common variants
+    is_negative = label in {"negative", "neg", "label_0"}
 
-def analyze_ats_keywords(text):
-    """Analyze resume for ATS-friendly keywords"""
-    text_lower = text.lower()
-    scores = {}
-    found_keywords = {}
-    
-    for category, keywords in ATS_KEYWORDS.items():
-        found = [kw for kw in keywords if kw in text_lower]
-        found_keywords[category] = found
-        scores[category] = min(100, (len(found) / len(keywords)) * 100)
+    if is_positive:
+        tone_score = min(95, 60 + (score * 35))
+    elif is_negative:
+        tone_score = max(30, 60 - (score * 30))
+    else:  # neutral or unknown
+        tone_score = 60
+        
+    confidence = "High" if prediction['score'] > 0.8 else "Medium" if prediction['score'] > 0.5 else "Low"
     
-    return scores, found_keywords
+    return {"professional_tone": int(tone_score), "confidence": confidence}
 
-def analyze_sentiment_and_tone(text):
-    """Analyze professional tone using AI sentiment analysis"""
+def _run_sentiment_model(windows):
+    """Label distributions for text windows in one batched pipeline call"""
+    batch_size = MODEL_CONFIG.get("sentiment_batch_size", 16)
+    for start in range(0, len(windows), batch_size):
+        MODEL_BATCH_SIZE.observe(min(batch_size, len(windows) - start), model="sentiment")
+    with MODEL_SECONDS.time(model="sentiment", step="pipeline"):
+        return models.get("sentiment")(windows, batch_size=batch_size, top_k=None, truncation=True)
+
+def _run_section_model(paragraphs):
+    return models.get("sections").classify(paragraphs, SECTION_LABELS)
+
+MODEL_RUNNERS = {"sentiment": _run_sentiment_model, "sections": _run_section_model}
+
+# Coalesce model calls of concurrent requests into micro-batches
+model_batchers = {}
+if INFERENCE_SERVER_CONFIG.get("enabled", True):
+    model_batchers = {
+        name: MicroBatcher(
+            name, runner,
+            max_batch_size=INFERENCE_SERVER_CONFIG.get("max_batch_size", 32),
+            batch_window_ms=INFERENCE_SERVER_CONFIG.get("batch_window_ms", 10),
+            max_queue_size=INFERENCE_SERVER_CONFIG.get("max_queue_size", 64),
+            timeout=INFERENCE_SERVER_CONFIG.get("request_timeout", 30)
+        )
+        for name, runner in MODEL_RUNNERS.items()
+    }
+
+def run_model(name, inputs):
+    """Run ``inputs`` through a model, sharing the call with concurrent requests when possible"""
+    batcher = model_batchers.get(name)
+    # Profiled requests stay on their own thread so cProfile sees the model call
+    if batcher is None or profiler.is_profiling():
+        return MODEL_RUNNERS[name](inputs)
+    return batcher.submit(inputs)
+
+def aggregate_window_predictions(predictions, weights):
+    """Length-weighted average of per-window label distributions as one prediction"""
+    totals = {}
+    for prediction, weight in zip(predictions, weights):
+        for entry in prediction:
+            totals[entry['label']] = totals.get(entry['label'], 0.0) + weight * entry['score']
+    label = max(totals, key=totals.get)
+    return {'label': label, 'score': totals[label] / sum(weights)}
+
+def analyze_sentiment_batch(texts):
+    """Analyze professional tone of many texts with one batched model call.
+
+    Each text is split into token-bounded windows (``max_chunk_size`` tokens,
+    at most ``max_chunks`` per text); all windows of all texts go through the
+    model together and are averaged per text, weighted by token count.
+    """
     try:
-        # Split text into chunks for analysis
-        sentences = nltk.sent_tokenize(text)
-        if not sentences:
-            return {"professional_tone": 50, "confidence": "Low"}
+        results = [{"professional_tone": 50, "confidence": "Low"} for _ in texts]
+        sentiment_analyzer = models.get("sentiment")
         
-        # Analyze first few sentences for tone
-        sample_text = " ".join(sentences[:5])
+        windows = []
+        owners = []
+        for i, text in enumerate(texts):
+            for window in token_windows(
+                sentiment_analyzer.tokenizer, as_document(text).text,
+                max_tokens=MODEL_CONFIG.get("max_chunk_size", 512),
+                max_chunks=MODEL_CONFIG.get("max_chunks", 3)
+            ):
+                windows.append(window)
+                owners.append(i)
         
-        result = sentiment_analyzer(sample_text[:512])  # Limit length
-
-        # Normalize sentiment labels across different models
-        label = str(result[0].get('label', '')).lower()
-        score = float(result[0].get('score', 0.5))
-        is_positive = label in {"positive", "pos", "label_2", "label_1"}  # include common variants
-        is_negative = label in {"negative", "neg", "label_0"}
-
-        if is_positive:
-            tone_score = min(95, 60 + (score * 35))
-        elif is_negative:
-            tone_score = max(30, 60 - (score * 30))
-        else:  # neutral or unknown
-            tone_score = 60
+        if windows:
+            predictions = run_model("sentiment", [window_text for window_text, _ in windows])
             
-        confidence = "High" if result[0]['score'] > 0.8 else "Medium" if result[0]['score'] > 0.5 else "Low"
+            per_text = {}
+            for i, prediction, (_, token_count) in zip(owners, predictions, windows):
+                per_text.setdefault(i, ([], []))
+                per_text[i][0].append(prediction)
+                per_text[i][1].append(token_count)
+            for i, (text_predictions, weights) in per_text.items():
+                results[i] = tone_from_prediction(aggregate_window_predictions(text_predictions, weights))
         
-        return {"professional_tone": int(tone_score), "confidence": confidence}
+        return results
         
     except Exception as e:
-        return {"professional_tone": 50, "confidence": "Low", "error": str(e)}
+        return [{"professional_tone": 50, "confidence": "Low", "error": str(e)} for _ in texts]
 
-def classify_resume_sections(text):
-    """Use AI to classify and analyze resume sections"""
-    try:
-        sections = ["experience", "education", "skills", "summary", "achievements"]
-        
+def analyze_sentiment_and_tone(text):
+    """Analyze professional tone using AI sentiment analysis"""
+    return analyze_sentiment_batch([text])[0]
+
+def summarize_sections(results):
+    """Turn per-paragraph classification results into the section analysis dict"""
+    sections = SECTION_LABELS
+    classified_sections = set()
+    
+    for result in results:
+        if result['scores'][0] > 0.3:  # Confidence threshold
+            classified_sections.add(result['labels'][0])
+    
+    completeness = (len(classified_sections) / len(sections)) * 100
+    
+    return {
+        "sections_identified": len(classified_sections),
+        "completeness": min(100, completeness),
+        "found_sections": list(classified_sections)
+    }
+
+# Paragraphs with an unambiguous section header are labeled without the classifier
+header_detector = HeaderSectionDetector() if SECTION_CASCADE_CONFIG.get("enabled", True) else None
+
+def detect_section_headers(paragraphs):
+    """Header-based results for ``paragraphs`` (None where the classifier is needed)"""
+    if header_detector is None:
+        return [None] * len(paragraphs)
+    min_confidence = SECTION_CASCADE_CONFIG.get("min_confidence", 0.9)
+    return [
+        result if result and result['scores'][0] >= min_confidence else None
+        for result in header_detector.detect_all(paragraphs)
+    ]
+
+def classify_sections_batch(texts):
+    """Classify resume sections of many texts (or Documents), batching all paragraphs x labels.
+    
+    Paragraphs labeled by their header skip the model; the rest of every
+    text go through it together.
+    """
+    results = [None] * len(texts)
+    spans = []
+    candidates = []
+    
+    for i, text in enumerate(texts):
         # Split text into potential sections
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        paragraphs = as_document(text).paragraphs
         
         if not paragraphs:
-            return {"sections_identified": 0, "completeness": 20}
-        
-        # Use AI to classify sections
-        classified_sections = set()
-        
-        for paragraph in paragraphs[:10]:  # Analyze first 10 paragraphs
-            if len(paragraph) > 20:  # Skip very short paragraphs
-                result = classifier(paragraph[:512], candidate_labels=sections)
-                if result['scores'][0] > 0.3:  # Confidence threshold
-                    classified_sections.add(result['labels'][0])
-        
-        completeness = (len(classified_sections) / len(sections)) * 100
-        
-        return {
-            "sections_identified": len(classified_sections),
-            "completeness": min(100, completeness),
-            "found_sections": list(classified_sections)
-        }
+            results[i] = {"sections_identified": 0, "completeness": 20}
+            continue
         
+        # First 10 paragraphs, skipping very short ones
+        indices = section_candidate_indices(paragraphs)
+        PARAGRAPHS.observe(len(indices))
+        headers = detect_section_headers(paragraphs[:indices[-1] + 1] if indices else [])
+        detected = [headers[j] for j in indices]
+        # Truncated for the model, like section_candidates()
+        ambiguous = [paragraphs[j][:512] for j, result in zip(indices, detected) if result is None]
+        SECTION_PARAGRAPHS.inc(len(indices) - len(ambiguous), route="header")
+        SECTION_PARAGRAPHS.inc(len(ambiguous), route="model")
+        spans.append((i, detected, len(candidates), len(candidates) + len(ambiguous)))
+        candidates.extend(ambiguous)
+    
+    try:
+        predictions = run_model("sections", candidates) if candidates else []
     except Exception as e:
-        return {"sections_identified": 2, "completeness": 40, "error": str(e)}
+        predictions = None
+        error = str(e)
+    
+    for i, detected, start, end in spans:
+        if predictions is None and end > start:
+            results[i] = {"sections_identified": 2, "completeness": 40, "error": error}
+            continue
+        model_results = iter(predictions[start:end] if predictions else [])
+        results[i] = summarize_sections([result or next(model_results) for result in detected])
+    
+    return results
+
+def classify_resume_sections(text):
+    """Use AI to classify and analyze resume sections"""
+    return classify_sections_batch([text])[0]
+
+BULLET_PATTERN = re.compile(r'[•\-\*]\s')
+SECTION_HEADER_PATTERN = re.compile(r'\b(education|experience|skills|summary)\b')
 
 def calculate_readability_score(text):
-    """Calculate ATS readability score"""
-    if not text.strip():
+    """Calculate ATS readability score (``text`` may be a Document)"""
+    doc = as_document(text)
+    if not doc.text.strip():
         return 0
     
     # Basic readability metrics
-    sentences = nltk.sent_tokenize(text)
-    words = nltk.word_tokenize(text)
+    sentences = doc.sentences
+    words = doc.words
     
     if not sentences or not words:
         return 30
@@ -229,12 +320,12 @@ def calculate_readability_score(text):
         readability = 50
     
     # Check for bullet points (ATS-friendly)
-    bullet_points = len(re.findall(r'[•\-\*]\s', text))
+    bullet_points = len(BULLET_PATTERN.findall(doc.text))
     if bullet_points > 3:
         readability += 10
     
     # Check for proper formatting indicators
-    if re.search(r'\b(education|experience|skills|summary)\b', text.lower()):
+    if SECTION_HEADER_PATTERN.search(doc.lower):
         readability += 5
     
     return min(100, readability)
@@ -242,15 +333,16 @@ def calculate_readability_score(text):
 def generate_improvement_suggestions(scores, found_keywords, analysis_results):
     """Generate AI-powered improvement suggestions"""
     suggestions = []
+    taxonomy = keyword_taxonomy.current()
     
     # Keyword suggestions
     if scores['technical_skills'] < 60:
-        missing_tech = set(ATS_KEYWORDS['technical_skills']) - set(found_keywords['technical_skills'])
-        suggestions.append(f"🔧 **Technical Skills**: Add relevant technical skills like {', '.join(list(missing_tech)[:3])}")
+        missing_tech = taxonomy.missing('technical_skills', found_keywords['technical_skills'], 3)
+        suggestions.append(f"🔧 **Technical Skills**: Add relevant technical skills like {', '.join(missing_tech)}")
     
     if scores['soft_skills'] < 50:
-        missing_soft = set(ATS_KEYWORDS['soft_skills']) - set(found_keywords['soft_skills'])
-        suggestions.append(f"🤝 **Soft Skills**: Include soft skills such as {', '.join(list(missing_soft)[:3])}")
+        missing_soft = taxonomy.missing('soft_skills', found_keywords['soft_skills'], 3)
+        suggestions.append(f"🤝 **Soft Skills**: Include soft skills such as {', '.join(missing_soft)}")
     
     if scores['action_verbs'] < 70:
         suggestions.append("⚡ **Action Verbs**: Use more strong action verbs like 'achieved', 'developed', 'led', 'optimized'")
@@ -268,77 +360,287 @@ def generate_improvement_suggestions(scores, found_keywords, analysis_results):
     if 'readability' in analysis_results and analysis_results['readability'] < 70:
         suggestions.append("📖 **Readability**: Use bullet points and clear formatting to improve ATS readability")
     
+    # Job description match
+    job_match = analysis_results.get('job_match')
+    if job_match and job_match['score'] < 60 and job_match['missing_terms']:
+        suggestions.append(f"🎯 **Job Match**: Mirror the job description's wording, e.g. {', '.join(job_match['missing_terms'][:5])}")
+    
     if not suggestions:
         suggestions.append("✅ **Great job!** Your resume shows strong ATS optimization. Keep it updated with relevant keywords.")
     
     return suggestions
 
-def analyze_resume(file, job_description=""):
-    """Main AI-powered resume analysis function"""
-    if file is None:
-        return "❌ Please upload a resume file."
+scheduler = AnalysisScheduler(max_workers=ANALYSIS_CONFIG.get("max_workers", 8),
+                              max_abandoned=ANALYSIS_CONFIG.get("max_abandoned_stages", 4))
+
+def analysis_stages(count, job_description="", taxonomy=None):
+    """The independent analyzers, each over a list of ``count`` texts, with fallback results.
     
-    try:
-        # Extract text from file
-        text = extract_text_from_file(file)
-        
-        if not text or len(text.strip()) < 50:
-            return "❌ Could not extract enough text from the file. Please ensure the file contains readable text."
-        
-        # Combine resume text with job description for targeted analysis
-        analysis_text = text
-        if job_description.strip():
-            analysis_text = f"Job Requirements: {job_description}\n\nResume: {text}"
-        
-        # Perform AI analysis
-        print("Analyzing keywords...")
-        keyword_scores, found_keywords = analyze_ats_keywords(text)
-        
-        print("Analyzing tone...")
-        sentiment_result = analyze_sentiment_and_tone(text)
-        
-        print("Analyzing structure...")
-        section_analysis = classify_resume_sections(text)
-        
-        print("Calculating readability...")
-        readability = calculate_readability_score(text)
-        
-        # Combine all analysis results
-        analysis_results = {
-            **sentiment_result,
-            **section_analysis,
-            'readability': readability
+    ``depends_on`` marks job_match as the only stage that reads the job
+    description, and keywords and job_match (its phrases) as the ones that
+    read the taxonomy (default: the current one).
+    """
+    taxonomy = taxonomy or keyword_taxonomy.current()
+    timeouts = ANALYSIS_CONFIG.get("stage_timeouts", {})
+    
+    def timeout(name, model=None):
+        # Model loading is not inference time: only time a stage once its model is loaded
+        if timeouts.get(name) is None or (model and not models.is_loaded(model)):
+            return None
+        return timeouts[name] * count
+    
+    stages = [
+        Stage("keywords", lambda texts: [analyze_ats_keywords(text, taxonomy) for text in texts],
+              lambda error: [({category: 0 for category in taxonomy.categories},
+                              {category: [] for category in taxonomy.categories}) for _ in range(count)],
+              timeout("keywords"), depends_on=("document", "taxonomy")),
+        Stage("sentiment", analyze_sentiment_batch,
+              lambda error: [{"professional_tone": 50, "confidence": "Low", "error": error} for _ in range(count)],
+              timeout("sentiment", "sentiment")),
+        Stage("sections", classify_sections_batch,
+              lambda error: [{"sections_identified": 2, "completeness": 40, "error": error} for _ in range(count)],
+              timeout("sections", "sections")),
+        Stage("readability", lambda texts: [calculate_readability_score(text) for text in texts],
+              lambda error: [50 for _ in range(count)],
+              timeout("readability")),
+    ]
+    if job_description.strip():
+        stages.append(Stage(
+            "job_match",
+            lambda docs: job_matcher.match_many([doc.text for doc in docs], job_description, taxonomy.phrases),
+            lambda error: [None for _ in range(count)],
+            timeout("job_match"),
+            depends_on=("document", "job_description", "taxonomy")
+        ))
+    return stages
+
+def run_analysis_stages(texts, job_description="", pending=None, taxonomy=None):
+    """Run the analyzers over ``texts``; returns ``({stage: [results]}, {stage: timing})``.
+    
+    Texts are wrapped in Documents once, so all stages share one segmentation.
+    ``pending`` maps stage names to the indices of ``texts`` that stage still
+    has to analyze (default: every stage on every text); each stage's results
+    follow the order of its indices and stages missing from it do not run.
+    """
+    texts = [as_document(text) for text in texts]
+    taxonomy = taxonomy or keyword_taxonomy.current()
+    if pending is None:
+        pending = {stage.name: range(len(texts)) for stage in analysis_stages(len(texts), job_description, taxonomy)}
+    
+    stages = []
+    for name, indices in pending.items():
+        if not indices:
+            continue
+        stage = next(s for s in analysis_stages(len(indices), job_description, taxonomy) if s.name == name)
+        subset = [texts[i] for i in indices]
+        stages.append(Stage(name, functools.partial(stage.fn, subset), stage.fallback,
+                            stage.timeout, stage.depends_on))
+    
+    # cProfile only sees the calling thread, so profiled requests run inline
+    if ANALYSIS_CONFIG.get("concurrent_stages", True) and not profiler.is_profiling():
+        results, timings = scheduler.run(stages)
+    else:
+        results, timings = scheduler.run_serial(stages)
+    
+    for name, timing in timings.items():
+        STAGE_SECONDS.observe(timing['seconds'], stage=name)
+        STAGE_RESULTS.inc(stage=name, status=timing['status'])
+    return results, timings
+
+def stage_cache_key(text, job_description, stage, taxonomy):
+    """Cache key of one stage's result: the job description and taxonomy only count for stages that read them"""
+    if "job_description" not in stage.depends_on:
+        job_description = ""
+    version = f"{ANALYSIS_VERSION}:{stage.name}"
+    if "taxonomy" in stage.depends_on:
+        version += f":{taxonomy.fingerprint}"
+    return make_cache_key(text, job_description, version)
+
+def stage_memo_key(stage, taxonomy):
+    """Key of a resume-only stage's result in a load_upload() memo (None for stages reading the job description)"""
+    if "job_description" in stage.depends_on:
+        return None
+    if "taxonomy" in stage.depends_on:
+        return f"{stage.name}:{taxonomy.fingerprint}"
+    return stage.name
+
+def run_analysis_batch(texts, job_description="", memos=None):
+    """Run all analyzers on many extracted texts with batched model calls.
+
+    Each stage's result is cached separately under the inputs it depends on,
+    so a new job description for an already analyzed resume only reruns job
+    matching. ``memos`` optionally gives each text a load_upload() memo that
+    keeps its resume-only results even with the cache off or evicted. The
+    missing (stage, text) pairs go through the models, with the analyzers
+    running concurrently (``ANALYSIS_CONFIG``). Analyses that ran any stage
+    carry ``stage_timings``.
+    """
+    texts = [as_document(text) for text in texts]
+    memos = memos or [None] * len(texts)
+    # One taxonomy for the whole batch, even if a newer one is loaded meanwhile
+    taxonomy = keyword_taxonomy.current()
+    stages = analysis_stages(len(texts), job_description, taxonomy)
+    results = {stage.name: [None] * len(texts) for stage in stages}
+    pending = {stage.name: [] for stage in stages}
+    cache_keys = {}
+    reused = set()
+    
+    def remember(name, i, value):
+        memo_key = stage_memo_key(next(s for s in stages if s.name == name), taxonomy)
+        if memos[i] is not None and memo_key is not None:
+            memos[i][memo_key] = value
+    
+    for i, text in enumerate(texts):
+        for stage in stages:
+            memo_key = stage_memo_key(stage, taxonomy)
+            if memos[i] is not None and memo_key in memos[i]:
+                results[stage.name][i] = memos[i][memo_key]
+                STAGE_RESULTS.inc(stage=stage.name, status="cached")
+                reused.add(stage.name)
+                continue
+            if analysis_cache is not None:
+                key = stage_cache_key(text.text, job_description, stage, taxonomy)
+                cached = analysis_cache.get(key)
+                if cached is not None:
+                    results[stage.name][i] = cached["result"]
+                    remember(stage.name, i, cached["result"])
+                    STAGE_RESULTS.inc(stage=stage.name, status="cached")
+                    reused.add(stage.name)
+                    continue
+                cache_keys[stage.name, i] = key
+            pending[stage.name].append(i)
+    
+    if reused:
+        print("Using cached analysis: " + ", ".join(stage.name for stage in stages if stage.name in reused))
+    timings = {}
+    analyzed = {i for indices in pending.values() for i in indices}
+    if analyzed:
+        fresh, timings = run_analysis_stages(texts, job_description, pending, taxonomy)
+        print("Analysis stages: " + ", ".join(
+            f"{name} {t['seconds']:.2f}s" + ("" if t['status'] == "ok" else f" ({t['status']})")
+            for name, t in timings.items()
+        ))
+        for name, values in fresh.items():
+            for i, value in zip(pending[name], values):
+                results[name][i] = value
+                # Don't persist fallback values produced by a failing or slow analyzer
+                degraded = timings[name]['status'] != "ok" or (isinstance(value, dict) and 'error' in value)
+                if degraded:
+                    continue
+                remember(name, i, value)
+                if (name, i) in cache_keys:
+                    analysis_cache.set(cache_keys[name, i], {"result": value})
+    
+    analyses = []
+    for i in range(len(texts)):
+        keyword_scores, found_keywords = results['keywords'][i]
+        analysis = {
+            'keyword_scores': keyword_scores,
+            'found_keywords': found_keywords,
+            'sentiment': results['sentiment'][i],
+            'sections': results['sections'][i],
+            'readability': results['readability'][i],
+            'job_match': results['job_match'][i] if 'job_match' in results else None
         }
-        
-        # Calculate overall score
-        overall_score = int(np.mean([
-            np.mean(list(keyword_scores.values())),
-            sentiment_result.get('professional_tone', 50),
-            section_analysis.get('completeness', 50),
-            readability
-        ]))
-        
-        # Generate suggestions
-        suggestions = generate_improvement_suggestions(keyword_scores, found_keywords, analysis_results)
-        
-        # Format results
-        filename = file.name if hasattr(file, 'name') else "uploaded_file"
-        
-        result = f"""# 🤖 AI-Powered ATS Resume Analysis
+        if i in analyzed:
+            analysis['stage_timings'] = timings
+        analyses.append(analysis)
+    return analyses
 
-## 📊 Overall ATS Score: {overall_score}/100
+def run_analysis(text, job_description=""):
+    """Run all analyzers on extracted text, reusing cached results when possible"""
+    return run_analysis_batch([text], job_description)[0]
 
-### 🎯 Category Breakdown:
-- **Technical Skills**: {keyword_scores['technical_skills']:.1f}/100 ({len(found_keywords['technical_skills'])} keywords found)
-- **Soft Skills**: {keyword_scores['soft_skills']:.1f}/100 ({len(found_keywords['soft_skills'])} keywords found)  
-- **Action Verbs**: {keyword_scores['action_verbs']:.1f}/100 ({len(found_keywords['action_verbs'])} strong verbs found)
-- **Professional Tone**: {sentiment_result.get('professional_tone', 50)}/100 (AI Confidence: {sentiment_result.get('confidence', 'Unknown')})
-- **Structure & Sections**: {section_analysis.get('completeness', 50):.1f}/100 ({section_analysis.get('sections_identified', 0)} sections identified)
-- **ATS Readability**: {readability}/100
+# Resumes with less extracted text than this are rejected as unreadable
+MIN_TEXT_LENGTH = 50
+
+def calculate_overall_score(analysis):
+    """Overall ATS score from one run_analysis() result"""
+    score = np.mean([
+        np.mean(list(analysis['keyword_scores'].values())),
+        analysis['sentiment'].get('professional_tone', 50),
+        analysis['sections'].get('completeness', 50),
+        analysis['readability']
+    ])
+    
+    # Blend in how well the resume matches the job description, when one was given
+    job_match = analysis.get('job_match')
+    if job_match:
+        weight = JOB_MATCH_CONFIG.get("score_weight", 0.25)
+        score = (1 - weight) * score + weight * job_match['score']
+    return int(score)
 
+def build_report(text, analysis):
+    """Scores, findings and suggestions for one run_analysis() result, without formatting"""
+    keyword_scores = analysis['keyword_scores']
+    found_keywords = analysis['found_keywords']
+    sentiment_result = analysis['sentiment']
+    section_analysis = analysis['sections']
+    job_match = analysis.get('job_match')
+    
+    # Combine all analysis results
+    analysis_results = {
+        **sentiment_result,
+        **section_analysis,
+        'readability': analysis['readability'],
+        'job_match': job_match
+    }
+    
+    return {
+        'overall_score': calculate_overall_score(analysis),
+        'scores': {
+            'technical_skills': round(float(keyword_scores['technical_skills']), 1),
+            'soft_skills': round(float(keyword_scores['soft_skills']), 1),
+            'action_verbs': round(float(keyword_scores['action_verbs']), 1),
+            'professional_tone': sentiment_result.get('professional_tone', 50),
+            'structure': round(float(section_analysis.get('completeness', 50)), 1),
+            'readability': analysis['readability'],
+            'job_match': job_match['score'] if job_match else None
+        },
+        'found_keywords': found_keywords,
+        'sentiment': sentiment_result,
+        'sections': section_analysis,
+        'job_match': job_match,
+        'suggestions': generate_improvement_suggestions(keyword_scores, found_keywords, analysis_results),
+        'text_length': len(text)
+    }
+
+def score_texts(texts, job_description="", memos=None):
+    """build_report() for many resume texts, sharing batched model calls (``memos``: see run_analysis_batch())"""
+    analyses = run_analysis_batch(texts, job_description, memos)
+    return [build_report(text, analysis) for text, analysis in zip(texts, analyses)]
+
+def score_text(text, job_description=""):
+    return score_texts([text], job_description)[0]
+
+def format_report(report, filename, job_description=""):
+    """Markdown rendering of a build_report() result for the UI"""
+    scores = report['scores']
+    found_keywords = report['found_keywords']
+    sentiment_result = report['sentiment']
+    section_analysis = report['sections']
+    job_match = report['job_match']
+    
+    job_match_line = missing_terms_line = ""
+    if job_match:
+        job_match_line = f"- **Job Match**: {job_match['score']:.1f}/100 ({job_match['matched_terms']} of {job_match['total_terms']} job terms found)\n"
+        missing_terms_line = f"\n**Missing Job Keywords**: {', '.join(job_match['missing_terms']) if job_match['missing_terms'] else 'None'}\n"
+    
+    return f"""# 🤖 AI-Powered ATS Resume Analysis
+
+## 📊 Overall ATS Score: {report['overall_score']}/100
+
+### 🎯 Category Breakdown:
+- **Technical Skills**: {scores['technical_skills']:.1f}/100 ({len(found_keywords['technical_skills'])} keywords found)
+- **Soft Skills**: {scores['soft_skills']:.1f}/100 ({len(found_keywords['soft_skills'])} keywords found)  
+- **Action Verbs**: {scores['action_verbs']:.1f}/100 ({len(found_keywords['action_verbs'])} strong verbs found)
+- **Professional Tone**: {scores['professional_tone']}/100 (AI Confidence: {sentiment_result.get('confidence', 'Unknown')})
+- **Structure & Sections**: {scores['structure']:.1f}/100 ({section_analysis.get('sections_identified', 0)} sections identified)
+- **ATS Readability**: {scores['readability']}/100
+{job_match_line}
 ### 💡 AI-Generated Improvement Suggestions:
 
-{chr(10).join(suggestions)}
+{chr(10).join(report['suggestions'])}
 
 ### 🔍 Detailed Analysis:
 
@@ -347,34 +649,78 @@ def analyze_resume(file, job_description=""):
 **Found Soft Skills**: {', '.join(found_keywords['soft_skills'][:10]) if found_keywords['soft_skills'] else 'None detected'}
 
 **Identified Sections**: {', '.join(section_analysis.get('found_sections', [])) if section_analysis.get('found_sections') else 'Basic structure detected'}
-
+{missing_terms_line}
 ### 📄 File Information:
 - **Filename**: {filename}
-- **Text Length**: {len(text)} characters
+- **Text Length**: {report['text_length']} characters
 - **Analysis Method**: AI-powered using HuggingFace models
 - **Job-Specific**: {"Yes" if job_description.strip() else "No"}
 
 ---
 *Analysis powered by AI models: RoBERTa (sentiment), BART (classification), and custom ATS algorithms*
         """
+
+def analyze_resume(file, job_description=""):
+    """Main AI-powered resume analysis function"""
+    started = time.perf_counter()
+    with profiler.profile("analyze_resume"):
+        report = _analyze_resume(file, job_description)
+    REQUEST_SECONDS.observe(
+        time.perf_counter() - started, outcome="error" if report.startswith("❌") else "ok"
+    )
+    return report
+
+def _analyze_resume(file, job_description):
+    if file is None:
+        return "❌ Please upload a resume file."
+    
+    try:
+        # Extract text from file (reused, with its resume-only results, when the same file is analyzed again)
+        try:
+            document, memo = load_upload(file)
+        except Exception as e:
+            return f"❌ {error_message(e)}"
         
-        return result
+        if len(document.text.strip()) < MIN_TEXT_LENGTH:
+            return "❌ Could not extract enough text from the file. Please ensure the file contains readable text."
+        
+        # Perform AI analysis (or reuse cached results for the same text)
+        report = score_texts([document], job_description, [memo])[0]
+        filename = file.name if hasattr(file, 'name') else "uploaded_file"
+        return format_report(report, filename, job_description)
         
     except Exception as e:
         return f"❌ Analysis Error: {str(e)}\n\nPlease try uploading a different file format or check if the file is corrupted."
 
+def model_status_markdown():
+    """One-line model readiness summary for the UI"""
+    if models.is_ready():
+        return "🟢 AI models ready"
+    parts = []
+    for name, info in models.status().items():
+        icon = {"ready": "🟢", "loading": "🟡", "failed": "🔴"}.get(info["state"], "⚪")
+        parts.append(f"{icon} {name}: {info['state']}")
+    return "AI models: " + " · ".join(parts) + " (first analysis may take longer)"
+
+def refresh_model_status():
+    # Stop polling once every model is loaded
+    return model_status_markdown(), gr.Timer(active=not models.is_ready())
+
 # Create the Gradio interface
 try:
     # Simple interface creation to avoid JSON schema issues
     with gr.Blocks(title="🤖 AI-Powered ATS Resume Rater") as demo:
         gr.Markdown("# 🤖 AI-Powered ATS Resume Rater")
         gr.Markdown("Upload your resume for comprehensive AI analysis using advanced NLP models. Get actionable insights to optimize your resume for Applicant Tracking Systems.")
+        model_status = gr.Markdown(model_status_markdown())
+        status_timer = gr.Timer(2.0)
+        status_timer.tick(fn=refresh_model_status, outputs=[model_status, status_timer])
         
         with gr.Row():
             with gr.Column():
                 file_input = gr.File(
-                    label="📄 Upload Resume (PDF/DOCX/TXT)", 
-                    file_types=[".pdf", ".docx", ".txt"],
+                    label="📄 Upload Resume (PDF/DOCX/TXT/RTF/HTML)", 
+                    file_types=list(SUPPORTED_EXTENSIONS),
                     type="filepath"
                 )
                 job_input = gr.Textbox(
@@ -407,7 +753,7 @@ except Exception as e:
         demo = gr.Interface(
             fn=analyze_resume,
             inputs=[
-                gr.File(label="Upload Resume", file_types=[".pdf", ".docx", ".txt"], type="filepath"),
+                gr.File(label="Upload Resume", file_types=list(SUPPORTED_EXTENSIONS), type="filepath"),
                 gr.Textbox(label="Job Description (Optional)", lines=5)
             ],
             outputs=gr.Textbox(label="Analysis Results", lines=20),
@@ -426,32 +772,20 @@ except Exception as e:
             title="Resume Analyzer"
         )
 
+if UI_CONFIG.get("enable_queue", True):
+    # Handlers must run concurrently for their model calls to be batched together
+    demo.queue(
+        default_concurrency_limit=UI_CONFIG.get("concurrency_limit", 8),
+        max_size=UI_CONFIG.get("max_queue_size", 64)
+    )
+
 if __name__ == "__main__":
-    import os
+    import sys
     
-    # Check if running in a cloud environment (like HuggingFace Spaces)
-    is_cloud_env = os.getenv("SPACE_ID") is not None or os.getenv("GRADIO_SERVER_NAME") is not None
+    # server.py imports this module as "app"; reuse it rather than building the models and UI twice
+    sys.modules.setdefault("app", sys.modules[__name__])
+    import server
     
-    try:
-        demo.launch(
-            server_name="0.0.0.0",
-            server_port=7860,
-            share=is_cloud_env  # Enable sharing only in cloud environments
-        )
-    except Exception as e:
-        print(f"Error launching with share={is_cloud_env}: {e}")
-        print("Trying with share=True...")
-        try:
-            demo.launch(
-                server_name="0.0.0.0",
-                server_port=7860,
-                share=True
-            )
-        except Exception as e2:
-            print(f"Error launching with share=True: {e2}")
-            print("Trying local launch...")
-            demo.launch(
-                server_name="127.0.0.1",
-                server_port=7860,
-                share=False
-            )
+    # Serve the UI through server.py so /metrics (and the JSON API) sit on the same port;
+    # it also starts loading the models in the background while the server comes up
+    server.main(sys.argv[1:])
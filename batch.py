@@ -0,0 +1,433 @@
+"""
+Bulk resume scoring for AI ATS Resume Rater
+Scores every PDF/DOCX/TXT/RTF/HTML resume in a directory or archive (.zip, .tar, .tar.gz)
+against one job description. Text extraction runs in a process pool, model
+inference runs in batches, and results are appended to a JSONL or CSV file as
+they are produced. Re-running with the same output file skips files that
+already have a result, so interrupted runs can be resumed; files whose row
+holds an error are tried again. Near-duplicates of a resume scored earlier in
+the run (dedup.py, DEDUP_CONFIG) reuse its scores instead of going through the
+models, and are marked ``duplicate_of``.
+
+Usage:
+    python batch.py resumes/ --job-description-file job.txt --output results.jsonl
+    python batch.py resumes.zip --output results.csv --workers 4
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from config import DEDUP_CONFIG
+from dedup import DuplicateIndex
+from extraction import SUPPORTED_EXTENSIONS, FileTooLargeError, extract_text, read_limited
+
+CSV_FIELDS = [
+    "file", "overall_score", "technical_skills", "soft_skills", "action_verbs",
+    "education", "professional_tone", "confidence", "completeness",
+    "sections_identified", "found_sections", "readability", "job_match_score", "missing_job_terms",
+    "text_length", "duplicate_of", "duplicate_similarity", "error",
+]
+
+
+def _is_resume(name):
+    return os.path.splitext(name.lower())[1] in SUPPORTED_EXTENSIONS
+
+
+def iter_resume_sources(source):
+    """Yield ``(file_id, path_or_bytes, filename)`` for every resume in ``source``.
+
+    Directories yield paths (workers read them directly); archive members are
+    read one at a time so the whole archive is never held in memory, and
+    members over the upload size limit are not read: their payload is the
+    FileTooLargeError.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if _is_resume(name):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, source), path, name
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_resume(info.filename):
+                    with archive.open(info) as member:
+                        yield info.filename, _read_member(member, info.file_size), info.filename
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source) as archive:
+            for member in archive:
+                if member.isfile() and _is_resume(member.name):
+                    with archive.extractfile(member) as stream:
+                        yield member.name, _read_member(stream, member.size), member.name
+    else:
+        raise ValueError(f"{source} is not a directory, .zip or .tar archive")
+
+
+def _read_member(stream, size):
+    """Bytes of one archive member, or the FileTooLargeError when it is over the limit"""
+    try:
+        return read_limited(stream, size)
+    except FileTooLargeError as e:
+        return e
+
+
+def _extract_item(item):
+    """Pool worker: extract one resume, returning (file_id, text, error)"""
+    file_id, payload, filename = item
+    try:
+        if isinstance(payload, FileTooLargeError):
+            raise payload
+        # Files are already spread across processes; don't nest page-level pools
+        return file_id, extract_text(payload, filename, parallel=False), None
+    except Exception as e:
+        return file_id, None, f"Error reading file: {str(e)}"
+
+
+def _read_rows(output, fmt):
+    """Rows of an existing output file (``file`` and ``error`` are all that is needed of them)"""
+    with open(output, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # Partially written last line of an interrupted run
+                if isinstance(row, dict) and "file" in row:
+                    yield row
+
+
+def _read_done_ids(output, fmt, retry_errors=True):
+    """File ids that already have a row in an existing output file.
+
+    With ``retry_errors``, rows holding only an error do not count, and they
+    are removed from the file so the retried file's new row replaces them.
+    """
+    if not os.path.exists(output):
+        return set()
+    done = set()
+    failed = False
+    for row in _read_rows(output, fmt):
+        if retry_errors and row.get("error"):
+            failed = True
+        else:
+            done.add(row["file"])
+    if failed:
+        _drop_error_rows(output, fmt)
+    return done
+
+
+def _drop_error_rows(output, fmt):
+    """Rewrite ``output`` without its error rows, replacing it atomically"""
+    tmp = output + ".tmp"
+    rows = (row for row in _read_rows(output, fmt) if not row.get("error"))
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    os.replace(tmp, output)
+
+
+def _result_row(file_id, text, analysis, overall_score):
+    sentiment = analysis["sentiment"]
+    sections = analysis["sections"]
+    job_match = analysis.get("job_match")
+    return {
+        "file": file_id,
+        "overall_score": overall_score,
+        **{category: round(score, 1) for category, score in analysis["keyword_scores"].items()},
+        "found_keywords": analysis["found_keywords"],
+        "professional_tone": sentiment.get("professional_tone", 50),
+        "confidence": sentiment.get("confidence", "Unknown"),
+        "completeness": sections.get("completeness", 50),
+        "sections_identified": sections.get("sections_identified", 0),
+        "found_sections": sections.get("found_sections", []),
+        "readability": analysis["readability"],
+        "job_match_score": job_match["score"] if job_match else None,
+        "missing_job_terms": job_match["missing_terms"] if job_match else [],
+        "text_length": len(text),
+        "duplicate_of": None,
+        "duplicate_similarity": None,
+        "error": None,
+    }
+
+
+class _ResultWriter:
+    """Appends result rows to a JSONL or CSV file, flushing after every batch"""
+
+    def __init__(self, output, fmt):
+        self.fmt = fmt
+        is_new = not os.path.exists(output) or os.path.getsize(output) == 0
+        self._file = open(output, "a", encoding="utf-8", newline="")
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            if is_new:
+                self._csv.writeheader()
+
+    def write(self, row):
+        if self._csv is not None:
+            self._csv.writerow({
+                **row,
+                "found_sections": ";".join(row.get("found_sections") or []),
+                "missing_job_terms": ";".join(row.get("missing_job_terms") or []),
+            })
+        else:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _Deduplicator:
+    """Finds resumes of a run that near-duplicate one already seen, and keeps
+    the rows of the originals so duplicates can reuse them (only rows that
+    scored; originals whose analysis failed are in ``failed``)"""
+
+    def __init__(self, index, action="reuse"):
+        if action not in ("reuse", "flag"):
+            raise ValueError(f"Unknown duplicate action: {action!r} (expected 'reuse' or 'flag')")
+        self.index = index
+        self.action = action
+        self.rows = {}
+        self.failed = set()
+
+    def match(self, file_id, text):
+        """``(original file_id, similarity)`` for a near-duplicate; otherwise index the text and return None"""
+        signature = self.index.signature(text)
+        matches = self.index.query(signature)
+        # The same file seen by an earlier run (a saved index) is not a duplicate of itself
+        others = [match for match in matches if match[0] != file_id]
+        if others:
+            return others[0]
+        if not matches:
+            self.index.add(file_id, signature)
+        return None
+
+
+def _analyze_chunk(app, extracted, job_description, dedup=None):
+    """Turn one chunk of extraction results into output rows, isolating failures"""
+    rows = [None] * len(extracted)
+    ready = []
+    duplicates = {}
+    ready_ids = set()
+    for i, (file_id, text, error) in enumerate(extracted):
+        if error is None and (not text or len(text.strip()) < 50):
+            error = "Could not extract enough text from the file"
+        if error is not None:
+            rows[i] = {"file": file_id, "error": error}
+            continue
+        match = dedup.match(file_id, text) if dedup else None
+        if match is None:
+            ready.append(i)
+            ready_ids.add(file_id)
+            continue
+        duplicates[i] = match
+        # Originals from an earlier run (a saved index) or that failed have no row to reuse
+        reusable = (match[0] in dedup.rows or match[0] in ready_ids) and match[0] not in dedup.failed
+        if dedup.action == "flag" or not reusable:
+            ready.append(i)
+
+    def analyze(indices):
+        texts = [extracted[i][1] for i in indices]
+        try:
+            analyses = app.run_analysis_batch(texts, job_description)
+            for i, text, analysis in zip(indices, texts, analyses):
+                rows[i] = _result_row(
+                    extracted[i][0], text, analysis, app.calculate_overall_score(analysis)
+                )
+        except Exception as e:
+            for i in indices:
+                rows[i] = {"file": extracted[i][0], "error": f"Analysis Error: {str(e)}"}
+
+    if ready:
+        analyze(ready)
+
+    if dedup:
+        for i in ready:
+            if i not in duplicates:
+                if "error" in rows[i]:
+                    dedup.failed.add(extracted[i][0])
+                else:
+                    dedup.rows[extracted[i][0]] = rows[i]
+        # Duplicates of an original of this chunk that failed are scored themselves
+        retry = [i for i in duplicates if rows[i] is None and duplicates[i][0] not in dedup.rows]
+        if retry:
+            analyze(retry)
+        for i, (original, similarity) in duplicates.items():
+            file_id, text, _ = extracted[i]
+            if original in dedup.failed:
+                continue
+            if rows[i] is None:
+                rows[i] = {**dedup.rows[original], "file": file_id}
+                if "text_length" in rows[i]:
+                    rows[i]["text_length"] = len(text)
+            rows[i]["duplicate_of"] = original
+            rows[i]["duplicate_similarity"] = round(similarity, 3)
+
+    return rows
+
+
+def score_resumes(source, job_description="", output="results.jsonl", fmt=None,
+                  workers=None, batch_size=32, resume=True, progress=True, dedup=None, retry_errors=True):
+    """Score every resume in ``source`` and append one result row per file to ``output``.
+
+    When resuming, files that already have a row are skipped, except rows
+    holding an error unless ``retry_errors`` is False.
+
+    ``dedup`` overrides ``DEDUP_CONFIG`` (``False`` turns near-duplicate
+    detection off). Returns a summary dict with ``scored``, ``errors``,
+    ``skipped`` and ``duplicates`` counts.
+    """
+    # Imported here so extraction workers never load the models
+    import app
+
+    fmt = fmt or ("csv" if output.lower().endswith(".csv") else "jsonl")
+    done = _read_done_ids(output, fmt, retry_errors) if resume else set()
+    if not resume and os.path.exists(output):
+        os.remove(output)
+
+    summary = {"scored": 0, "errors": 0, "skipped": 0, "duplicates": 0}
+    started = time.perf_counter()
+    dedup_config = {**DEDUP_CONFIG, **(dedup or {})}
+    deduplicator = None
+    if dedup is not False and dedup_config.get("enabled", True):
+        index = DuplicateIndex.open(
+            dedup_config.get("index_path"),
+            threshold=dedup_config.get("threshold", 0.85),
+            num_perm=dedup_config.get("num_perm", 128),
+            shingle_size=dedup_config.get("shingle_size", 3),
+        )
+        deduplicator = _Deduplicator(index, dedup_config.get("action", "reuse"))
+    writer = _ResultWriter(output, fmt)
+
+    def todo():
+        for item in iter_resume_sources(source):
+            if item[0] in done:
+                summary["skipped"] += 1
+                continue
+            yield item
+
+    def finish(extracted):
+        for row in _analyze_chunk(app, list(extracted), job_description, deduplicator):
+            writer.write(row)
+            if row.get("duplicate_of"):
+                summary["duplicates"] += 1
+            if row.get("error"):
+                summary["errors"] += 1
+            else:
+                summary["scored"] += 1
+        writer.flush()
+
+        if progress:
+            elapsed = time.perf_counter() - started
+            processed = summary["scored"] + summary["errors"]
+            print(
+                f"\r[{processed} processed] scored={summary['scored']} "
+                f"errors={summary['errors']} skipped={summary['skipped']} duplicates={summary['duplicates']} "
+                f"({processed / elapsed:.1f} files/s)",
+                end="", file=sys.stderr, flush=True
+            )
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Extraction of the next chunk runs in the pool while the
+            # current chunk goes through the models
+            in_flight = None
+            for chunk in _chunks(todo(), batch_size):
+                submitted = pool.map(_extract_item, chunk)
+                if in_flight is not None:
+                    finish(in_flight)
+                in_flight = submitted
+            if in_flight is not None:
+                finish(in_flight)
+    finally:
+        writer.close()
+        if deduplicator and dedup_config.get("index_path"):
+            deduplicator.index.save(dedup_config["index_path"])
+        if progress:
+            print(file=sys.stderr)
+
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a folder or archive of resumes against a job description.")
+    parser.add_argument("source", help="Directory, .zip or .tar(.gz) archive of PDF/DOCX/TXT/RTF/HTML resumes")
+    parser.add_argument("--job-description", default="", help="Job description text")
+    parser.add_argument("--job-description-file", help="Read the job description from this file")
+    parser.add_argument("--output", default="results.jsonl", help="Output file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Output format (default: from extension)")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=32, help="Resumes per model batch")
+    parser.add_argument("--no-resume", action="store_true", help="Overwrite the output instead of resuming")
+    parser.add_argument("--no-retry-errors", action="store_true",
+                        help="When resuming, also skip files whose earlier row is an error")
+    parser.add_argument("--quiet", action="store_true", help="Do not print progress")
+    parser.add_argument("--no-dedup", action="store_true", help="Score near-duplicate resumes like any other")
+    parser.add_argument("--dedup-threshold", type=float, help="Similarity that counts as a near-duplicate")
+    parser.add_argument("--dedup-action", choices=["reuse", "flag"], help="Reuse the earlier scores or only mark")
+    parser.add_argument("--dedup-index", help="Remember resumes across runs in this index file (.npz)")
+    args = parser.parse_args(argv)
+
+    job_description = args.job_description
+    if args.job_description_file:
+        with open(args.job_description_file, "r", encoding="utf-8") as f:
+            job_description = f.read()
+
+    dedup = {}
+    if args.dedup_threshold is not None:
+        dedup["threshold"] = args.dedup_threshold
+    if args.dedup_action:
+        dedup["action"] = args.dedup_action
+    if args.dedup_index:
+        dedup["index_path"] = args.dedup_index
+
+    summary = score_resumes(
+        args.source,
+        job_description=job_description,
+        output=args.output,
+        fmt=args.format,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        resume=not args.no_resume,
+        retry_errors=not args.no_retry_errors,
+        progress=not args.quiet,
+        dedup=False if args.no_dedup else dedup,
+    )
+    print(f"Scored {summary['scored']} resumes ({summary['duplicates']} near-duplicates), "
+          f"{summary['errors']} errors, {summary['skipped']} already in {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Benchmark: serial vs. concurrent analysis stages
+Runs keyword, tone, section and readability analysis over the fixture resumes
+one stage after another and then with the concurrent scheduler, reporting the
+per-stage wall times and the total. Concurrent totals should approach the
+slowest stage rather than the sum of all stages.
+Usage: python benchmarks/bench_analysis_scheduler.py [--repeat N]
+"""
+
+import argparse
+import glob
+import os
+import statistics
+
+from common import ROOT
+
+import app
+
+
+def run(texts, concurrent, repeat):
+    totals = []
+    stage_seconds = {}
+    for _ in range(repeat):
+        stages = app.analysis_stages(1)
+        for text in texts:
+            if concurrent:
+                _, timings = app.scheduler.run(stages, [text])
+                total = max(t["seconds"] for t in timings.values())
+            else:
+                _, timings = app.scheduler.run_serial(stages, [text])
+                total = sum(t["seconds"] for t in timings.values())
+            totals.append(total)
+            for name, timing in timings.items():
+                stage_seconds.setdefault(name, []).append(timing["seconds"])
+    return statistics.median(totals), {name: statistics.median(s) for name, s in stage_seconds.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "benchmarks", "fixtures", "resumes", "*.txt"))):
+        with open(path, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+
+    app.models.warm_up(background=False)
+    run(texts, concurrent=False, repeat=1)  # Warm-up
+
+    serial_total, serial_stages = run(texts, concurrent=False, repeat=args.repeat)
+    concurrent_total, concurrent_stages = run(texts, concurrent=True, repeat=args.repeat)
+
+    print(f"{'stage':<12} {'serial':>10} {'concurrent':>12}")
+    for name in serial_stages:
+        print(f"{name:<12} {serial_stages[name] * 1000:>8.1f}ms {concurrent_stages[name] * 1000:>10.1f}ms")
+    print(f"{'total':<12} {serial_total * 1000:>8.1f}ms {concurrent_total * 1000:>10.1f}ms "
+          f"({serial_total / concurrent_total:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: MinHash/LSH near-duplicate index (dedup.py) at bulk-intake scale
+Generates --documents synthetic resumes (default 100,000) drawn from a shared
+vocabulary plus the sample paragraphs, a --duplicate-rate share of which are
+copies of an earlier resume with a few words edited, and reports:
+- signature throughput (docs/s)
+- index build time from precomputed signatures
+- query throughput and latency against the full index
+- recall on the injected near-duplicates and false matches among the rest
+- save/load time and index file size
+Usage: python benchmarks/bench_dedup.py [--documents 100000] [--duplicate-rate 0.1] [--threshold 0.85]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from common import SAMPLE_PARAGRAPHS
+
+from config import DEDUP_CONFIG
+from dedup import DuplicateIndex
+
+
+def generate(documents, duplicate_rate, words_per_resume, edits, seed):
+    """``(texts, originals)``: ``originals[i]`` is the index ``texts[i]`` was edited from, or -1"""
+    rng = np.random.RandomState(seed)
+    vocabulary = np.array([f"term{n}" for n in range(20000)])
+    texts = []
+    originals = np.full(documents, -1, dtype=np.int64)
+    for i in range(documents):
+        if i and rng.random_sample() < duplicate_rate:
+            source = rng.randint(0, i)
+            words = texts[source].split(" ")
+            for position in rng.randint(0, len(words), size=edits):
+                words[position] = vocabulary[rng.randint(len(vocabulary))]
+            texts.append(" ".join(words))
+            originals[i] = originals[source] if originals[source] >= 0 else source
+            continue
+        # Template-like resumes: shared sample paragraphs plus resume-specific wording
+        paragraphs = [SAMPLE_PARAGRAPHS[j] for j in rng.choice(len(SAMPLE_PARAGRAPHS), 3, replace=False)]
+        words = vocabulary[(rng.zipf(1.3, size=words_per_resume) - 1) % len(vocabulary)]
+        texts.append(" ".join(paragraphs) + " " + " ".join(words))
+    return texts, originals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--words", type=int, default=300, help="Resume-specific words per resume")
+    parser.add_argument("--edits", type=int, default=3, help="Words changed in each near-duplicate")
+    parser.add_argument("--threshold", type=float, default=DEDUP_CONFIG.get("threshold", 0.85))
+    parser.add_argument("--num-perm", type=int, default=DEDUP_CONFIG.get("num_perm", 128))
+    parser.add_argument("--queries", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    texts, originals = generate(args.documents, args.duplicate_rate, args.words, args.edits, args.seed)
+    print(f"Generated {len(texts)} resumes ({(originals >= 0).sum()} near-duplicates) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    index = DuplicateIndex(args.threshold, args.num_perm, DEDUP_CONFIG.get("shingle_size", 3))
+    print(f"LSH: {index.bands} bands x {index.rows} rows, threshold {args.threshold}")
+
+    started = time.perf_counter()
+    signatures = np.stack([index.signature(text) for text in texts])
+    elapsed = time.perf_counter() - started
+    print(f"Signatures:  {elapsed:7.1f}s  {len(texts) / elapsed:10.0f} docs/s")
+
+    # Bulk intake: each resume is checked against the earlier ones, then added
+    started = time.perf_counter()
+    found = np.full(len(texts), -1, dtype=np.int64)
+    for i, signature in enumerate(signatures):
+        match = index.find(signature)
+        if match is not None:
+            found[i] = match[0]
+        else:
+            index.add(i, signature)
+    elapsed = time.perf_counter() - started
+    print(f"Intake:      {elapsed:7.1f}s  {len(texts) / elapsed:10.0f} docs/s (find + add)")
+
+    injected = originals >= 0
+    recall = (found[injected] >= 0).mean() if injected.any() else 1.0
+    correct = (found[injected] == originals[injected]).mean() if injected.any() else 1.0
+    false_matches = int((found[~injected] >= 0).sum())
+    print(f"Recall on near-duplicates: {recall:.1%} (matched to their original: {correct:.1%}); "
+          f"false matches: {false_matches} of {int((~injected).sum())}")
+
+    started = time.perf_counter()
+    rebuilt = DuplicateIndex(args.threshold, args.num_perm, DEDUP_CONFIG.get("shingle_size", 3))
+    distinct = np.flatnonzero(found < 0)
+    rebuilt.add_many(distinct.tolist(), signatures[distinct])
+    print(f"Build:       {time.perf_counter() - started:7.1f}s  for {len(rebuilt)} signatures (add_many)")
+
+    queries = signatures[np.random.RandomState(args.seed + 1).randint(0, len(signatures), size=args.queries)]
+    latencies = []
+    for signature in queries:
+        query_started = time.perf_counter()
+        rebuilt.find(signature)
+        latencies.append(time.perf_counter() - query_started)
+    latencies.sort()
+    print(f"Queries:     {sum(latencies):7.1f}s  {len(latencies) / sum(latencies):10.0f} queries/s  "
+          f"p50 {latencies[len(latencies) // 2] * 1e6:.0f}us  p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.0f}us")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dedup.npz")
+        started = time.perf_counter()
+        rebuilt.save(path)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        loaded = DuplicateIndex.load(path)
+        print(f"Save {saved:.2f}s, load {time.perf_counter() - started:.2f}s, "
+              f"{os.path.getsize(path) / 2**20:.1f} MB for {len(loaded)} resumes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: streaming DOCX extraction vs. the python-docx object model
+Builds large DOCX files with python-docx (plain paragraphs, and table-heavy
+layouts like skill matrices) and compares extraction.iter_docx_blocks() with
+joining `docx.Document(...).paragraphs`: wall time, peak memory growth (RSS
+high-water mark of a fresh process, which also counts lxml's C allocations;
+Linux only), characters recovered (python-docx skips tables) and the cost of
+stopping at UPLOAD_CONFIG["max_text_length"].
+Usage: python benchmarks/bench_docx_extraction.py [--paragraphs 5000] [--tables 200] [--repeat 3]
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT, SAMPLE_PARAGRAPHS, time_call
+
+import docx
+
+from config import UPLOAD_CONFIG
+from extraction import extract_text
+
+
+def build_docx(path, paragraphs, tables, rows=12, cols=4):
+    document = docx.Document()
+    for i in range(paragraphs):
+        document.add_paragraph(SAMPLE_PARAGRAPHS[i % len(SAMPLE_PARAGRAPHS)])
+        if tables and i % max(1, paragraphs // tables) == 0 and len(document.tables) < tables:
+            table = document.add_table(rows=rows, cols=cols)
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    cell.text = f"Skill {r}.{c}: Python, SQL, Docker, leadership"
+    document.save(path)
+
+
+def python_docx_text(path):
+    return "\n".join(p.text for p in docx.Document(path).paragraphs)
+
+
+MEASURE = r"""
+import sys
+import docx
+from extraction import extract_text
+
+def status_kb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+
+path, extractor, max_chars = sys.argv[1], sys.argv[2], int(sys.argv[3])
+start = status_kb("VmRSS")
+if extractor == "python-docx":
+    text = "\n".join(p.text for p in docx.Document(path).paragraphs)
+else:
+    text = extract_text(path, max_chars=max_chars)
+print((status_kb("VmHWM") - start) * 1024)
+"""
+
+
+def peak_memory(path, extractor, max_chars):
+    """Bytes the RSS high-water mark grows by while a fresh process extracts ``path``, or None"""
+    if not os.path.exists("/proc/self/status"):
+        return None
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE, path, extractor, str(max_chars)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return int(output.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=5000)
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    budget = UPLOAD_CONFIG.get("max_text_length")
+    cases = {"paragraphs": (args.paragraphs, 0), "table-heavy": (args.paragraphs, args.tables)}
+    print(f"{'case':<12} {'extractor':<18} {'time':>10} {'peak mem':>10} {'chars':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for case, (paragraphs, tables) in cases.items():
+            path = os.path.join(directory, f"{case}.docx")
+            build_docx(path, paragraphs, tables)
+            print(f"{case:<12} ({os.path.getsize(path) / 1024:.0f} KB, {paragraphs} paragraphs, {tables} tables)")
+            extractors = {
+                "python-docx": ("python-docx", 0),
+                "streaming": ("streaming", 0),
+                f"streaming@{budget}": ("streaming", budget),
+            }
+            for name, (extractor, max_chars) in extractors.items():
+                if extractor == "python-docx":
+                    seconds, text = time_call(python_docx_text, path, repeat=args.repeat)
+                else:
+                    seconds, text = time_call(extract_text, path, max_chars=max_chars, repeat=args.repeat)
+                peak = peak_memory(path, extractor, max_chars)
+                memory = f"{peak / 2**20:>8.1f}MB" if peak is not None else f"{'-':>10}"
+                print(f"{'':<12} {name:<18} {seconds * 1000:>8.1f}ms {memory} {len(text):>10}")
+
+        # Extraction from an in-memory upload takes the same path
+        with open(os.path.join(directory, "table-heavy.docx"), "rb") as f:
+            data = f.read()
+        seconds, _ = time_call(extract_text, io.BytesIO(data), max_chars=0, repeat=args.repeat)
+        print(f"{'table-heavy':<12} {'streaming (bytes)':<18} {seconds * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
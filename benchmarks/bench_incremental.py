@@ -0,0 +1,71 @@
+"""
+Benchmark: re-analysis when only the job description changes
+Analyzes a resume file once (cold: extraction and every stage), then again with
+other job descriptions (only job matching runs; extraction and the other
+stages come from the memo and the per-stage result cache), and once more with
+a job description already seen (nothing runs).
+Models are replaced by deterministic stubs (benchmarks/stub_models.py) unless
+--real-models is given.
+Usage: python benchmarks/bench_incremental.py [--paragraphs 40] [--format docx] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+from common import synthetic_resume, write_resume
+
+import config
+
+config.CACHE_CONFIG.update(enabled=True, disk_path=None)
+
+import app  # noqa: E402
+from stub_models import install_stub_models  # noqa: E402
+
+JOB_DESCRIPTIONS = [
+    "Senior Python engineer: REST APIs, AWS, Docker, PostgreSQL, machine learning.",
+    "Frontend developer with React, JavaScript and TypeScript; testing and CI/CD experience.",
+    "Data engineer building Spark and Kafka pipelines, SQL, Airflow, cloud data warehouses.",
+    "Engineering manager: leadership, mentoring, agile delivery, stakeholder communication.",
+]
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--format", default="docx", choices=["txt", "docx", "pdf"])
+    parser.add_argument("--repeat", type=int, default=5, help="Resumes to analyze (each one cold, then warm)")
+    parser.add_argument("--real-models", action="store_true", help="Use the configured models instead of stubs")
+    parser.add_argument("--stub-latency-ms", type=float, default=2.0, help="Simulated model cost per input")
+    args = parser.parse_args()
+
+    if not args.real_models:
+        install_stub_models(app, args.stub_latency_ms)
+    timings = {"cold": [], "new job description": [], "seen job description": []}
+    with tempfile.TemporaryDirectory() as directory:
+        app.analyze_resume(write_resume(directory, "warmup", synthetic_resume(5), "txt"), JOB_DESCRIPTIONS[0])
+        for n in range(args.repeat):
+            # A unique line per resume keeps earlier repetitions out of the cache
+            text = f"{synthetic_resume(args.paragraphs)}\n\nReference {n} {time.time_ns()}"
+            path = write_resume(directory, f"resume_{n}", text, args.format)
+            timings["cold"].append(timed(app.analyze_resume, path, JOB_DESCRIPTIONS[0]))
+            for job_description in JOB_DESCRIPTIONS[1:]:
+                timings["new job description"].append(timed(app.analyze_resume, path, job_description))
+            timings["seen job description"].append(timed(app.analyze_resume, path, JOB_DESCRIPTIONS[0]))
+
+    cold = statistics.median(timings["cold"])
+    print(f"{'run':<22} {'median':>10} {'speedup':>8}")
+    for name, values in timings.items():
+        median = statistics.median(values)
+        print(f"{name:<22} {median * 1000:>8.1f}ms {cold / median:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
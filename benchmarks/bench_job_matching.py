@@ -0,0 +1,57 @@
+"""
+Benchmark: scoring N resumes against one job description
+Compares re-vectorizing the job description for every resume (fresh
+JobMatcher per call) with the cached posting vector and one sparse matrix
+product over all resumes (JobMatcher.match_many).
+Usage: python benchmarks/bench_job_matching.py [--resumes 100 1000 5000]
+"""
+
+import argparse
+import random
+
+from common import SAMPLE_PARAGRAPHS, time_call
+
+from jd_matching import JobMatcher
+
+JOB_DESCRIPTION = (
+    "Senior Software Engineer. We are looking for an engineer with 5+ years of Python and "
+    "JavaScript experience, building REST APIs and microservices on AWS. Requirements: Docker, "
+    "Kubernetes, PostgreSQL, CI/CD, Git, Linux. Experience with machine learning and data "
+    "pipelines is a plus. Strong communication, leadership and problem solving skills."
+)
+
+
+def make_resumes(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        "\n\n".join(rng.sample(SAMPLE_PARAGRAPHS, rng.randint(4, len(SAMPLE_PARAGRAPHS))))
+        for _ in range(n)
+    ]
+
+
+def per_resume(texts):
+    return [JobMatcher().match(text, JOB_DESCRIPTION) for text in texts]
+
+
+def batched(matcher, texts):
+    return matcher.match_many(texts, JOB_DESCRIPTION)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    matcher = JobMatcher()
+    print(f"{'resumes':>8} {'per-resume':>12} {'batched':>10} {'speedup':>8}")
+    for n in args.resumes:
+        texts = make_resumes(n)
+        slow_s, slow = time_call(per_resume, texts, repeat=args.repeat)
+        fast_s, fast = time_call(batched, matcher, texts, repeat=args.repeat)
+        assert [r["score"] for r in slow] == [r["score"] for r in fast]
+        print(f"{n:>8} {slow_s * 1000:>10.1f}ms {fast_s * 1000:>8.1f}ms {slow_s / fast_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: per-keyword substring scans vs. the compiled single-pass KeywordMatcher
+Uses the full keyword lists from config.py on generated inputs of ~50 KB.
+Usage: python benchmarks/bench_keyword_matching.py [--size-kb 50] [--repeat N]
+"""
+
+import argparse
+import random
+
+from common import SAMPLE_PARAGRAPHS, time_call
+
+from config import EDUCATION_KEYWORDS, EXPERIENCE_KEYWORDS, SOFT_SKILLS, TECHNICAL_SKILLS
+from keyword_matcher import KeywordMatcher
+
+CATEGORIES = {
+    "technical_skills": TECHNICAL_SKILLS,
+    "soft_skills": SOFT_SKILLS,
+    "education": EDUCATION_KEYWORDS,
+    "experience": EXPERIENCE_KEYWORDS,
+}
+
+# Words that contain short keywords as substrings ("git", "led", "go", "r", ...)
+DISTRACTORS = [
+    "digital", "called", "google", "algorithm", "ongoing", "marketing", "sold",
+    "scheduled", "worker", "category", "legitimate", "integration", "formal",
+]
+
+
+def legacy_scan(text):
+    """The original approach: one substring scan of the text per keyword"""
+    text_lower = text.lower()
+    return {
+        category: [kw for kw in keywords if kw in text_lower]
+        for category, keywords in CATEGORIES.items()
+    }
+
+
+def generate_text(size_kb, seed=0):
+    rng = random.Random(seed)
+    chunks = []
+    size = 0
+    while size < size_kb * 1024:
+        chunk = rng.choice(SAMPLE_PARAGRAPHS) + " " + " ".join(rng.choices(DISTRACTORS, k=8))
+        chunks.append(chunk)
+        size += len(chunk) + 2
+    return "\n\n".join(chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-kb", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    terms = sum(len(set(keywords)) for keywords in CATEGORIES.values())
+    build_s, matcher = time_call(KeywordMatcher, CATEGORIES, repeat=3)
+    text = generate_text(args.size_kb)
+
+    legacy_s, legacy_found = time_call(legacy_scan, text, repeat=args.repeat)
+    scan_s, found = time_call(lambda t: matcher.categorize(matcher.scan(t)), text, repeat=args.repeat)
+
+    print(f"keywords: {terms}   input: {len(text) / 1024:.1f} KB   matcher build: {build_s * 1000:.1f} ms")
+    print(f"per-keyword substring scans: {legacy_s * 1000:8.2f} ms")
+    print(f"single-pass matcher:         {scan_s * 1000:8.2f} ms   ({legacy_s / scan_s:.2f}x)")
+    print()
+    for category in CATEGORIES:
+        dropped = sorted(set(legacy_found[category]) - set(found[category]))
+        print(f"{category:<17} legacy {len(legacy_found[category]):>3}  matcher {len(found[category]):>3}"
+              f"  substring-only: {', '.join(dropped) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
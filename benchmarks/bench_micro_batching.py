@@ -0,0 +1,80 @@
+"""
+Benchmark: micro-batching model calls across concurrent requests
+Simulates N concurrent users, each analyzing one resume's sentiment and
+sections, and compares:
+- direct: every request calls the models on its own
+- batched: requests go through the inference server's MicroBatchers
+reporting throughput, p50/p95 request latency and the mean micro-batch size.
+Models are replaced by deterministic stubs (benchmarks/stub_models.py) with a
+fixed cost per call and per input unless --real-models is given.
+Usage: python benchmarks/bench_micro_batching.py [--users 1 4 16] [--requests 64] [--real-models]
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import synthetic_resume
+
+import app
+from inference_server import COALESCED_REQUESTS
+from stub_models import install_stub_models
+
+
+def analyze(text):
+    start = time.perf_counter()
+    app.analyze_sentiment_batch([text])
+    app.classify_sections_batch([text])
+    return time.perf_counter() - start
+
+
+def run(texts, users):
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        start = time.perf_counter()
+        latencies = sorted(pool.map(analyze, texts))
+        elapsed = time.perf_counter() - start
+    return len(texts) / elapsed, latencies
+
+
+def coalesced():
+    """Total micro-batches and requests served so far"""
+    snapshots = [COALESCED_REQUESTS.snapshot(model=name) for name in app.MODEL_RUNNERS]
+    return sum(s["count"] for s in snapshots), sum(s["sum"] for s in snapshots)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--paragraphs", type=int, default=8)
+    parser.add_argument("--real-models", action="store_true", help="Use the configured models instead of stubs")
+    parser.add_argument("--stub-latency-ms", type=float, default=1.0, help="Simulated model cost per input")
+    parser.add_argument("--stub-call-latency-ms", type=float, default=10.0, help="Simulated model cost per call")
+    args = parser.parse_args()
+
+    if not args.real_models:
+        install_stub_models(app, args.stub_latency_ms, args.stub_call_latency_ms)
+
+    texts = [f"{synthetic_resume(args.paragraphs)}\n\nApplicant {i}" for i in range(args.requests)]
+    batchers = dict(app.model_batchers)
+    analyze(texts[0])  # Load models
+
+    print(f"{'users':>5} {'mode':>8} {'req/s':>8} {'p50':>9} {'p95':>9} {'batch':>6}")
+    for users in args.users:
+        for mode in ("direct", "batched"):
+            app.model_batchers.clear()
+            if mode == "batched":
+                app.model_batchers.update(batchers)
+            batches, requests = coalesced()
+            throughput, latencies = run(texts, users)
+            batches, requests = coalesced()[0] - batches, coalesced()[1] - requests
+            batch = f"{requests / batches:.1f}" if batches else "-"
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f"{users:>5} {mode:>8} {throughput:>8.1f} {statistics.median(latencies) * 1000:>7.1f}ms "
+                  f"{p95 * 1000:>7.1f}ms {batch:>6}")
+    app.model_batchers.update(batchers)
+
+
+if __name__ == "__main__":
+    main()
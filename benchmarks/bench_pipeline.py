@@ -0,0 +1,147 @@
+"""
+Benchmark: end-to-end analysis pipeline with regression checks
+Generates synthetic TXT/DOCX/PDF resumes of several sizes and structures and
+times every stage (extraction, keywords, sentiment, sections, readability,
+job matching) and the full analyze_resume() call, with the result cache off.
+Models are replaced by deterministic stubs (benchmarks/stub_models.py) unless
+--real-models is given, so runs need no network or GPU.
+
+Save a baseline once, then compare later runs (e.g. after a transformers/torch
+upgrade or a config change); the run exits non-zero when a measurement is
+slower than its baseline by more than --threshold and --min-delta-ms.
+Usage:
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json [--threshold 0.25]
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import tempfile
+
+from common import SAMPLE_PARAGRAPHS, synthetic_resume, time_call, write_resume
+
+import config
+
+config.CACHE_CONFIG["enabled"] = False
+
+import app  # noqa: E402
+from document import Document  # noqa: E402
+from extraction import extract_text_from_file  # noqa: E402
+from stub_models import install_stub_models  # noqa: E402
+
+SIZES = {"small": 5, "medium": 20, "large": 80}
+FORMATS = ("txt", "docx", "pdf")
+JOB_DESCRIPTION = (
+    "We are hiring a senior Python engineer to build data pipelines and REST APIs on AWS. "
+    "Experience with Docker, Kubernetes, PostgreSQL and machine learning is a plus."
+)
+
+
+def build_resume(size, structure):
+    """``structure`` "sections" keeps blank lines between sections, "flat" has none"""
+    text = synthetic_resume(SIZES[size])
+    if structure == "flat":
+        text = text.replace("\n\n", "\n")
+    return text
+
+
+TEXT_STAGES = {
+    "keywords": lambda text: app.analyze_ats_keywords(Document(text)),
+    "sentiment": lambda text: app.analyze_sentiment_batch([text]),
+    "sections": lambda text: app.classify_sections_batch([text]),
+    "readability": lambda text: app.calculate_readability_score(Document(text)),
+    "job_match": lambda text: app.job_matcher.match(text, JOB_DESCRIPTION),
+}
+
+
+def run_benchmarks(directory, repeat, structures):
+    """``{name: median seconds}`` for every stage and case"""
+    results = {}
+    for size in SIZES:
+        for structure in structures:
+            text = build_resume(size, structure)
+            case = f"{size},{structure}"
+            for stage, fn in TEXT_STAGES.items():
+                results[f"{stage}[{case}]"], _ = time_call(fn, text, repeat=repeat)
+            for fmt in FORMATS:
+                path = write_resume(directory, f"{size}_{structure}", text, fmt)
+                results[f"extraction[{case},{fmt}]"], _ = time_call(extract_text_from_file, path, repeat=repeat)
+                results[f"pipeline[{case},{fmt}]"], _ = time_call(
+                    app.analyze_resume, path, JOB_DESCRIPTION, repeat=repeat
+                )
+    return results
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Print every measurement against its baseline; return the names that regressed"""
+    regressions = []
+    print(f"{'measurement':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40} {'-':>10} {seconds * 1000:>8.2f}ms {'new':>8}")
+            continue
+        change = seconds / base - 1 if base else 0.0
+        regressed = seconds > base * (1 + threshold) and (seconds - base) * 1000 > min_delta
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<40} {base * 1000:>8.2f}ms {seconds * 1000:>8.2f}ms {change:>+7.0%}{flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--structures", nargs="+", default=["sections", "flat"], choices=["sections", "flat"])
+    parser.add_argument("--real-models", action="store_true", help="Use the configured models instead of stubs")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="Simulated model cost per input")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--save-baseline", help="Write the results as a baseline JSON to this path")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    if not args.real_models:
+        install_stub_models(app, args.stub_latency_ms)
+    with tempfile.TemporaryDirectory() as directory:
+        app.analyze_resume(write_resume(directory, "warmup", "\n\n".join(SAMPLE_PARAGRAPHS), "txt"))
+        results = run_benchmarks(directory, args.repeat, args.structures)
+
+    report = {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "models": "real" if args.real_models else f"stub ({args.stub_latency_ms:g} ms/input)",
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("models") != report["meta"]["models"]:
+            print(f"Note: baseline used {baseline['meta'].get('models')} models, this run {report['meta']['models']}")
+        regressions = compare(results, baseline["results"], args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"FAIL: {len(regressions)} measurement(s) regressed by more than {args.threshold:.0%}")
+            failed = True
+    else:
+        for name, seconds in results.items():
+            print(f"{name:<40} {seconds * 1000:>8.2f}ms")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Benchmark: ranking N indexed resumes against a job description
+Builds a ResumeIndex of synthetic resumes in a temporary directory, then times
+a cold top-k query (fresh open, memory maps not yet paged in), warm queries,
+and an incremental add/remove.
+Usage: python benchmarks/bench_ranking.py [--resumes 5000] [--top 20]
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+from common import SAMPLE_PARAGRAPHS, time_call
+
+from bench_job_matching import JOB_DESCRIPTION
+from ranking import ResumeIndex
+
+KEYWORDS = {
+    "technical_skills": ["python", "java", "javascript", "aws", "docker", "kubernetes", "sql", "git",
+                         "linux", "postgresql", "machine learning", "react"],
+    "soft_skills": ["leadership", "communication", "problem solving", "collaboration"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    items = [
+        (f"resume-{i:06d}", "\n\n".join(rng.sample(SAMPLE_PARAGRAPHS, rng.randint(4, len(SAMPLE_PARAGRAPHS)))))
+        for i in range(args.resumes)
+    ]
+
+    path = tempfile.mkdtemp(prefix="resume_index_")
+    try:
+        started = time.perf_counter()
+        index = ResumeIndex(path, keywords=KEYWORDS)
+        for start in range(0, len(items), 1000):
+            index.add(items[start:start + 1000])
+        build_s = time.perf_counter() - started
+        stats = index.stats()
+
+        started = time.perf_counter()
+        ResumeIndex(path).top_k(JOB_DESCRIPTION, args.top)
+        cold_s = time.perf_counter() - started
+        warm_s, results = time_call(index.top_k, JOB_DESCRIPTION, args.top)
+
+        started = time.perf_counter()
+        index.add(items[:10])
+        index.remove([doc_id for doc_id, _ in items[10:20]])
+        update_s = time.perf_counter() - started
+
+        print(f"resumes:            {args.resumes}")
+        print(f"build:              {build_s:.2f}s ({stats['disk_bytes'] / 1e6:.1f} MB on disk)")
+        print(f"cold top-{args.top} query:  {cold_s * 1000:.1f}ms")
+        print(f"warm top-{args.top} query:  {warm_s * 1000:.1f}ms")
+        print(f"add 10 + remove 10: {update_s * 1000:.1f}ms")
+        print(f"best match:         {results[0]['id']} ({results[0]['score']})")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: header-first section detection cascade vs. the classifier alone
+Runs the resumes in benchmarks/fixtures/resumes (or --corpus) through the
+configured section backend for every paragraph, and through the cascade where
+paragraphs with an unambiguous header (section_classifier.HeaderSectionDetector,
+SECTION_CASCADE_CONFIG["min_confidence"]) skip the model. Reports the share of
+paragraphs that skipped the model, label agreement with the classifier and
+latency per resume.
+The classifier is replaced by a deterministic stub (benchmarks/stub_models.py)
+unless --real-models is given; agreement figures are only meaningful with it.
+Usage: python benchmarks/bench_section_cascade.py [--corpus DIR] [--min-confidence 0.9] [--repeat N] [--real-models]
+"""
+
+import argparse
+import glob
+import os
+
+from common import ROOT, time_call
+
+from config import MODEL_CONFIG, SECTION_CASCADE_CONFIG
+from document import Document
+from section_classifier import SECTION_LABELS, HeaderSectionDetector, create_section_engine, section_candidate_indices
+from stub_models import StubSectionClassifier
+
+THRESHOLD = 0.3  # Same confidence threshold as summarize_sections
+
+
+def accepted_sections(results):
+    return {r["labels"][0] for r in results if r["scores"][0] > THRESHOLD}
+
+
+def header_results(detector, paragraphs, indices, min_confidence):
+    detected = detector.detect_all(paragraphs)
+    return [detected[i] if detected[i] and detected[i]["scores"][0] >= min_confidence else None for i in indices]
+
+
+def cascade(engine, detector, paragraphs, indices, min_confidence):
+    detected = header_results(detector, paragraphs, indices, min_confidence)
+    ambiguous = [paragraphs[i][:512] for i, r in zip(indices, detected) if r is None]
+    predictions = iter(engine.classify(ambiguous, SECTION_LABELS) if ambiguous else [])
+    return [r or next(predictions) for r in detected]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "benchmarks", "fixtures", "resumes"))
+    parser.add_argument("--min-confidence", type=float, default=SECTION_CASCADE_CONFIG.get("min_confidence", 0.9))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--real-models", action="store_true", help="Use the configured classifier instead of a stub")
+    parser.add_argument("--stub-latency-ms", type=float, default=5.0, help="Simulated model cost per paragraph")
+    args = parser.parse_args()
+
+    documents = {}
+    for path in sorted(glob.glob(os.path.join(args.corpus, "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            paragraphs = Document(f.read()).paragraphs
+        documents[os.path.basename(path)] = (paragraphs, section_candidate_indices(paragraphs))
+    if not documents:
+        raise SystemExit(f"No .txt resumes found in {args.corpus}")
+
+    if args.real_models:
+        engine = create_section_engine(MODEL_CONFIG)
+    else:
+        engine = StubSectionClassifier(args.stub_latency_ms)
+    detector = HeaderSectionDetector()
+    paragraphs = skipped = agree = exact_docs = 0
+    model_ms = cascade_ms = 0.0
+
+    print(f"{'resume':<24} {'skipped':>8} {'model':>9} {'cascade':>9}  sections (model / cascade)")
+    for name, (all_paragraphs, indices) in documents.items():
+        candidates = [all_paragraphs[i][:512] for i in indices]
+        model_s, model_results = time_call(engine.classify, candidates, SECTION_LABELS, repeat=args.repeat)
+        cascade_s, cascade_results = time_call(
+            cascade, engine, detector, all_paragraphs, indices, args.min_confidence, repeat=args.repeat
+        )
+        header_routed = sum(r is not None for r in header_results(detector, all_paragraphs, indices,
+                                                                   args.min_confidence))
+        paragraphs += len(candidates)
+        skipped += header_routed
+        agree += sum(m["labels"][0] == c["labels"][0] for m, c in zip(model_results, cascade_results))
+        model_found, cascade_found = accepted_sections(model_results), accepted_sections(cascade_results)
+        exact_docs += model_found == cascade_found
+        model_ms += model_s * 1000
+        cascade_ms += cascade_s * 1000
+        print(f"{name:<24} {header_routed:>3}/{len(candidates):<4} {model_s * 1000:>7.1f}ms {cascade_s * 1000:>7.1f}ms  "
+              f"{', '.join(sorted(model_found)) or '-'} / {', '.join(sorted(cascade_found)) or '-'}")
+
+    print()
+    print(f"Paragraphs that skipped the model: {skipped}/{paragraphs} ({skipped / max(1, paragraphs):.0%})")
+    print(f"Top-label agreement with model:    {agree / max(1, paragraphs):.1%}")
+    print(f"found_sections exact match:        {exact_docs / len(documents):.1%}")
+    print(f"Mean latency: model {model_ms / len(documents):.1f} ms/resume, "
+          f"cascade {cascade_ms / len(documents):.1f} ms/resume")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: per-paragraph zero-shot loop vs. batched section classification
+The header-first cascade is switched off, so every candidate paragraph goes
+through the model in both variants (see bench_section_cascade.py for the cascade).
+Usage: python benchmarks/bench_section_classification.py [--repeat N]
+"""
+
+import argparse
+
+from common import synthetic_resume, time_call
+
+import config
+
+config.SECTION_CASCADE_CONFIG.update(enabled=False)
+
+import app  # noqa: E402
+from section_classifier import SECTION_LABELS  # noqa: E402
+
+
+def legacy_classify_resume_sections(text, classifier):
+    """The original one-pipeline-call-per-paragraph implementation"""
+    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+    if not paragraphs:
+        return {"sections_identified": 0, "completeness": 20}
+
+    classified_sections = set()
+    for paragraph in paragraphs[:10]:
+        if len(paragraph) > 20:
+            result = classifier(paragraph[:512], candidate_labels=SECTION_LABELS)
+            if result['scores'][0] > 0.3:
+                classified_sections.add(result['labels'][0])
+
+    completeness = (len(classified_sections) / len(SECTION_LABELS)) * 100
+    return {
+        "sections_identified": len(classified_sections),
+        "completeness": min(100, completeness),
+        "found_sections": list(classified_sections)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = app.models.get("sections")
+    if not hasattr(engine, "pipeline"):
+        raise SystemExit("This benchmark needs MODEL_CONFIG['section_backend'] = 'zero_shot'")
+
+    print(f"batch_size={engine.batch_size}")
+    print(f"{'paragraphs':>10} {'loop (ms)':>12} {'batched (ms)':>13} {'speedup':>8} {'same':>5}")
+    for n in range(1, 11):
+        text = synthetic_resume(n)
+        loop_s, loop_result = time_call(
+            legacy_classify_resume_sections, text, engine.pipeline, repeat=args.repeat
+        )
+        batch_s, batch_result = time_call(app.classify_resume_sections, text, repeat=args.repeat)
+        same = (
+            loop_result["sections_identified"] == batch_result["sections_identified"]
+            and set(loop_result["found_sections"]) == set(batch_result["found_sections"])
+        )
+        print(f"{n:>10} {loop_s * 1000:>12.1f} {batch_s * 1000:>13.1f} "
+              f"{loop_s / batch_s:>7.2f}x {'yes' if same else 'NO':>5}")
+
+
+if __name__ == "__main__":
+    main()
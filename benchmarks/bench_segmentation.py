@@ -0,0 +1,52 @@
+"""
+Benchmark: regex vs. NLTK sentence/word segmentation for readability scoring
+For inputs from 1 KB to 100 KB times sentence + word segmentation with the
+regex segmenter and with NLTK Punkt/Treebank, and compares the counts and the
+resulting readability scores.
+Usage: python benchmarks/bench_segmentation.py [--sizes-kb 1 10 100]
+"""
+
+import argparse
+
+from common import synthetic_resume, time_call
+
+from app import calculate_readability_score
+from document import Document, ensure_nltk_data
+
+
+def text_of_size(kb):
+    text = ""
+    paragraphs = 10
+    while len(text) < kb * 1024:
+        text = synthetic_resume(paragraphs)
+        paragraphs *= 2
+    return text[:kb * 1024]
+
+
+def segment(text, segmenter):
+    document = Document(text, segmenter)
+    return document.sentences, document.words
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes-kb", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ensure_nltk_data()
+    print(f"{'size':>6} {'nltk':>10} {'regex':>10} {'speedup':>8} {'sentences':>14} {'words':>16} {'readability':>12}")
+    for kb in args.sizes_kb:
+        text = text_of_size(kb)
+        nltk_s, (nltk_sentences, nltk_words) = time_call(segment, text, "nltk", repeat=args.repeat)
+        regex_s, (regex_sentences, regex_words) = time_call(segment, text, "regex", repeat=args.repeat)
+        nltk_score = calculate_readability_score(Document(text, "nltk"))
+        regex_score = calculate_readability_score(Document(text, "regex"))
+        print(f"{kb:>4}KB {nltk_s * 1000:>8.2f}ms {regex_s * 1000:>8.2f}ms {nltk_s / regex_s:>7.1f}x "
+              f"{len(nltk_sentences):>6}/{len(regex_sentences):<7} {len(nltk_words):>7}/{len(regex_words):<8} "
+              f"{nltk_score:>5}/{regex_score:<6}")
+    print("(counts and scores are nltk/regex)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: windowed sentiment over the whole resume
+For resumes of increasing length compares:
+- first five sentences only (the previous behaviour)
+- one model call per token window
+- all token windows in one batched call (analyze_sentiment_batch)
+and reports latency and the share of the resume's tokens the model saw.
+The model is replaced by a deterministic stub (benchmarks/stub_models.py, which
+counts whitespace tokens) unless --real-models is given.
+Usage: python benchmarks/bench_sentiment_windows.py [--paragraphs 5 20 50] [--real-models]
+"""
+
+import argparse
+
+from common import synthetic_resume, time_call
+
+import app
+from chunking import token_windows
+from config import MODEL_CONFIG
+from document import Document
+from stub_models import install_stub_models
+
+
+def first_sentences(analyzer, text):
+    return analyzer(" ".join(Document(text).sentences[:5])[:512])
+
+
+def window_per_call(analyzer, windows):
+    return [analyzer(window_text, truncation=True) for window_text, _ in windows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--real-models", action="store_true", help="Use the configured model instead of a stub")
+    parser.add_argument("--stub-latency-ms", type=float, default=1.0, help="Simulated model cost per input")
+    parser.add_argument("--stub-call-latency-ms", type=float, default=10.0, help="Simulated model cost per call")
+    args = parser.parse_args()
+
+    if not args.real_models:
+        install_stub_models(app, args.stub_latency_ms, args.stub_call_latency_ms)
+
+    analyzer = app.models.get("sentiment")
+    tokenizer = analyzer.tokenizer
+    max_tokens = MODEL_CONFIG.get("max_chunk_size", 512)
+    max_chunks = MODEL_CONFIG.get("max_chunks", 3)
+
+    print(f"{'paragraphs':>10} {'tokens':>7} {'windows':>8} {'first-5':>10} {'per-call':>10} "
+          f"{'batched':>10} {'coverage before':>16} {'after':>6}")
+    for n in args.paragraphs:
+        text = synthetic_resume(n)
+        total_tokens = len(tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"])
+        windows = token_windows(tokenizer, text, max_tokens, max_chunks)
+        sample = " ".join(Document(text).sentences[:5])[:512]
+        sample_tokens = len(tokenizer(sample, add_special_tokens=False)["input_ids"])
+
+        first_s, _ = time_call(first_sentences, analyzer, text, repeat=args.repeat)
+        per_call_s, _ = time_call(window_per_call, analyzer, windows, repeat=args.repeat)
+        batched_s, _ = time_call(app.analyze_sentiment_batch, [text], repeat=args.repeat)
+        covered = sum(count for _, count in windows)
+        print(f"{n:>10} {total_tokens:>7} {len(windows):>8} {first_s * 1000:>8.1f}ms "
+              f"{per_call_s * 1000:>8.1f}ms {batched_s * 1000:>8.1f}ms "
+              f"{sample_tokens / total_tokens:>16.0%} {covered / total_tokens:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: cold-start cost of the app
+Measures, each in a fresh interpreter:
+- import time of `app` (and whether importing it pulled in transformers/torch)
+- time to first analysis (import + model load + first analyze_resume call)
+- time of a second, warm analysis (result cache disabled)
+Usage: python benchmarks/bench_startup.py [--runs N] [--json OUT] [--max-import-seconds S]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from common import ROOT
+
+RESUME = os.path.join(ROOT, "benchmarks", "fixtures", "resumes", "software_engineer.txt")
+
+PROBE = r"""
+import json, sys, time
+started = time.perf_counter()
+import config
+config.CACHE_CONFIG["enabled"] = False
+import app
+imported = time.perf_counter()
+result = {
+    "import_seconds": imported - started,
+    "transformers_imported": "transformers" in sys.modules,
+    "torch_imported": "torch" in sys.modules,
+}
+if sys.argv[2] == "request":
+    app.analyze_resume(sys.argv[1])
+    first = time.perf_counter()
+    app.analyze_resume(sys.argv[1])
+    result["first_request_seconds"] = first - imported
+    result["time_to_first_request_seconds"] = first - started
+    result["warm_request_seconds"] = time.perf_counter() - first
+print("BENCH_RESULT " + json.dumps(result))
+"""
+
+
+def run_probe(mode):
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE, RESUME, mode],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith("BENCH_RESULT "):
+            return json.loads(line[len("BENCH_RESULT "):])
+    raise RuntimeError(f"Probe produced no result:\n{completed.stdout}\n{completed.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per measurement")
+    parser.add_argument("--skip-request", action="store_true", help="Only measure import time")
+    parser.add_argument("--json", help="Write the results as JSON to this path")
+    parser.add_argument("--max-import-seconds", type=float, help="Exit non-zero if import is slower")
+    args = parser.parse_args()
+
+    imports = [run_probe("import") for _ in range(args.runs)]
+    report = {
+        "import_seconds": statistics.median(r["import_seconds"] for r in imports),
+        "transformers_imported": any(r["transformers_imported"] for r in imports),
+        "torch_imported": any(r["torch_imported"] for r in imports),
+    }
+    print(f"import app:              {report['import_seconds']:8.2f} s   "
+          f"(transformers imported: {report['transformers_imported']}, torch imported: {report['torch_imported']})")
+
+    if not args.skip_request:
+        requests = [run_probe("request") for _ in range(args.runs)]
+        for key in ("time_to_first_request_seconds", "first_request_seconds", "warm_request_seconds"):
+            report[key] = statistics.median(r[key] for r in requests)
+        print(f"time to first request:   {report['time_to_first_request_seconds']:8.2f} s")
+        print(f"first request (cold):    {report['first_request_seconds']:8.2f} s")
+        print(f"second request (warm):   {report['warm_request_seconds']:8.2f} s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = report["transformers_imported"] or report["torch_imported"]
+    if failed:
+        print("FAIL: importing app loaded transformers/torch")
+    if args.max_import_seconds is not None and report["import_seconds"] > args.max_import_seconds:
+        print(f"FAIL: import took longer than {args.max_import_seconds:.2f} s")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
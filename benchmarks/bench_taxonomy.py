@@ -0,0 +1,75 @@
+"""
+Benchmark: compiled keyword taxonomy (taxonomy.py)
+Reports the compile time of the config.py taxonomy, per-resume keyword
+scoring plus suggestions with the taxonomy (one scan, bitmask lookups) against
+the previous approach (categorize the scan per category, then set differences
+over the raw lists), and how long a changed taxonomy file takes to reach
+TaxonomyStore.current().
+Usage: python benchmarks/bench_taxonomy.py [--paragraphs 40] [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from common import synthetic_resume, time_call
+
+from config import ATS_KEYWORDS
+from keyword_matcher import KeywordMatcher
+from taxonomy import TaxonomyStore, default_spec, load_taxonomy
+
+
+def legacy_keywords(matcher, text):
+    found_keywords = matcher.categorize(matcher.scan(text))
+    scores = {category: min(100, len(found_keywords[category]) / len(keywords) * 100)
+              for category, keywords in ATS_KEYWORDS.items()}
+    missing = {category: list(set(ATS_KEYWORDS[category]) - set(found_keywords[category]))[:3]
+               for category in ("technical_skills", "soft_skills")}
+    return scores, found_keywords, missing
+
+
+def taxonomy_keywords(taxonomy, text):
+    scores, found_keywords = taxonomy.analyze(text)
+    missing = {category: taxonomy.missing(category, found_keywords[category], 3)
+               for category in ("technical_skills", "soft_skills")}
+    return scores, found_keywords, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    compile_s, taxonomy = time_call(load_taxonomy, repeat=5)
+    print(f"Taxonomy {taxonomy.version}: {len(taxonomy)} keywords, {len(taxonomy.aliases)} aliases, "
+          f"compiled in {compile_s * 1000:.1f} ms")
+
+    text = synthetic_resume(args.paragraphs) + "\nPlatform work on k8s, Node.js services and Postgres."
+    matcher = KeywordMatcher(ATS_KEYWORDS)
+    legacy_s, (_, legacy_found, _) = time_call(legacy_keywords, matcher, text, repeat=args.repeat)
+    taxonomy_s, (_, found, _) = time_call(taxonomy_keywords, taxonomy, text, repeat=args.repeat)
+    print(f"{'':<22} {'per resume':>12} {'found':>6}")
+    print(f"{'scored lists only':<22} {legacy_s * 1000:>10.3f}ms {sum(map(len, legacy_found.values())):>6}")
+    print(f"{'taxonomy':<22} {taxonomy_s * 1000:>10.3f}ms {sum(map(len, found.values())):>6}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "taxonomy.json")
+        spec = default_spec()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(spec, f)
+        store = TaxonomyStore(path, check_interval=0)
+        spec = dict(spec, version="edited", aliases=dict(spec["aliases"], kube="kubernetes"))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(spec, f)
+        started = time.perf_counter()
+        version = store.current().version
+        print(f"Hot reload: {(time.perf_counter() - started) * 1000:.1f} ms until current() returned {version!r}")
+        seconds, _ = time_call(store.current, repeat=args.repeat)
+        print(f"current() without changes: {seconds * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
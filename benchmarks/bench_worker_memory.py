@@ -0,0 +1,146 @@
+"""
+Benchmark: memory per worker of the pre-fork server (workers.py)
+Starts `workers.py` with models preloaded in the parent (weights shared
+copy-on-write) and with every worker loading its own models, sends a few
+requests so the workers have run the models, and reads /proc/<pid>/smaps_rollup
+of the parent and every worker:
+- RSS counts shared pages in full for every process
+- PSS splits shared pages between the processes mapping them (sums to the real total)
+- Private is what the process alone holds; the cost of one more worker
+Linux only.
+Usage: python benchmarks/bench_worker_memory.py [--workers 4] [--requests 8] [--set MODEL_CONFIG_KEY=VALUE ...]
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from common import ROOT, synthetic_resume
+
+LAUNCHER = r"""
+import json, sys
+import config
+config.MODEL_CONFIG.update(json.loads(sys.argv[1]))
+import workers
+workers.main(sys.argv[2:])
+"""
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def children_of(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def memory(pid):
+    """``{"rss", "pss", "shared", "private"}`` in MiB from smaps_rollup"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1]) / 1024
+    return {
+        "rss": fields.get("Rss", 0.0),
+        "pss": fields.get("Pss", 0.0),
+        "shared": fields.get("Shared_Clean", 0.0) + fields.get("Shared_Dirty", 0.0),
+        "private": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def measure(mode, workers, requests, overrides, timeout):
+    port = free_port()
+    args = ["--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)]
+    if mode == "per-worker":
+        args.append("--no-preload")
+    process = subprocess.Popen(
+        [sys.executable, "-c", LAUNCHER, json.dumps(overrides), *args],
+        cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    try:
+        # Keep draining the workers' output: a full pipe would block their logging
+        ready = threading.Semaphore(0)
+
+        def drain():
+            for line in process.stdout:
+                if line.startswith("Worker ") and line.rstrip().endswith(" ready"):
+                    ready.release()
+
+        threading.Thread(target=drain, daemon=True).start()
+        deadline = time.time() + timeout
+        for _ in range(workers):
+            if not ready.acquire(timeout=max(0.0, deadline - time.time())):
+                raise RuntimeError(f"Workers not ready after {timeout:g} s ({mode})")
+        time.sleep(1)  # Let uvicorn start accepting
+
+        text = synthetic_resume(10)
+        for n in range(requests):
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{port}/v1/score",
+                data=f"{text}\n\nRequest {n}".encode("utf-8"),
+                headers={"Content-Type": "text/plain"},
+            )
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+
+        parent = memory(process.pid)
+        workers_memory = [memory(child) for child in children_of(process.pid)]
+        return parent, workers_memory
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=8, help="Requests sent before measuring")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a MODEL_CONFIG entry in the workers, e.g. inference_backend=quantized")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--json", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        parser.error("needs Linux /proc/<pid>/smaps_rollup")
+    overrides = dict(item.split("=", 1) for item in args.set)
+
+    report = {}
+    print(f"{'mode':<11} {'process':<9} {'RSS':>9} {'PSS':>9} {'shared':>9} {'private':>9}")
+    for mode in ("preloaded", "per-worker"):
+        parent, workers_memory = measure(mode, args.workers, args.requests, overrides, args.timeout)
+        for name, values in [("parent", parent)] + [(f"worker {i}", m) for i, m in enumerate(workers_memory)]:
+            print(f"{mode:<11} {name:<9} {values['rss']:>7.0f}MB {values['pss']:>7.0f}MB "
+                  f"{values['shared']:>7.0f}MB {values['private']:>7.0f}MB")
+        total = parent["pss"] + sum(m["pss"] for m in workers_memory)
+        per_worker = sum(m["private"] for m in workers_memory) / max(1, len(workers_memory))
+        print(f"{mode:<11} {'total':<9} {'':>9} {total:>7.0f}MB   (private per worker: {per_worker:.0f} MB)")
+        report[mode] = {"parent": parent, "workers": workers_memory,
+                        "total_pss_mb": total, "private_per_worker_mb": per_worker}
+
+    saved = report["per-worker"]["total_pss_mb"] - report["preloaded"]["total_pss_mb"]
+    print(f"Preloading saves {saved:.0f} MB across {args.workers} workers")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
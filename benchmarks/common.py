@@ -0,0 +1,118 @@
+"""
+Shared helpers for the AI ATS Resume Rater benchmarks
+Run benchmark scripts from the repository root, e.g.
+    python benchmarks/bench_section_classification.py
+"""
+
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+SAMPLE_PARAGRAPHS = [
+    "PROFESSIONAL SUMMARY\nResults-driven software engineer with 6 years of experience "
+    "building scalable web applications and data pipelines in Python and JavaScript.",
+    "EXPERIENCE\nSenior Software Engineer, Acme Corp (2019 - Present)\n"
+    "- Led a team of 5 engineers to deliver a microservices platform on AWS\n"
+    "- Optimized PostgreSQL queries, reducing API latency by 40%",
+    "EDUCATION\nBachelor of Science in Computer Science, Caraga State University, 2018\n"
+    "Relevant coursework: algorithms, databases, machine learning",
+    "SKILLS\nPython, Java, JavaScript, React, Docker, Kubernetes, SQL, Git, Linux, "
+    "communication, leadership, problem solving",
+    "ACHIEVEMENTS\n- Won first place at the regional hackathon 2017\n"
+    "- Increased test coverage from 45% to 90% across three services",
+    "Software Engineer, Beta Labs (2017 - 2019)\n- Developed REST APIs with Flask and "
+    "implemented CI/CD pipelines with GitHub Actions",
+    "CERTIFICATIONS\nAWS Certified Solutions Architect - Associate\n"
+    "Certified Scrum Master",
+    "PROJECTS\nResume Rater: built an AI-powered resume analysis tool using "
+    "HuggingFace transformers and Gradio",
+    "Volunteer mentor at local coding bootcamp, coaching 20+ students in web "
+    "development fundamentals and collaboration practices",
+    "Languages: English (fluent), Filipino (native). Interests: open source, "
+    "data visualization, distributed systems",
+]
+
+
+def synthetic_resume(n_paragraphs):
+    """Build a resume text with ``n_paragraphs`` blank-line separated paragraphs"""
+    paragraphs = [
+        SAMPLE_PARAGRAPHS[i % len(SAMPLE_PARAGRAPHS)]
+        for i in range(n_paragraphs)
+    ]
+    return "\n\n".join(paragraphs)
+
+
+def time_call(fn, *args, repeat=5, warmup=1, **kwargs):
+    """Return (median seconds, last result) over ``repeat`` timed calls"""
+    result = None
+    for _ in range(warmup):
+        result = fn(*args, **kwargs)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def _pdf_string(line):
+    """A line as a PDF literal string in the standard Latin-1 font encoding"""
+    line = line.encode("latin-1", errors="replace").decode("latin-1")
+    return "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def write_pdf(path, text, lines_per_page=50):
+    """Write ``text`` as a plain multi-page PDF (Helvetica, one text line per line)"""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and a content stream per page
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        content = "BT /F1 10 Tf 14 TL 50 760 Td\n" + "\n".join(f"{_pdf_string(l)} Tj T*" for l in page) + "\nET"
+        data = content.encode("latin-1")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects) + 2} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+        objects.append(f"<< /Length {len(data)} >>\nstream\n{content}\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(path, text):
+    """Write ``text`` as a DOCX with one paragraph per line"""
+    import docx
+
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_resume(directory, name, text, fmt):
+    """Write ``text`` as ``<directory>/<name>.<fmt>`` (txt, pdf or docx) and return the path"""
+    path = os.path.join(directory, f"{name}.{fmt}")
+    if fmt == "pdf":
+        write_pdf(path, text)
+    elif fmt == "docx":
+        write_docx(path, text)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return path
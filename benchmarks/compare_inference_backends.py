@@ -0,0 +1,120 @@
+"""
+Accuracy drift and latency of the CPU inference backends (pytorch / quantized / onnx)
+Runs the sentiment model and the zero-shot section classifier over the fixture
+corpus with every backend and compares each against fp32 PyTorch:
+- label agreement and max absolute score drift of the raw predictions
+- agreement of the app-level outputs (tone result, found sections)
+- median latency per resume
+Usage: python benchmarks/compare_inference_backends.py [--backends pytorch quantized onnx] [--repeat N]
+"""
+
+import argparse
+import glob
+import json
+import os
+
+from common import ROOT, time_call
+
+import app
+from config import MODEL_CONFIG
+from document import Document
+from inference_backends import BACKENDS, load_pipeline, weights_variant
+from section_classifier import SECTION_LABELS, create_section_engine, section_candidates
+
+
+def load_corpus(corpus_dir):
+    documents = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.txt"))):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        document = Document(text)
+        sample = " ".join(document.sentences[:5])[:512]
+        documents.append((os.path.basename(path), sample, section_candidates(document.paragraphs)))
+    return documents
+
+
+def run_backend(backend, documents, repeat):
+    config = {**MODEL_CONFIG, "inference_backend": backend, "section_backend": "zero_shot"}
+    sentiment = load_pipeline("sentiment-analysis", config["sentiment_model"], config)
+    sections = create_section_engine(config)
+    for model in (sentiment, sections):
+        # Loading falls back to PyTorch when ONNX Runtime is missing; don't report that as this backend
+        variant = weights_variant(model)
+        if not variant or variant.split("/")[0] != backend:
+            raise RuntimeError(f"loaded {variant or 'an unknown backend'} instead")
+
+    outputs = []
+    latencies = []
+    for _, sample, candidates in documents:
+        sentiment_s, prediction = time_call(lambda: sentiment(sample)[0], repeat=repeat)
+        sections_s, section_results = time_call(sections.classify, candidates, SECTION_LABELS, repeat=repeat)
+        latencies.append(sentiment_s + sections_s)
+        outputs.append((prediction, section_results))
+    return outputs, sorted(latencies)[len(latencies) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "benchmarks", "fixtures", "resumes"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    documents = load_corpus(args.corpus)
+    backends = ["pytorch"] + [b for b in args.backends if b != "pytorch"]
+
+    results = {}
+    for backend in backends:
+        try:
+            results[backend] = run_backend(backend, documents, args.repeat)
+        except Exception as e:
+            print(f"{backend}: skipped ({e})")
+
+    reference, reference_latency = results["pytorch"]
+    report = {}
+    print(f"{'backend':<10} {'latency':>10} {'speedup':>8} {'sent. label':>12} {'sent. drift':>12} "
+          f"{'tone same':>10} {'top label':>10} {'sect. drift':>12} {'sections same':>14}")
+    for backend, (outputs, latency) in results.items():
+        sentiment_agree = tone_agree = top_agree = sections_agree = paragraphs = 0
+        sentiment_drift = section_drift = 0.0
+        for (ref_pred, ref_sections), (pred, sections) in zip(reference, outputs):
+            sentiment_agree += ref_pred["label"] == pred["label"]
+            sentiment_drift = max(sentiment_drift, abs(ref_pred["score"] - pred["score"]))
+            tone_agree += app.tone_from_prediction(ref_pred) == app.tone_from_prediction(pred)
+            for ref, res in zip(ref_sections, sections):
+                paragraphs += 1
+                top_agree += ref["labels"][0] == res["labels"][0]
+                ref_scores = dict(zip(ref["labels"], ref["scores"]))
+                section_drift = max(section_drift, max(
+                    abs(ref_scores[label] - score) for label, score in zip(res["labels"], res["scores"])
+                ))
+            sections_agree += (
+                set(app.summarize_sections(ref_sections)["found_sections"])
+                == set(app.summarize_sections(sections)["found_sections"])
+            )
+
+        n = len(documents)
+        report[backend] = {
+            "median_latency_ms": latency * 1000,
+            "speedup": reference_latency / latency,
+            "sentiment_label_agreement": sentiment_agree / n,
+            "sentiment_max_score_drift": sentiment_drift,
+            "tone_result_agreement": tone_agree / n,
+            "section_top_label_agreement": top_agree / paragraphs if paragraphs else 1.0,
+            "section_max_score_drift": section_drift,
+            "found_sections_agreement": sections_agree / n,
+        }
+        r = report[backend]
+        print(f"{backend:<10} {r['median_latency_ms']:>8.1f}ms {r['speedup']:>7.2f}x "
+              f"{r['sentiment_label_agreement']:>12.0%} {r['sentiment_max_score_drift']:>12.4f} "
+              f"{r['tone_result_agreement']:>10.0%} {r['section_top_label_agreement']:>10.0%} "
+              f"{r['section_max_score_drift']:>12.4f} {r['found_sections_agreement']:>14.0%}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
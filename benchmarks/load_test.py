@@ -0,0 +1,144 @@
+"""
+Load generator for a running AI ATS Resume Rater server
+Sends resumes from benchmarks/fixtures/resumes to the JSON API of a server
+started with `python server.py`, from several concurrent clients that each keep
+one connection alive, and reports throughput, latency percentiles and errors
+per concurrency level. Every request gets a unique suffix so the server's
+result cache does not hide the analysis cost (--allow-cache to keep hits).
+Usage:
+    python server.py &
+    python benchmarks/load_test.py [--url http://localhost:7860] [--concurrency 1 4 16] [--requests 64]
+"""
+
+import argparse
+import glob
+import http.client
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+from common import ROOT
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures", "resumes")
+JOB_DESCRIPTION = "Senior Python engineer: REST APIs, AWS, Docker, PostgreSQL, machine learning."
+
+
+class Client:
+    """One keep-alive connection per load-generator thread"""
+
+    _local = threading.local()
+
+    def __init__(self, url, timeout):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def post(self, path, body, content_type):
+        connection = self._connection()
+        try:
+            connection.request("POST", path, body=body, headers={"Content-Type": content_type})
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            raise
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_level(client, texts, concurrency, requests, job_description, unique):
+    query = "?" + urlencode({"job_description": job_description}) if job_description else ""
+
+    def one(n):
+        text = texts[n % len(texts)]
+        if unique:
+            text = f"{text}\n\nLoad test request {n} {time.time_ns()}"
+        started = time.perf_counter()
+        try:
+            status = client.post("/v1/score" + query, text.encode("utf-8"), "text/plain; charset=utf-8")
+        except Exception as e:
+            status = type(e).__name__
+        return status, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        outcomes = list(pool.map(one, range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(seconds for status, seconds in outcomes if status == 200)
+    statuses = {}
+    for status, _ in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "ok": len(latencies),
+        "statuses": statuses,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p95_ms": percentile(latencies, 0.95) * 1000 if latencies else None,
+        "p99_ms": percentile(latencies, 0.99) * 1000 if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:7860")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level")
+    parser.add_argument("--job-description", default=JOB_DESCRIPTION)
+    parser.add_argument("--allow-cache", action="store_true", help="Repeat identical resumes")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--json", help="Write the results as JSON to this path")
+    parser.add_argument("--max-p95-ms", type=float, help="Exit non-zero if any level's p95 is slower")
+    args = parser.parse_args()
+
+    texts = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            texts.append(f.read())
+
+    client = Client(args.url, args.timeout)
+    levels = []
+    print(f"{'clients':>7} {'ok':>5} {'req/s':>8} {'p50':>10} {'p95':>10} {'p99':>10}  statuses")
+    for concurrency in args.concurrency:
+        level = run_level(client, texts, concurrency, args.requests, args.job_description, not args.allow_cache)
+        levels.append(level)
+        p50, p95, p99 = (f"{level[key]:.0f}ms" if level[key] is not None else "-" for key in ("p50_ms", "p95_ms", "p99_ms"))
+        print(f"{concurrency:>7} {level['ok']:>5} {level['throughput']:>8.2f} {p50:>10} {p95:>10} {p99:>10}  "
+              f"{json.dumps(level['statuses'])}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"url": args.url, "levels": levels}, f, indent=2)
+
+    failed = any(level["ok"] < level["requests"] for level in levels)
+    if failed:
+        print("FAIL: some requests did not succeed")
+    if args.max_p95_ms is not None:
+        slow = [level for level in levels if level["p95_ms"] is None or level["p95_ms"] > args.max_p95_ms]
+        if slow:
+            print(f"FAIL: p95 above {args.max_p95_ms:g} ms at concurrency "
+                  f"{', '.join(str(level['concurrency']) for level in slow)}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
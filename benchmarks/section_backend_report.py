@@ -0,0 +1,107 @@
+"""
+Agreement and latency report: embedding section backend vs. BART-MNLI reference
+Runs both backends over the resumes in benchmarks/fixtures/resumes (or --corpus)
+and reports how often the embedding backend agrees with BART and how fast each is.
+Usage: python benchmarks/section_backend_report.py [--corpus DIR] [--repeat N] [--json OUT]
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+
+from common import ROOT, time_call
+
+from config import MODEL_CONFIG
+from section_classifier import SECTION_LABELS, create_section_engine, section_candidates
+
+THRESHOLD = 0.3  # Same confidence threshold as classify_resume_sections
+
+
+def load_corpus(corpus_dir):
+    documents = {}
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.txt"))):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        documents[os.path.basename(path)] = section_candidates(paragraphs)
+    return documents
+
+
+def load_engine(backend):
+    start = time.perf_counter()
+    engine = create_section_engine({**MODEL_CONFIG, "section_backend": backend})
+    return engine, time.perf_counter() - start
+
+
+def accepted_sections(results):
+    return {r["labels"][0] for r in results if r["scores"][0] > THRESHOLD}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", default=os.path.join(ROOT, "benchmarks", "fixtures", "resumes"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    documents = load_corpus(args.corpus)
+    if not documents:
+        raise SystemExit(f"No .txt resumes found in {args.corpus}")
+
+    reference, reference_load = load_engine("zero_shot")
+    candidate, candidate_load = load_engine("embedding")
+
+    paragraphs = agree_top = agree_accepted = 0
+    exact_docs = 0
+    jaccards = []
+    latency = {"zero_shot": [], "embedding": []}
+
+    print(f"{'resume':<28} {'BART sections':<40} {'embedding sections':<40}")
+    for name, candidates in documents.items():
+        ref_s, ref_results = time_call(reference.classify, candidates, SECTION_LABELS, repeat=args.repeat)
+        emb_s, emb_results = time_call(candidate.classify, candidates, SECTION_LABELS, repeat=args.repeat)
+        latency["zero_shot"].append(ref_s)
+        latency["embedding"].append(emb_s)
+
+        for ref, emb in zip(ref_results, emb_results):
+            paragraphs += 1
+            agree_top += ref["labels"][0] == emb["labels"][0]
+            agree_accepted += accepted_sections([ref]) == accepted_sections([emb])
+
+        ref_found = accepted_sections(ref_results)
+        emb_found = accepted_sections(emb_results)
+        exact_docs += ref_found == emb_found
+        union = ref_found | emb_found
+        jaccards.append(len(ref_found & emb_found) / len(union) if union else 1.0)
+        print(f"{name:<28} {', '.join(sorted(ref_found)) or '-':<40} {', '.join(sorted(emb_found)) or '-':<40}")
+
+    report = {
+        "resumes": len(documents),
+        "paragraphs": paragraphs,
+        "top_label_agreement": agree_top / paragraphs if paragraphs else 0.0,
+        "accepted_label_agreement": agree_accepted / paragraphs if paragraphs else 0.0,
+        "found_sections_exact_match": exact_docs / len(documents),
+        "found_sections_mean_jaccard": sum(jaccards) / len(jaccards),
+        "load_seconds": {"zero_shot": reference_load, "embedding": candidate_load},
+        "mean_latency_ms": {k: 1000 * sum(v) / len(v) for k, v in latency.items()},
+    }
+
+    print()
+    print(f"Paragraphs compared:         {report['paragraphs']} across {report['resumes']} resumes")
+    print(f"Top-label agreement:         {report['top_label_agreement']:.1%}")
+    print(f"Accepted-label agreement:    {report['accepted_label_agreement']:.1%}")
+    print(f"found_sections exact match:  {report['found_sections_exact_match']:.1%}")
+    print(f"found_sections mean Jaccard: {report['found_sections_mean_jaccard']:.2f}")
+    for backend in ("zero_shot", "embedding"):
+        print(f"{backend:<10} load {report['load_seconds'][backend]:6.1f}s   "
+              f"mean latency {report['mean_latency_ms'][backend]:8.1f} ms/resume")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
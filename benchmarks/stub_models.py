@@ -0,0 +1,94 @@
+"""
+Deterministic stand-ins for the AI ATS Resume Rater models
+They have the same call signatures as the sentiment pipeline and the section
+classifier, need no downloads and cost a fixed ``latency_ms`` per input, so
+pipeline benchmarks measure the app's own overhead reproducibly on any CPU.
+``call_latency_ms`` adds a fixed cost per call, like a real forward pass's
+overhead, which is what batching inputs into fewer calls saves. Calls to one
+stub run one at a time, like a model already using every core.
+"""
+
+import threading
+import time
+
+SECTION_HINTS = {
+    "experience": ("experience", "engineer", "developed", "led", "manager", "present"),
+    "education": ("education", "university", "bachelor", "degree", "college"),
+    "skills": ("skills", "python", "java", "sql", "docker", "communication"),
+    "summary": ("summary", "profile", "objective", "results-driven"),
+    "achievements": ("achievements", "award", "won", "increased", "reduced"),
+}
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with the attributes chunking.token_windows reads"""
+
+    is_fast = False
+    model_max_length = 512
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+
+    def __call__(self, text, **kwargs):
+        return {"input_ids": list(range(len(text.split())))}
+
+
+def _sleep(lock, per_call, per_input, count):
+    if per_call or per_input:
+        with lock:
+            time.sleep(per_call + per_input * count)
+
+
+class StubSentiment:
+    """Sentiment pipeline stand-in: label distribution from word counts"""
+
+    def __init__(self, latency_ms=0.0, call_latency_ms=0.0):
+        self.tokenizer = StubTokenizer()
+        self.latency = latency_ms / 1000
+        self.call_latency = call_latency_ms / 1000
+        self._lock = threading.Lock()
+
+    def __call__(self, texts, **kwargs):
+        # Like the pipeline, a single string gets a single prediction
+        if isinstance(texts, str):
+            return self([texts], **kwargs)[0]
+        _sleep(self._lock, self.call_latency, self.latency, len(texts))
+        predictions = []
+        for text in texts:
+            positive = min(0.9, 0.4 + len(text.split()) / 2000)
+            predictions.append([
+                {"label": "positive", "score": positive},
+                {"label": "neutral", "score": (1 - positive) * 0.7},
+                {"label": "negative", "score": (1 - positive) * 0.3},
+            ])
+        return predictions
+
+
+class StubSectionClassifier:
+    """Section classifier stand-in: labels ranked by hint-word hits"""
+
+    def __init__(self, latency_ms=0.0, call_latency_ms=0.0):
+        self.latency = latency_ms / 1000
+        self.call_latency = call_latency_ms / 1000
+        self._lock = threading.Lock()
+
+    def classify(self, sequences, candidate_labels):
+        _sleep(self._lock, self.call_latency, self.latency, len(sequences))
+        results = []
+        for sequence in sequences:
+            lower = sequence.lower()
+            hits = [sum(lower.count(hint) for hint in SECTION_HINTS.get(label, ())) for label in candidate_labels]
+            total = sum(hits) + len(candidate_labels)
+            ranked = sorted(range(len(candidate_labels)), key=lambda i: -hits[i])
+            results.append({
+                "sequence": sequence,
+                "labels": [candidate_labels[i] for i in ranked],
+                "scores": [(hits[i] + 1) / total for i in ranked],
+            })
+        return results
+
+
+def install_stub_models(app, latency_ms=0.0, call_latency_ms=0.0):
+    """Register the stubs in place of ``app``'s sentiment and section models"""
+    app.models.register("sentiment", lambda: StubSentiment(latency_ms, call_latency_ms))
+    app.models.register("sections", lambda: StubSectionClassifier(latency_ms, call_latency_ms))
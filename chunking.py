@@ -0,0 +1,60 @@
+"""
+Token-aware text chunking for AI ATS Resume Rater
+Splits a document into windows that fit a model's input size, measured in
+that model's own tokens, so long resumes are covered without truncation.
+"""
+
+import re
+
+_WHITESPACE = re.compile(r"\S+")
+
+
+def _window_size(tokenizer, max_tokens):
+    """Content tokens per window once the model's special tokens are added"""
+    limit = max_tokens
+    model_max = getattr(tokenizer, "model_max_length", None)
+    if model_max and model_max < 100000:  # Unset limits are reported as a huge sentinel
+        limit = min(limit, model_max)
+    return max(1, limit - tokenizer.num_special_tokens_to_add())
+
+
+def _token_spans(tokenizer, text):
+    """``(start, end)`` character span of every token in ``text``"""
+    if getattr(tokenizer, "is_fast", False):
+        encoded = tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True, truncation=False, verbose=False
+        )
+        return [(start, end) for start, end in encoded["offset_mapping"] if end > start]
+    # Slow tokenizers have no offsets: fall back to whitespace-separated words
+    return [match.span() for match in _WHITESPACE.finditer(text)]
+
+
+def _spread(count, limit):
+    """``limit`` window indices spread evenly over ``count`` windows"""
+    if count <= limit:
+        return list(range(count))
+    step = (count - 1) / (limit - 1) if limit > 1 else 0
+    return sorted({round(i * step) for i in range(limit)})
+
+
+def token_windows(tokenizer, text, max_tokens=512, max_chunks=None):
+    """Split ``text`` into ``(window_text, token_count)`` pairs of at most
+    ``max_tokens`` model tokens (including special tokens).
+
+    With ``max_chunks``, documents needing more windows keep that many,
+    spread evenly over the document instead of only its beginning.
+    """
+    spans = _token_spans(tokenizer, text or "")
+    if not spans:
+        return []
+
+    size = _window_size(tokenizer, max_tokens)
+    starts = list(range(0, len(spans), size))
+    if max_chunks:
+        starts = [starts[i] for i in _spread(len(starts), max_chunks)]
+
+    windows = []
+    for start in starts:
+        stop = min(start + size, len(spans))
+        windows.append((text[spans[start][0]:spans[stop - 1][1]], stop - start))
+    return windows
@@ -18,16 +18,120 @@ APP_CONFIG = {
 # File Upload Settings
 UPLOAD_CONFIG = {
     "max_file_size_mb": 10,
-    "allowed_extensions": [".pdf", ".docx", ".txt"],
-    "max_text_length": 50000  # Maximum characters in extracted text
+    "allowed_extensions": [".pdf", ".docx", ".txt", ".rtf", ".html", ".htm"],
+    "max_text_length": 50000,  # Maximum characters in extracted text; extraction stops here
+    "parallel_pdf": False,  # Extract pages of large PDFs across (spawned) worker processes
+    "parallel_pdf_min_pages": 40,  # Page count from which PDFs are extracted in parallel
+    "pdf_pages_per_task": 8,  # Pages per worker task
+    "pdf_workers": None  # Worker processes for page-parallel extraction (default: CPU count)
 }
 
 # AI Model Settings
 MODEL_CONFIG = {
     "sentiment_model": "cardiffnlp/twitter-roberta-base-sentiment-latest",
     "classification_model": "facebook/bart-large-mnli",
-    "max_chunk_size": 512,  # For text analysis
-    "max_chunks": 3  # Limit chunks to avoid API rate limits
+    "sentiment_batch_size": 16,  # Texts per sentiment forward pass in batch mode
+    "classification_batch_size": 16,  # (paragraph, label) pairs per forward pass
+    "section_backend": "zero_shot",  # "zero_shot" (BART-MNLI) or "embedding"
+    "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
+    "embedding_batch_size": 32,
+    "embedding_temperature": 0.05,  # Softmax temperature over label similarities
+    "embedding_cache_dir": None,  # Directory for cached prototype embeddings
+    "inference_backend": "pytorch",  # "pytorch", "quantized" (int8 dynamic) or "onnx" (ONNX Runtime)
+    "intra_op_threads": None,  # Threads per operator (None: library default)
+    "inter_op_threads": None,  # Threads across independent operators (None: library default)
+    "onnx_cache_dir": "onnx_models",  # Where exported ONNX models are kept
+    "warm_up_on_launch": True,  # Load models in a background thread when the app launches
+    "load_retry_seconds": 300,  # Wait before retrying a model that failed to load (None: only on warm-up)
+    "max_chunk_size": 512,  # Tokens per sentiment window, special tokens included
+    "max_chunks": 3  # Sentiment windows per resume, spread over the whole document
+}
+
+# Section detection cascade: paragraphs opening with a known section header
+# are labeled by section_classifier.HeaderSectionDetector without the model
+SECTION_CASCADE_CONFIG = {
+    "enabled": True,
+    "min_confidence": 0.9  # Header labels at least this confident skip the classifier (1.0: never skip)
+}
+
+# Near-duplicate detection in bulk scoring (dedup.py, batch.py)
+DEDUP_CONFIG = {
+    "enabled": True,
+    "threshold": 0.85,  # Estimated Jaccard similarity of word shingles that counts as a duplicate
+    "num_perm": 128,  # MinHash values per resume
+    "shingle_size": 3,  # Words per shingle
+    "action": "reuse",  # "reuse": copy the earlier resume's scores; "flag": score it anyway and mark it
+    "index_path": None  # e.g. "dedup_index.npz" to remember resumes across runs
+}
+
+# Analysis Result Cache
+CACHE_CONFIG = {
+    "enabled": True,
+    "max_entries": 2048,  # In-memory LRU entries (one per analysis stage and resume)
+    "max_memory_mb": 64,  # In-memory LRU size bound
+    "disk_path": None,  # e.g. "cache/analysis.sqlite3" to keep results across restarts
+    "max_disk_entries": 100000  # SQLite tier bound; the oldest written entries are pruned (None: unbounded)
+}
+
+# Analysis Scheduling
+ANALYSIS_CONFIG = {
+    "concurrent_stages": True,  # Run keyword, tone, section and readability analysis side by side
+    "segmenter": "regex",  # Sentence/word segmentation: "regex" (fast) or "nltk" (Punkt/Treebank)
+    "max_workers": 8,  # Stages of all concurrent analyses running at once (others wait for a slot)
+    # Timed-out stages keep running in the background (threads cannot be stopped). Up to this
+    # many run on spare threads; beyond that each holds one of max_workers until it finishes.
+    "max_abandoned_stages": 4,
+    "memoized_uploads": 32,  # Recent uploads whose text and resume-only results are kept (0: off)
+    # Per-resume time limit of each stage in seconds from when it starts running (scaled by batch
+    # size, None: no limit).
+    # Model stages are only timed once their model is loaded.
+    "stage_timeouts": {
+        "keywords": 5,
+        "sentiment": 20,
+        "sections": 40,
+        "readability": 5,
+        "job_match": 5
+    }
+}
+
+# Inference Server (micro-batching of model calls across concurrent requests)
+INFERENCE_SERVER_CONFIG = {
+    "enabled": True,
+    "max_batch_size": 32,  # Model inputs per coalesced call
+    "batch_window_ms": 10,  # How long the first waiting request waits for others
+    "max_queue_size": 64,  # Waiting requests per model before new ones are rejected
+    "request_timeout": 30  # Seconds a request may wait for its results
+}
+
+# Multi-worker serving (workers.py)
+SERVING_CONFIG = {
+    "workers": 2,  # Worker processes accepting connections on one shared socket
+    "preload_models": True,  # Load models once in the parent; forked workers share the weights
+    "threads_per_worker": None  # torch intra-op threads per worker (None: CPU count / workers)
+}
+
+# JSON Scoring API (served by server.py next to the UI)
+API_CONFIG = {
+    "enabled": True,
+    "max_body_mb": 50,  # Largest request body, after gzip decompression
+    "max_batch_items": 100,  # Resumes per /v1/score/batch request
+    "keep_alive_seconds": 75  # Idle time before a keep-alive connection is closed
+}
+
+# Job Description Matching
+JOB_MATCH_CONFIG = {
+    "ngram_range": (1, 2),  # Words and two-word phrases of the job description
+    "max_cached_jobs": 32,  # Vectorized job descriptions kept in memory
+    "top_missing_terms": 10,  # Missing job terms reported per resume
+    "score_weight": 0.25  # Share of the overall score taken by the job match when a job description is given
+}
+
+# Metrics and Profiling
+METRICS_CONFIG = {
+    "metrics_endpoint": True,  # Serve Prometheus metrics at /metrics (server.py)
+    "profiling_endpoint": False,  # Allow POST /debug/profile?requests=N to profile the next N requests
+    "profile_dir": "profiles",  # Where cProfile .prof files are written
+    "profile_first_requests": 0  # Profile the first N requests after start
 }
 
 # Scoring Weights (must sum to 1.0)
@@ -112,21 +216,84 @@ EDUCATION_KEYWORDS = [
     'conference', 'continuing education', 'professional development'
 ]
 
-EXPERIENCE_KEYWORDS = [
-    # Action Verbs
+ACTION_VERBS = [
     'developed', 'created', 'built', 'designed', 'implemented', 'deployed',
     'managed', 'led', 'directed', 'supervised', 'coordinated', 'organized',
     'achieved', 'accomplished', 'delivered', 'completed', 'executed',
     'improved', 'optimized', 'enhanced', 'increased', 'reduced', 'decreased',
     'analyzed', 'researched', 'investigated', 'evaluated', 'assessed',
-    'collaborated', 'worked', 'partnered', 'contributed', 'participated',
-    
-    # Experience Indicators
+    'collaborated', 'worked', 'partnered', 'contributed', 'participated'
+]
+
+EXPERIENCE_INDICATORS = [
     'experience', 'years', 'responsible for', 'accountable for', 'in charge of',
     'oversaw', 'maintained', 'supported', 'assisted', 'helped', 'worked on',
     'involved in', 'participated in', 'contributed to'
 ]
 
+EXPERIENCE_KEYWORDS = ACTION_VERBS + EXPERIENCE_INDICATORS
+
+# Scored ATS keyword categories: a category's score is the share of its
+# keywords found in the resume, and missing ones are suggested
+ATS_KEYWORDS = {
+    "technical_skills": [
+        "python", "java", "javascript", "react", "nodejs", "sql", "aws", "docker", 
+        "kubernetes", "git", "linux", "api", "html", "css", "mongodb", "postgresql",
+        "machine learning", "data analysis", "artificial intelligence", "tensorflow",
+        "pytorch", "pandas", "numpy", "scikit-learn", "cloud computing", "devops"
+    ],
+    "soft_skills": [
+        "leadership", "communication", "teamwork", "problem solving", "analytical",
+        "creative", "adaptable", "organized", "detail oriented", "time management",
+        "project management", "collaboration", "critical thinking", "innovation"
+    ],
+    "action_verbs": [
+        "achieved", "developed", "created", "managed", "led", "implemented", "designed",
+        "optimized", "improved", "analyzed", "collaborated", "coordinated", "executed",
+        "delivered", "built", "established", "increased", "reduced", "streamlined"
+    ],
+    "education": [
+        "bachelor", "master", "phd", "degree", "university", "college", "certification",
+        "course", "training", "education", "graduate", "undergraduate", "diploma"
+    ]
+}
+
+# Further keywords recognized (and listed as found) in each scored category
+RELATED_KEYWORDS = {
+    "technical_skills": TECHNICAL_SKILLS,
+    "soft_skills": SOFT_SKILLS,
+    "action_verbs": ACTION_VERBS,
+    "education": EDUCATION_KEYWORDS
+}
+
+# Other spellings matched as the keyword they stand for
+KEYWORD_ALIASES = {
+    "k8s": "kubernetes",
+    "node.js": "nodejs",
+    "node js": "nodejs",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "react.js": "react",
+    "reactjs": "react",
+    "vue.js": "vue",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "sklearn": "scikit-learn",
+    "ci cd": "ci/cd",
+    "restful api": "rest api",
+    "natural language processing": "nlp",
+    "ph.d.": "phd"
+}
+
+# Keyword taxonomy (taxonomy.py): the lists above, compiled once per version
+TAXONOMY_CONFIG = {
+    "path": None,  # JSON file overriding the lists above, e.g. "taxonomy.json"; reloaded when it changes
+    "reload_interval": 5,  # Seconds between checks of the file for changes
+    "min_related_length": 3  # Related keywords that are shorter plain words ("go", "ms") are too ambiguous to match
+}
+
 # Scoring Thresholds
 SCORE_THRESHOLDS = {
     "excellent": 85,
@@ -142,6 +309,8 @@ UI_CONFIG = {
     "secondary_color": "#764ba2",
     "max_width": "1200px",
     "enable_queue": True,
+    "concurrency_limit": 8,  # Analyses Gradio runs at once (their model calls are micro-batched)
+    "max_queue_size": 64,  # Requests Gradio holds before turning users away
     "show_error": True
 }
 
@@ -0,0 +1,241 @@
+"""
+Near-duplicate resume detection for AI ATS Resume Rater
+Each extracted text is reduced to a MinHash signature: ``num_perm`` minimum
+hash values over its word shingles, so the share of equal values estimates the
+Jaccard similarity of two shingle sets. Signatures are banded into an LSH
+index (locality-sensitive hashing): texts that agree on every value of at
+least one band become candidates, and candidates are kept when their
+estimated similarity reaches ``threshold``. Bulk scoring (batch.py) uses it
+to reuse the result of a resume seen before instead of running the models on
+a re-upload with trivial edits or a template clone.
+
+The index is saved to a single .npz file; band tables are rebuilt on load.
+
+Usage:
+    python dedup.py resumes/ [--threshold 0.85] [--index dedup.npz]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import zlib
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_BAND_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+def lsh_bands(num_perm, threshold):
+    """``(bands, rows)`` with ``bands * rows == num_perm`` whose S-curve midpoint
+    ``(1 / bands) ** (1 / rows)`` is closest to ``threshold`` without exceeding it.
+
+    Erring low favours recall: extra candidates are filtered by their
+    estimated similarity anyway.
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [option for option in options if (1 / option[0]) ** (1 / option[1]) <= threshold] or options
+    return min(below, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold))
+
+
+class DuplicateIndex:
+    """MinHash/LSH index of resume texts keyed by an id (e.g. the file name).
+
+    ``find(text)`` returns the most similar indexed ``(key, similarity)`` at or
+    above ``threshold``, or None; ``add(key, text)`` indexes a text. Both take a
+    precomputed ``signature()`` instead of the text as well.
+    """
+
+    def __init__(self, threshold=0.85, num_perm=128, shingle_size=3, seed=1):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = lsh_bands(num_perm, threshold)
+
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._band_powers = _BAND_MULTIPLIER ** np.arange(self.rows, dtype=np.uint64)
+
+        self.keys = []
+        self._signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self._tables = [{} for _ in range(self.bands)]
+
+    def __len__(self):
+        return len(self.keys)
+
+    # -- signatures ----------------------------------------------------------
+
+    def shingle_hashes(self, text):
+        """32-bit hashes of the word ``shingle_size``-grams of ``text`` (lowercased)"""
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        if not tokens:
+            return np.zeros(1, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in tokens),
+                             dtype=np.uint64, count=len(tokens))
+        k = min(self.shingle_size, len(tokens))
+        shingles = hashes[:len(hashes) - k + 1].copy()
+        with np.errstate(over="ignore"):
+            for offset in range(1, k):
+                shingles = shingles * _SHINGLE_MULTIPLIER + hashes[offset:len(hashes) - k + 1 + offset]
+        # Fold to 32 bits so (a * h + b) below cannot overflow 64 bits
+        return np.unique((shingles >> np.uint64(32)) ^ (shingles & _MAX_HASH))
+
+    def signature(self, text):
+        """MinHash signature of ``text``: ``num_perm`` uint32 values"""
+        hashes = self.shingle_hashes(text)
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signatures):
+        """One 64-bit key per band of each signature, shape (n, bands)"""
+        banded = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        with np.errstate(over="ignore"):
+            return (banded * self._band_powers).sum(axis=2, dtype=np.uint64)
+
+    def _as_signature(self, text_or_signature):
+        if isinstance(text_or_signature, str):
+            return self.signature(text_or_signature)
+        return np.asarray(text_or_signature, dtype=np.uint32)
+
+    # -- index ---------------------------------------------------------------
+
+    def _insert(self, start, band_keys):
+        for row, keys in enumerate(band_keys.tolist(), start):
+            for table, key in zip(self._tables, keys):
+                bucket = table.get(key)
+                if bucket is None:
+                    table[key] = row  # Most buckets hold one resume: skip the list
+                elif isinstance(bucket, list):
+                    bucket.append(row)
+                else:
+                    table[key] = [bucket, row]
+
+    def add(self, key, text_or_signature):
+        """Index one text (or signature) under ``key``"""
+        self.add_many([key], [self._as_signature(text_or_signature)])
+
+    def add_many(self, keys, signatures):
+        """Index many precomputed signatures at once"""
+        signatures = np.asarray(signatures, dtype=np.uint32).reshape(-1, self.num_perm)
+        start = len(self.keys)
+        if start + len(signatures) > len(self._signatures):
+            grown = np.zeros((max(2 * len(self._signatures), start + len(signatures), 64), self.num_perm),
+                             dtype=np.uint32)
+            grown[:start] = self._signatures[:start]
+            self._signatures = grown
+        self._signatures[start:start + len(signatures)] = signatures
+        self.keys.extend(keys)
+        self._insert(start, self._band_keys(signatures))
+
+    def query(self, text_or_signature):
+        """``[(key, similarity)]`` of indexed texts at or above ``threshold``, most similar first"""
+        signature = self._as_signature(text_or_signature)
+        candidates = set()
+        for table, key in zip(self._tables, self._band_keys(signature[None, :])[0].tolist()):
+            bucket = table.get(key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, list):
+                candidates.update(bucket)
+            else:
+                candidates.add(bucket)
+        if not candidates:
+            return []
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarities = (self._signatures[rows] == signature).mean(axis=1)
+        matches = [(self.keys[row], float(similarity))
+                   for row, similarity in zip(rows.tolist(), similarities.tolist()) if similarity >= self.threshold]
+        return sorted(matches, key=lambda match: -match[1])
+
+    def find(self, text_or_signature):
+        """The most similar indexed ``(key, similarity)`` at or above ``threshold``, or None"""
+        matches = self.query(text_or_signature)
+        return matches[0] if matches else None
+
+    # -- persistence ---------------------------------------------------------
+
+    def save(self, path):
+        """Write the index to ``path`` (.npz), replacing it atomically"""
+        meta = {
+            "format": FORMAT_VERSION,
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "shingle_size": self.shingle_size,
+            "seed": self.seed,
+            "keys": self.keys,
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, signatures=self._signatures[:len(self.keys)],
+                     meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, threshold=None):
+        """Read an index saved by ``save()``; ``threshold`` may differ from the saved one"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            signatures = data["signatures"]
+        if meta.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported duplicate index format in {path}")
+        index = cls(threshold or meta["threshold"], meta["num_perm"], meta["shingle_size"], meta["seed"])
+        index.add_many(meta["keys"], signatures)
+        return index
+
+    @classmethod
+    def open(cls, path, **kwargs):
+        """Load ``path`` if it exists, else create an empty index with ``kwargs``"""
+        if path and os.path.exists(path):
+            return cls.load(path, kwargs.get("threshold"))
+        return cls(**kwargs)
+
+
+def main(argv=None):
+    from batch import iter_resume_sources
+    from config import DEDUP_CONFIG
+    from extraction import extract_text
+
+    parser = argparse.ArgumentParser(description="List near-duplicate resumes in a folder or archive.")
+    parser.add_argument("source", help="Directory, .zip or .tar(.gz) archive of resumes")
+    parser.add_argument("--threshold", type=float, default=DEDUP_CONFIG.get("threshold", 0.85))
+    parser.add_argument("--index", help="Also match against, and add to, this saved index (.npz)")
+    args = parser.parse_args(argv)
+
+    index = DuplicateIndex.open(
+        args.index, threshold=args.threshold,
+        num_perm=DEDUP_CONFIG.get("num_perm", 128), shingle_size=DEDUP_CONFIG.get("shingle_size", 3)
+    )
+    duplicates = 0
+    for file_id, payload, filename in iter_resume_sources(args.source):
+        try:
+            signature = index.signature(extract_text(payload, filename))
+        except Exception as e:
+            print(f"{file_id}: error: {e}", file=sys.stderr)
+            continue
+        match = index.find(signature)
+        if match:
+            duplicates += 1
+            print(f"{file_id}\tduplicate of {match[0]}\t{match[1]:.2f}")
+        else:
+            index.add(file_id, signature)
+    print(f"{duplicates} near-duplicates, {len(index)} distinct resumes")
+    if args.index:
+        index.save(args.index)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Shared document segmentation for AI ATS Resume Rater
+A Document wraps one extracted resume and computes its lowercase form,
+paragraphs, sentences and words at most once, so every analyzer of a request
+reuses the same segmentation. Segmentation uses fast precompiled regexes by
+default; the NLTK Punkt/Treebank tokenizers are available as an exactness mode.
+"""
+
+import re
+import threading
+from functools import cached_property
+
+from config import ANALYSIS_CONFIG
+
+SEGMENTERS = ("regex", "nltk")
+
+# A sentence ends at . ! or ? (plus closing quotes/brackets) followed by
+# whitespace and the start of a new sentence, like Punkt without a trained model
+_SENTENCE_END = re.compile(r"""[.!?]["')\]]*(\s+)(?=["'(\[]?[A-Z0-9•\-*])""")
+# Abbreviations whose trailing period does not end a sentence
+_ABBREVIATION = re.compile(
+    r"(?:\b(?:mr|mrs|ms|dr|prof|sr|jr|st|inc|ltd|co|corp|vs|etc|approx|dept|est|no|e\.g|i\.e|"
+    r"jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec)|\b[a-z])\.$",
+    re.IGNORECASE,
+)
+# Words (with inner apostrophes, hyphens and periods, as in "don't", "e-mail",
+# "3.5") or single punctuation marks, which Treebank also counts as tokens
+_WORD = re.compile(r"\w+(?:['’.\-]\w+)*|[^\w\s]")
+
+_nltk_lock = threading.Lock()
+_nltk_ready = False
+
+
+def ensure_nltk_data():
+    """Download the NLTK data used by the "nltk" segmenter (done once)"""
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        import nltk
+
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            nltk.download('punkt', quiet=True)
+        _nltk_ready = True
+
+
+def split_sentences(text):
+    """Regex sentence segmentation"""
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        end = match.start(1)
+        # Only the last few characters can hold an abbreviation
+        if text[end - 1] == "." and _ABBREVIATION.search(text, max(start, end - 8), end):
+            continue
+        sentence = text[start:end].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def split_words(text):
+    """Regex word tokenization (punctuation marks are separate tokens)"""
+    return _WORD.findall(text)
+
+
+class Document:
+    """One resume's text with cached segmentations.
+
+    ``segmenter`` is "regex" (default from ``ANALYSIS_CONFIG["segmenter"]``) or
+    "nltk". Properties are computed on first access and then reused.
+    """
+
+    def __init__(self, text, segmenter=None):
+        self.text = text or ""
+        self.segmenter = segmenter or ANALYSIS_CONFIG.get("segmenter", "regex")
+        if self.segmenter not in SEGMENTERS:
+            raise ValueError(f"Unknown segmenter: {self.segmenter!r} (expected one of {', '.join(SEGMENTERS)})")
+
+    def __len__(self):
+        return len(self.text)
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def paragraphs(self):
+        """Non-empty blocks separated by an empty line, as the analyzers have always split
+        them (a separator line holding only whitespace does not end a paragraph)"""
+        return [p.strip() for p in self.text.split('\n\n') if p.strip()]
+
+    @cached_property
+    def sentences(self):
+        if self.segmenter == "nltk":
+            import nltk
+
+            ensure_nltk_data()
+            return nltk.sent_tokenize(self.text)
+        return split_sentences(self.text)
+
+    @cached_property
+    def words(self):
+        if self.segmenter == "nltk":
+            import nltk
+
+            ensure_nltk_data()
+            return nltk.word_tokenize(self.text)
+        return split_words(self.text)
+
+
+def as_document(text):
+    """Pass Documents through and wrap plain strings"""
+    return text if isinstance(text, Document) else Document(text)
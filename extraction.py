@@ -0,0 +1,672 @@
+"""
+Resume text extraction for AI ATS Resume Rater
+Every input (path, Gradio file dict, file-like object or in-memory bytes) takes
+one ingestion path: files are memory-mapped and buffers are viewed without
+copying, the size is checked against UPLOAD_CONFIG["max_file_size_mb"] before
+any parsing, and the format is detected from the content's magic bytes (the
+extension only breaks ties) and handed to the extractor registered for it.
+Kept free of model imports so it can run in worker processes for bulk scoring.
+"""
+
+import contextlib
+import io
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ElementTree
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from itertools import islice
+
+import PyPDF2
+
+from config import UPLOAD_CONFIG
+from metrics import PDF_PAGES, STAGE_SECONDS, TEXT_LENGTH
+
+# Bytes of a file inspected to detect its format
+SNIFF_BYTES = 2048
+
+
+class UnsupportedFormatError(ValueError):
+    """Raised when a file's format cannot be extracted"""
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a file exceeds UPLOAD_CONFIG["max_file_size_mb"]"""
+
+
+@contextlib.contextmanager
+def _mapped_file(path):
+    """Open ``path`` as a read-only memory map (empty bytes if the file is empty)"""
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped
+            yield b""
+            return
+        with mapped:
+            yield mapped
+
+
+class _BufferStream(io.RawIOBase):
+    """Seekable binary stream over an mmap, bytearray or memoryview for parsers
+    (zipfile, PyPDF2) that need a file object; reads copy only what is asked for"""
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), len(self._view) - self._position)
+        if size <= 0:
+            return 0
+        buffer[:size] = self._view[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        # Release the view so the underlying mmap can be closed
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def _as_stream(buffer):
+    """Seekable stream over an in-memory buffer, without copying it"""
+    if isinstance(buffer, bytes):
+        return io.BytesIO(buffer)  # Shares the bytes object until written to
+    return _BufferStream(buffer)
+
+
+def _head(buffer, size=SNIFF_BYTES):
+    with memoryview(buffer) as view:
+        return bytes(view[:size])
+
+
+def _max_file_bytes():
+    max_mb = UPLOAD_CONFIG.get("max_file_size_mb")
+    return int(max_mb * 1024 * 1024) if max_mb else None
+
+
+def _check_size(size):
+    limit = _max_file_bytes()
+    if limit and size > limit:
+        raise FileTooLargeError(
+            f"File is too large ({size / 2**20:.1f} MB). The limit is {UPLOAD_CONFIG['max_file_size_mb']} MB."
+        )
+
+
+def read_limited(stream, size=None):
+    """Read a binary stream without reading past the upload size limit.
+
+    ``size`` is the stream's declared length when known (e.g. an archive
+    member's); over the limit, FileTooLargeError is raised before reading.
+    """
+    if size is not None:
+        _check_size(size)
+    limit = _max_file_bytes()
+    data = stream.read(limit + 1) if limit else stream.read()
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    _check_size(len(data))
+    return data
+
+
+@contextlib.contextmanager
+def open_input(source):
+    """Yield ``(buffer, filename, path)`` for a path, Gradio file dict,
+    file-like object or bytes-like ``source``.
+
+    Files are memory-mapped and in-memory files are viewed, not copied; only
+    file-like objects without either are read, once. The size limit is
+    enforced before anything is parsed.
+    """
+    path = None
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+    elif isinstance(source, dict) and 'path' in source:
+        path = source['path']
+
+    if path is not None:
+        _check_size(os.path.getsize(path))
+        with _mapped_file(path) as mapped:
+            yield mapped, path, path
+        return
+
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        _check_size(len(source))
+        yield source, None, None
+        return
+
+    if not hasattr(source, 'read'):
+        raise UnsupportedFormatError("Unrecognized file input type")
+    name = getattr(source, 'name', None)
+    name = name if isinstance(name, str) else None
+
+    # Map real files instead of copying their contents into memory
+    mapped = None
+    try:
+        _check_size(os.fstat(source.fileno()).st_size)
+        mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation) as e:
+        if isinstance(e, FileTooLargeError):
+            raise
+    if mapped is not None:
+        with mapped:
+            yield mapped, name, None
+        return
+
+    if hasattr(source, 'getbuffer'):  # BytesIO: view its buffer in place
+        view = source.getbuffer()
+        try:
+            _check_size(len(view))
+            yield view, name, None
+        finally:
+            view.release()
+        return
+
+    yield read_limited(source), name, None
+
+
+# Extractors: EXTRACTORS[format] = {"extract", "extensions", "sniff", "fallback"},
+# tried in registration order when detecting a format
+EXTRACTORS = {}
+
+
+def register_extractor(name, extensions, sniff=None, fallback=False):
+    """Register ``extract(buffer, max_chars) -> text`` for a format.
+
+    ``sniff(head, buffer)`` tells whether a file's first ``SNIFF_BYTES``
+    (and, if needed, its whole buffer) are in this format. A ``fallback``
+    format (plain text) is only used when no other format matches.
+    """
+    def decorator(extract):
+        EXTRACTORS[name] = {"extract": extract, "extensions": tuple(extensions), "sniff": sniff,
+                            "fallback": fallback}
+        return extract
+    return decorator
+
+
+def _format_for_extension(filename):
+    ext = os.path.splitext((filename or "").lower())[1]
+    for name, extractor in EXTRACTORS.items():
+        if ext in extractor["extensions"]:
+            return name
+    return None
+
+
+def detect_format(buffer, filename=None):
+    """Format of ``buffer`` from its magic bytes.
+
+    Structured formats (PDF, DOCX, RTF, HTML) win over plain text whatever
+    the file is named; the extension only decides between several structured
+    matches.
+    """
+    head = _head(buffer)
+    matches = [name for name, extractor in EXTRACTORS.items()
+               if extractor["sniff"] and extractor["sniff"](head, buffer)]
+    if not matches:
+        formats = [name.upper() for name in EXTRACTORS]
+        raise UnsupportedFormatError(
+            f"Unsupported file format. Please upload {', '.join(formats[:-1])} or {formats[-1]} files."
+        )
+    matches = [name for name in matches if not EXTRACTORS[name]["fallback"]] or matches
+    by_extension = _format_for_extension(filename)
+    return by_extension if by_extension in matches else matches[0]
+
+
+def _sniff_pdf(head, buffer):
+    # Readers accept junk before the header within the first 1024 bytes
+    return b"%PDF-" in head[:1024]
+
+
+def _sniff_docx(head, buffer):
+    if not head.startswith(b"PK\x03\x04"):
+        return False
+    try:
+        with _as_stream(buffer) as stream, zipfile.ZipFile(stream) as archive:
+            return "word/document.xml" in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+def _sniff_rtf(head, buffer):
+    return head.lstrip().startswith(b"{\\rtf")
+
+
+# Optional BOM, XML declaration and comments, then a doctype or a top-level HTML tag
+_HTML_START = re.compile(
+    rb"^(?:\xef\xbb\xbf)?\s*(?:<\?xml[^>]*>\s*)?(?:<!--.*?-->\s*)*<(?:!doctype\s+html|html|head|body)\b",
+    re.I | re.S,
+)
+
+
+def _sniff_html(head, buffer):
+    return _HTML_START.match(head) is not None
+
+
+def _sniff_text(head, buffer):
+    # UTF-16 text has NUL bytes but starts with a byte order mark
+    return head.startswith((b"\xff\xfe", b"\xfe\xff")) or b"\x00" not in head
+
+
+def _decode(buffer, max_chars, default_encoding='utf-8'):
+    """Decode at most what ``max_chars`` characters can take, honouring byte order marks"""
+    with memoryview(buffer) as view:
+        encoding = default_encoding
+        if view[:3] == b"\xef\xbb\xbf":
+            encoding = 'utf-8-sig'
+        elif view[:2] in (b"\xff\xfe", b"\xfe\xff"):
+            encoding = 'utf-16'
+        # UTF-8 uses at most 4 bytes per character
+        with view[:max_chars * 4] if max_chars else view[:] as data:
+            text = str(data, encoding, errors='ignore')
+    return text[:max_chars] if max_chars else text
+
+
+def iter_pdf_pages(stream, start=0, stop=None):
+    """Yield the text of each page of a PDF stream, one page at a time"""
+    pages = PyPDF2.PdfReader(stream).pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    for index in range(start, stop):
+        yield pages[index].extract_text() or ""
+
+
+def _extract_pdf_page_range(task):
+    """Pool worker: text of pages [start, stop) of the PDF at ``path``"""
+    path, start, stop = task
+    with _mapped_file(path) as stream:
+        return list(iter_pdf_pages(stream, start, stop))
+
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool():
+    """Process pool shared by every page-parallel extraction.
+
+    Workers are spawned rather than forked: the server process is multi-threaded
+    and has torch loaded, and forking such a process can deadlock the child.
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=UPLOAD_CONFIG.get("pdf_workers"), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pdf_pool
+
+
+def _iter_pdf_pages_parallel(path, page_count, pages_per_task):
+    """Yield page texts in order while page ranges are extracted across processes.
+
+    Only a bounded window of ranges is in flight, and ranges not yet started
+    are cancelled when the consumer stops early.
+    """
+    pool = _get_pdf_pool()
+    tasks = iter([
+        (path, start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ])
+    window = 2 * (UPLOAD_CONFIG.get("pdf_workers") or os.cpu_count() or 1)
+    pending = deque(pool.submit(_extract_pdf_page_range, task) for task in islice(tasks, window))
+    try:
+        while pending:
+            pages = pending.popleft().result()
+            next_task = next(tasks, None)
+            if next_task is not None:
+                pending.append(pool.submit(_extract_pdf_page_range, next_task))
+            yield from pages
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_pdf_file_pages(path, parallel=True):
+    """Yield page texts of the PDF at ``path``, reading it through a memory map.
+
+    Documents with at least ``UPLOAD_CONFIG["parallel_pdf_min_pages"]`` pages
+    are extracted across worker processes when ``parallel`` is set.
+    """
+    min_pages = UPLOAD_CONFIG.get("parallel_pdf_min_pages", 0)
+    workers = UPLOAD_CONFIG.get("pdf_workers") or os.cpu_count() or 1
+    parallel = parallel and workers > 1
+    with _mapped_file(path) as stream:
+        reader = PyPDF2.PdfReader(stream)
+        page_count = len(reader.pages)
+        if not (parallel and min_pages and page_count >= min_pages):
+            for page in reader.pages:
+                yield page.extract_text() or ""
+            return
+
+    yield from _iter_pdf_pages_parallel(
+        path, page_count, UPLOAD_CONFIG.get("pdf_pages_per_task", 8)
+    )
+
+
+def _join_within_budget(pieces, max_chars, separator="\n"):
+    """Join text pieces, consuming no more of ``pieces`` than ``max_chars`` needs"""
+    parts = []
+    total = 0
+    try:
+        for piece in pieces:
+            total += len(piece) + (len(separator) if parts else 0)
+            parts.append(piece)
+            if max_chars and total >= max_chars:
+                break
+    finally:
+        if hasattr(pieces, 'close'):
+            pieces.close()
+    text = separator.join(parts)
+    return text[:max_chars] if max_chars else text
+
+
+def _counted_pages(pages):
+    """Pass page texts through, recording how many were read"""
+    count = 0
+    try:
+        for page in pages:
+            count += 1
+            yield page
+    finally:
+        pages.close()
+        PDF_PAGES.observe(count)
+
+
+@register_extractor("pdf", (".pdf",), _sniff_pdf)
+def _extract_pdf(buffer, max_chars):
+    if isinstance(buffer, mmap.mmap):
+        # PyPDF2 reads mmaps directly, which is faster than through a stream
+        return _join_within_budget(_counted_pages(iter_pdf_pages(buffer)), max_chars)
+    with _as_stream(buffer) as stream:
+        return _join_within_budget(_counted_pages(iter_pdf_pages(stream)), max_chars)
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Alternative renderings of drawings and text boxes whose text the preferred choice already holds
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_DOCX_RUN_TEXT = {_W + "tab": "\t", _W + "br": "\n", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+
+
+def iter_docx_blocks(stream):
+    """Yield the text of each paragraph and table row of a DOCX, in document order.
+
+    ``word/document.xml`` is streamed out of the archive with an incremental
+    parser and every block is discarded once its text is out, so memory does
+    not grow with the document. Table cells are joined with tabs, one line
+    per row (nested tables become lines of their cell). Like python-docx,
+    empty paragraphs yield "" so blank lines between sections survive.
+    """
+    with zipfile.ZipFile(stream) as archive, archive.open("word/document.xml") as part:
+        paragraphs = []  # Runs of each open paragraph (text boxes nest paragraphs)
+        rows = []  # Cells of each open table row
+        cells = []  # Lines of each open table cell
+        body = None
+        skipping = 0
+        for event, element in ElementTree.iterparse(part, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                if tag == _W + "body":
+                    body = element
+                elif tag == _MC_FALLBACK:
+                    skipping += 1
+                elif skipping:
+                    pass
+                elif tag == _W + "p":
+                    paragraphs.append([])
+                elif tag == _W + "tr":
+                    rows.append([])
+                elif tag == _W + "tc":
+                    cells.append([])
+                continue
+
+            if tag == _MC_FALLBACK:
+                skipping -= 1
+                element.clear()
+                continue
+            if skipping:
+                continue
+
+            if tag == _W + "t":
+                if paragraphs and element.text:
+                    paragraphs[-1].append(element.text)
+            elif tag in _DOCX_RUN_TEXT:
+                if paragraphs:
+                    paragraphs[-1].append(_DOCX_RUN_TEXT[tag])
+            elif tag == _W + "p":
+                text = "".join(paragraphs.pop())
+                if cells:
+                    if text:
+                        cells[-1].append(text)
+                elif paragraphs:
+                    paragraphs[-1].append(text)
+                else:
+                    yield text
+                element.clear()
+            elif tag == _W + "tc":
+                rows[-1].append(" ".join(cells.pop()))
+            elif tag == _W + "tr":
+                line = "\t".join(cell for cell in rows.pop() if cell)
+                if cells:
+                    cells[-1].append(line)
+                elif line:
+                    yield line
+                element.clear()
+            elif tag == _W + "tbl" or tag == _W + "sdt":
+                element.clear()
+            if body is not None and not (paragraphs or rows):
+                body.clear()  # Drop the (already emptied) blocks read so far
+
+
+@register_extractor("docx", (".docx",), _sniff_docx)
+def _extract_docx(buffer, max_chars):
+    # zipfile only reads the parts it needs, and stops once max_chars is reached
+    with _as_stream(buffer) as stream:
+        return _join_within_budget(iter_docx_blocks(stream), max_chars)
+
+
+_RTF_TOKEN = re.compile(r"\\([a-zA-Z]+)(-?\d+)? ?|\\'([0-9a-fA-F]{2})|\\(.)|([{}])|[\r\n]+|([^\\{}\r\n]+)", re.S)
+# Destinations whose content is not document text
+_RTF_SKIP = frozenset({
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "object", "header", "footer", "headerl",
+    "headerr", "footerl", "footerr", "listtable", "listoverridetable", "rsidtbl", "xmlnstbl",
+    "generator", "themedata", "colorschememapping", "latentstyles", "datastore", "fldinst",
+})
+_RTF_CHARACTERS = {
+    "par": "\n", "line": "\n", "sect": "\n\n", "page": "\n\n", "row": "\n", "tab": "\t", "cell": "\t",
+    "emdash": "\u2014", "endash": "\u2013", "bullet": "\u2022", "lquote": "\u2018", "rquote": "\u2019",
+    "ldblquote": "\u201c", "rdblquote": "\u201d",
+}
+
+
+def rtf_to_text(rtf):
+    """Plain text of an RTF document (formatting and non-text destinations dropped)"""
+    out = []
+    stack = []
+    skip = False
+    unicode_skip = 1  # Fallback characters following each \u escape
+    pending = 0  # Fallback characters still to drop
+    for word, arg, hex_code, symbol, brace, text in _RTF_TOKEN.findall(rtf):
+        if brace == "{":
+            stack.append((skip, unicode_skip))
+        elif brace == "}":
+            if stack:
+                skip, unicode_skip = stack.pop()
+            pending = 0
+        elif word:
+            if word in _RTF_SKIP:
+                skip = True
+            elif word == "uc":
+                unicode_skip = int(arg or 1)
+            elif skip:
+                continue
+            elif word == "u" and arg:
+                out.append(chr(int(arg) % 65536))
+                pending = unicode_skip
+            elif word in _RTF_CHARACTERS:
+                out.append(_RTF_CHARACTERS[word])
+        elif hex_code:
+            if pending:
+                pending -= 1
+            elif not skip:
+                out.append(bytes([int(hex_code, 16)]).decode('cp1252', errors='replace'))
+        elif symbol:
+            if symbol == "*":
+                skip = True  # Ignorable destination
+            elif skip:
+                continue
+            elif symbol in "\\{}":
+                out.append(symbol)
+            elif symbol == "~":
+                out.append(" ")
+            elif symbol == "_":
+                out.append("-")
+            elif symbol in "\r\n":
+                out.append("\n")
+        elif text:
+            if pending:
+                dropped = min(pending, len(text))
+                text, pending = text[dropped:], pending - dropped
+            if not skip:
+                out.append(text)
+    return "".join(out)
+
+
+@register_extractor("rtf", (".rtf",), _sniff_rtf)
+def _extract_rtf(buffer, max_chars):
+    # RTF is 7-bit; 8-bit characters are \'hh escapes. Markup takes more room than
+    # the text, so decode the whole file and cut the text afterwards.
+    text = rtf_to_text(_decode(buffer, None, 'latin-1'))
+    return text[:max_chars] if max_chars else text
+
+
+class _HTMLText(HTMLParser):
+    """Collects visible text, with line breaks where block elements end"""
+
+    SKIP = frozenset({"script", "style", "head", "template", "noscript"})
+    LINE_BREAKS = frozenset({"br", "li", "tr", "dt", "dd"})
+    PARAGRAPH_BREAKS = frozenset({
+        "p", "div", "section", "article", "header", "footer", "h1", "h2", "h3", "h4", "h5", "h6",
+        "ul", "ol", "dl", "table", "blockquote", "pre", "hr",
+    })
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self._skipping += 1
+        elif tag in self.LINE_BREAKS:
+            self.parts.append("\n")
+        elif tag in self.PARAGRAPH_BREAKS:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in self.PARAGRAPH_BREAKS:
+            self.parts.append("\n\n")
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+
+_SPACES = re.compile(r"[ \t\r\f\v\xa0]+")
+_BLANK_LINES = re.compile(r"\n\s*\n\s*")
+
+
+def html_to_text(html):
+    """Visible text of an HTML document, one blank line between blocks"""
+    parser = _HTMLText()
+    parser.feed(html)
+    parser.close()
+    text = _SPACES.sub(" ", "".join(parser.parts))
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+@register_extractor("html", (".html", ".htm"), _sniff_html)
+def _extract_html(buffer, max_chars):
+    text = html_to_text(_decode(buffer, None))
+    return text[:max_chars] if max_chars else text
+
+
+@register_extractor("txt", (".txt",), _sniff_text, fallback=True)
+def _extract_txt(buffer, max_chars):
+    return _decode(buffer, max_chars)
+
+
+SUPPORTED_EXTENSIONS = tuple(ext for extractor in EXTRACTORS.values() for ext in extractor["extensions"])
+
+
+def extract_text(source, filename=None, max_chars=None, parallel=None):
+    """Extract text from a path, file dict, file-like object or buffer, raising on failure.
+
+    The format is detected from the content; ``filename`` (default: the
+    source's own name) only breaks ties. Extraction stops once ``max_chars``
+    characters are collected (default ``UPLOAD_CONFIG["max_text_length"]``).
+    ``parallel`` enables page-parallel extraction of large PDFs from paths
+    (default ``UPLOAD_CONFIG["parallel_pdf"]``).
+    """
+    if max_chars is None:
+        max_chars = UPLOAD_CONFIG.get("max_text_length")
+    if parallel is None:
+        parallel = UPLOAD_CONFIG.get("parallel_pdf", False)
+
+    with open_input(source) as (buffer, name, path):
+        fmt = detect_format(buffer, filename or name)
+        with STAGE_SECONDS.time(stage="extraction"):
+            if fmt == "pdf" and path is not None and parallel:
+                # Worker processes map the file themselves
+                text = _join_within_budget(_counted_pages(iter_pdf_file_pages(path, parallel)), max_chars)
+            else:
+                text = EXTRACTORS[fmt]["extract"](buffer, max_chars)
+    TEXT_LENGTH.observe(len(text), format=fmt)
+    return text
+
+
+def error_message(error):
+    """User-facing message for an extraction failure"""
+    if isinstance(error, (UnsupportedFormatError, FileTooLargeError)):
+        return str(error)
+    return f"Error reading file: {str(error)}"
+
+
+def extract_text_from_file(file_input):
+    """Extract text from an uploaded file for the UI, returning a message on failure.
+
+    Supports Gradio 5 inputs which may be a string path, dict with 'path',
+    or a file-like object with .read() and .name.
+    """
+    if file_input is None:
+        return ""
+    try:
+        return extract_text(file_input)
+    except Exception as e:
+        return error_message(e)
@@ -0,0 +1,134 @@
+"""
+CPU inference backends for AI ATS Resume Rater
+MODEL_CONFIG["inference_backend"] selects how transformer models are run:
+- "pytorch": fp32 PyTorch (default)
+- "quantized": PyTorch with Linear layers dynamically quantized to int8
+- "onnx": exported ONNX model run by ONNX Runtime (needs optimum[onnxruntime])
+"""
+
+import os
+import re
+import threading
+
+BACKENDS = ("pytorch", "quantized", "onnx")
+# Weight precision each backend runs with (see load_model)
+PRECISIONS = {"pytorch": "fp32", "quantized": "qint8-dynamic", "onnx": "fp32"}
+
+_threads_lock = threading.Lock()
+_threads_configured = False
+
+
+def configure_threads(model_config):
+    """Apply intra/inter-op thread settings to torch (once per process)"""
+    global _threads_configured
+    with _threads_lock:
+        if _threads_configured:
+            return
+        _threads_configured = True
+        intra = model_config.get("intra_op_threads")
+        inter = model_config.get("inter_op_threads")
+        if not intra and not inter:
+            return
+
+        import torch
+
+        if intra:
+            torch.set_num_threads(int(intra))
+        if inter:
+            try:
+                torch.set_num_interop_threads(int(inter))
+            except RuntimeError as e:  # Only allowed before torch starts parallel work
+                print(f"Could not set inter-op threads: {e}")
+
+
+def _onnx_session_options(model_config):
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if model_config.get("intra_op_threads"):
+        options.intra_op_num_threads = int(model_config["intra_op_threads"])
+    if model_config.get("inter_op_threads"):
+        options.inter_op_num_threads = int(model_config["inter_op_threads"])
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL
+    return options
+
+
+def _load_onnx(model_name, task, model_config):
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTModelForSequenceClassification
+
+    model_class = ORTModelForFeatureExtraction if task == "feature-extraction" else ORTModelForSequenceClassification
+    options = _onnx_session_options(model_config)
+    export_dir = os.path.join(
+        model_config.get("onnx_cache_dir") or "onnx_models",
+        re.sub(r"[^\w.-]+", "--", model_name),
+    )
+
+    # Export once, then reuse the exported graph on later starts
+    if os.path.exists(os.path.join(export_dir, "model.onnx")):
+        return model_class.from_pretrained(export_dir, session_options=options, provider="CPUExecutionProvider")
+
+    model = model_class.from_pretrained(
+        model_name, export=True, session_options=options, provider="CPUExecutionProvider"
+    )
+    model.save_pretrained(export_dir)
+    return model
+
+
+def weights_variant(model):
+    """Backend and weight precision a load_model() model runs with, e.g. "quantized/qint8-dynamic".
+
+    Also takes a pipeline or section engine wrapping one; None for models not
+    built by load_model(). This is the backend actually loaded (ONNX falls back
+    to PyTorch), so caches of model outputs can include it in their keys.
+    """
+    for candidate in (model, getattr(model, "model", None), getattr(getattr(model, "pipeline", None), "model", None)):
+        variant = getattr(candidate, "inference_variant", None)
+        if variant:
+            return variant
+    return None
+
+
+def _tag(model, backend):
+    model.inference_variant = f"{backend}/{PRECISIONS[backend]}"
+    return model
+
+
+def load_model(model_name, model_config, task="sequence-classification"):
+    """Load ``model_name`` with the configured backend.
+
+    ``task`` is "sequence-classification" or "feature-extraction". Falls back
+    to fp32 PyTorch, with a warning, when the ONNX dependencies are missing.
+    """
+    backend = model_config.get("inference_backend", "pytorch")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference_backend: {backend!r} (expected one of {', '.join(BACKENDS)})")
+    configure_threads(model_config)
+
+    if backend == "onnx":
+        try:
+            return _tag(_load_onnx(model_name, task, model_config), backend)
+        except ImportError as e:
+            print(f"ONNX Runtime backend unavailable ({e}); falling back to PyTorch")
+            backend = "pytorch"
+
+    from transformers import AutoModel, AutoModelForSequenceClassification
+
+    model_class = AutoModel if task == "feature-extraction" else AutoModelForSequenceClassification
+    model = model_class.from_pretrained(model_name)
+    model.eval()
+
+    if backend == "quantized":
+        import torch
+
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return _tag(model, backend)
+
+
+def load_pipeline(task, model_name, model_config):
+    """Build a transformers pipeline whose model runs on the configured backend"""
+    from transformers import AutoTokenizer, pipeline
+
+    model = load_model(model_name, model_config)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return pipeline(task, model=model, tokenizer=tokenizer)
@@ -0,0 +1,203 @@
+"""
+Micro-batching inference server for AI ATS Resume Rater
+Concurrent requests (Gradio sessions, API calls) each carry a few model inputs.
+A MicroBatcher collects them on an asyncio queue, coalesces the inputs that
+arrive within a short window into one model call and hands every caller its
+own slice of the results. The queue is bounded (callers are rejected instead
+of piling up) and every request has a deadline.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from metrics import REGISTRY
+
+QUEUE_SECONDS = REGISTRY.histogram(
+    "ats_inference_queue_seconds", "Time requests wait for their micro-batch to start", labelnames=("model",)
+)
+COALESCED_REQUESTS = REGISTRY.histogram(
+    "ats_inference_coalesced_requests", "Requests merged into one micro-batch", (1, 2, 4, 8, 16, 32),
+    ("model",)
+)
+REQUESTS = REGISTRY.counter(
+    "ats_inference_requests_total", "Inference requests by outcome (ok, rejected, expired, error)",
+    ("model", "outcome")
+)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a batcher's queue is full; callers should retry later"""
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a request was not served before its deadline"""
+
+
+class _Request:
+    __slots__ = ("items", "deadline", "enqueued", "future")
+
+    def __init__(self, items, deadline, future):
+        self.items = items
+        self.deadline = deadline
+        self.enqueued = time.perf_counter()
+        self.future = future
+
+
+class MicroBatcher:
+    """Coalesces concurrent calls of ``batch_fn(items) -> results`` into micro-batches.
+
+    ``submit(items)`` blocks the calling thread until its results are ready.
+    Requests that arrive within ``batch_window_ms`` of the first waiting one
+    are merged, up to ``max_batch_size`` items. At most ``max_queue_size``
+    requests may wait; further ones raise QueueFullError. A request not
+    started before its deadline raises DeadlineExceededError.
+    """
+
+    def __init__(self, name, batch_fn, max_batch_size=32, batch_window_ms=10,
+                 max_queue_size=64, timeout=30):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.batch_window = batch_window_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.timeout = timeout
+        self._waiting = 0
+        self._waiting_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._loop = None
+        self._queue = None
+        self._carry = None  # Request that did not fit the previous batch, served first in the next
+        # Model calls leave the event loop free to keep collecting the next batch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"inference-{name}")
+
+    def _start(self):
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            ready = threading.Event()
+
+            def run():
+                self._loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(self._loop)
+                self._queue = asyncio.Queue()
+                self._loop.create_task(self._serve())
+                ready.set()
+                self._loop.run_forever()
+
+            threading.Thread(target=run, name=f"inference-server-{self.name}", daemon=True).start()
+            ready.wait()
+
+    def submit(self, items, timeout=None):
+        """Run ``items`` through the model with other callers' items; returns their results"""
+        items = list(items)
+        if not items:
+            return []
+        self._start()
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.perf_counter() + timeout if timeout else None
+
+        with self._waiting_lock:
+            if self.max_queue_size and self._waiting >= self.max_queue_size:
+                REQUESTS.inc(model=self.name, outcome="rejected")
+                raise QueueFullError(f"{self.name} inference queue is full ({self.max_queue_size} requests)")
+            self._waiting += 1
+
+        future = asyncio.run_coroutine_threadsafe(self._enqueue(items, deadline), self._loop)
+        try:
+            return future.result(timeout=timeout or None)
+        except DeadlineExceededError:
+            raise
+        except FutureTimeoutError:
+            future.cancel()
+            REQUESTS.inc(model=self.name, outcome="expired")
+            raise DeadlineExceededError(f"{self.name} inference did not finish within {timeout:g}s")
+        finally:
+            with self._waiting_lock:
+                self._waiting -= 1
+
+    async def _enqueue(self, items, deadline):
+        request = _Request(items, deadline, self._loop.create_future())
+        await self._queue.put(request)
+        return await request.future
+
+    async def _next_batch(self):
+        """Wait for one request, then gather more until the window closes or the batch is full.
+
+        The window is only waited for while other callers are in flight; a lone
+        request is served at once. A request that would push the batch past
+        ``max_batch_size`` starts the next batch instead (one larger than that
+        is served on its own).
+        """
+        if self._carry is not None:
+            batch = [self._carry]
+            self._carry = None
+        else:
+            batch = [await self._queue.get()]
+        size = len(batch[0].items)
+        closes = self._loop.time() + self.batch_window
+        while size < self.max_batch_size:
+            if not self._queue.empty():
+                request = self._queue.get_nowait()
+            else:
+                remaining = closes - self._loop.time()
+                if remaining <= 0 or self._waiting <= len(batch):
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if size + len(request.items) > self.max_batch_size:
+                self._carry = request
+                break
+            batch.append(request)
+            size += len(request.items)
+        return batch
+
+    async def _serve(self):
+        while True:
+            batch = await self._next_batch()
+            now = time.perf_counter()
+            live = []
+            for request in batch:
+                if request.future.done():  # Caller gave up
+                    continue
+                if request.deadline is not None and now > request.deadline:
+                    REQUESTS.inc(model=self.name, outcome="expired")
+                    request.future.set_exception(DeadlineExceededError(
+                        f"{self.name} inference request expired in the queue"
+                    ))
+                    continue
+                QUEUE_SECONDS.observe(now - request.enqueued, model=self.name)
+                live.append(request)
+            if not live:
+                continue
+
+            items = [item for request in live for item in request.items]
+            COALESCED_REQUESTS.observe(len(live), model=self.name)
+            try:
+                results = await self._loop.run_in_executor(self._executor, self.batch_fn, items)
+            except Exception as e:
+                for request in live:
+                    if not request.future.done():
+                        REQUESTS.inc(model=self.name, outcome="error")
+                        request.future.set_exception(e)
+                continue
+
+            start = 0
+            for request in live:
+                stop = start + len(request.items)
+                if not request.future.done():
+                    REQUESTS.inc(model=self.name, outcome="ok")
+                    request.future.set_result(list(results[start:stop]))
+                start = stop
+
+    def stats(self):
+        return {"waiting": self._waiting, "max_queue_size": self.max_queue_size}
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,188 @@
+"""
+Job description matching for AI ATS Resume Rater
+Each job description is vectorized once (TF-IDF vocabulary fitted on the
+posting, cached per posting); resumes are projected onto that vocabulary and
+scored by cosine similarity with a single sparse matrix product per batch.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from functools import partial
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+
+from result_cache import normalize_text
+
+# Keeps "c++", "c#" and "node.js" as single tokens
+_TOKEN = re.compile(r"(?<![\w+#])\w[\w+#\-]*(?:\.\w+)*")
+# N-grams never span list separators or sentence ends ("Django, PostgreSQL")
+_PHRASE_BREAK = re.compile(r"[,;:!?()\[\]{}|/\u2022\n]+|\.(?=\s|$)")
+# Job-posting boilerplate that says nothing about the role
+POSTING_STOP_WORDS = frozenset({
+    "ability", "candidate", "candidates", "equivalent", "ideal", "including", "looking",
+    "nice", "plus", "preferred", "required", "requirements", "responsibilities", "role",
+    "strong", "year", "years", "join", "work", "working",
+})
+STOP_WORDS = ENGLISH_STOP_WORDS | POSTING_STOP_WORDS
+
+
+def analyze(text, ngram_range=(1, 2)):
+    """Lowercased, stop-word-free word n-grams of ``text`` in order of appearance
+    (longer n-grams first at each position)"""
+    low, high = ngram_range
+    features = []
+    for phrase in _PHRASE_BREAK.split(text.lower()):
+        words = [w for w in _TOKEN.findall(phrase) if w not in STOP_WORDS]
+        for i in range(len(words)):
+            for n in range(min(high, len(words) - i), low - 1, -1):
+                features.append(" ".join(words[i:i + n]))
+    return features
+
+
+class _JobVector:
+    """Fitted vectorizer and normalized vector of one job description"""
+
+    def __init__(self, vectorizer, vector, text):
+        self.vectorizer = vectorizer
+        self.terms = vectorizer.get_feature_names_out()
+        # Column vector, so scoring N resumes is one (N x V) @ (V x 1) product
+        self.column = vector.T.tocsc()
+
+        # Term indices by weight, ties broken by first appearance in the posting
+        weights = vector.toarray().ravel()
+        first_seen = {}
+        self.occurrences = {}
+        for position, feature in enumerate(vectorizer.build_analyzer()(text)):
+            first_seen.setdefault(feature, position)
+            self.occurrences[feature] = self.occurrences.get(feature, 0) + 1
+        positions = np.array([first_seen.get(term, len(first_seen)) for term in self.terms])
+        ranked = np.lexsort((positions, -weights))
+        self.ranked = ranked[weights[ranked] > 0]
+
+
+class JobMatcher:
+    """Scores resumes against job descriptions.
+
+    ``match_many`` returns, per resume, ``{"similarity", "score", "matched_terms",
+    "missing_terms"}``: cosine similarity over the posting's vocabulary
+    (0-1), the same as a 0-100 score, how many posting terms the resume
+    contains, and the most important posting terms it lacks. Returns ``None``
+    entries when the job description has no usable terms.
+
+    Multi-word terms are reported as missing only when they are known
+    ``phrases`` (e.g. "machine learning") or repeated in the posting;
+    otherwise their words are reported on their own. ``match_many`` takes
+    another phrase list per call, e.g. after the keyword taxonomy changed.
+    """
+
+    def __init__(self, ngram_range=(1, 2), max_cached_jobs=32, top_missing_terms=10, phrases=()):
+        self.ngram_range = tuple(ngram_range)
+        self.phrases = self._phrase_set(phrases)
+        self._last_phrases = (tuple(phrases), self.phrases)
+        self.max_cached_jobs = max_cached_jobs
+        self.top_missing_terms = top_missing_terms
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _phrase_set(phrases):
+        return frozenset(" ".join(analyze(phrase, (1, 1))) for phrase in phrases)
+
+    def _phrases_for(self, phrases):
+        """Normalized phrase set, reusing the last one while the list is unchanged"""
+        if phrases is None:
+            return self.phrases
+        phrases = tuple(phrases)
+        last = self._last_phrases
+        if last[0] != phrases:
+            last = (phrases, self._phrase_set(phrases))
+            self._last_phrases = last
+        return last[1]
+
+    def _new_vectorizer(self):
+        return TfidfVectorizer(
+            analyzer=partial(analyze, ngram_range=self.ngram_range),
+            sublinear_tf=True,
+            use_idf=False,  # A single posting has no document frequencies to learn
+        )
+
+    def job_vector(self, job_description):
+        """Cached ``_JobVector`` for a posting, or ``None`` if it has no terms"""
+        text = normalize_text(job_description)
+        if not text:
+            return None
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            if key in self._jobs:
+                self._jobs.move_to_end(key)
+                return self._jobs[key]
+
+        vectorizer = self._new_vectorizer()
+        try:
+            vector = vectorizer.fit_transform([text])
+        except ValueError:  # Only stop words / no tokens
+            job = None
+        else:
+            job = _JobVector(vectorizer, vector, text)
+
+        with self._lock:
+            self._jobs[key] = job
+            while len(self._jobs) > self.max_cached_jobs:
+                self._jobs.popitem(last=False)
+        return job
+
+    def _missing_terms(self, job, present, phrases):
+        """Highest-weighted posting terms absent from the resume, skipping
+        words already found or listed"""
+        missing = []
+        covered = {job.terms[index] for index in present}
+        for index in job.ranked:
+            if index in present:
+                continue
+            term = job.terms[index]
+            words = term.split()
+            if len(words) > 1:
+                if term not in phrases and job.occurrences.get(term, 0) < 2:
+                    continue
+                if any(word in covered for word in words):
+                    continue
+            elif term in covered:
+                continue
+            missing.append(term)
+            covered.update(words)
+            if len(missing) >= self.top_missing_terms:
+                break
+        return missing
+
+    def match_many(self, texts, job_description, phrases=None):
+        job = self.job_vector(job_description)
+        if job is None or not texts:
+            return [None] * len(texts)
+        phrases = self._phrases_for(phrases)
+
+        matrix = job.vectorizer.transform(texts).tocsr()
+        similarities = (matrix @ job.column).toarray().ravel()
+
+        results = []
+        for i, similarity in enumerate(similarities):
+            present = set(matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]].tolist())
+            similarity = float(min(1.0, max(0.0, similarity)))
+            results.append({
+                "similarity": round(similarity, 4),
+                "score": round(similarity * 100, 1),
+                "matched_terms": len(present),
+                "total_terms": len(job.ranked),
+                "missing_terms": self._missing_terms(job, present, phrases),
+            })
+        return results
+
+    def match(self, text, job_description, phrases=None):
+        return self.match_many([text], job_description, phrases)[0]
+
+    def clear(self):
+        with self._lock:
+            self._jobs.clear()
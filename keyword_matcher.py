@@ -0,0 +1,144 @@
+"""
+Single-pass multi-keyword matcher for AI ATS Resume Rater
+All keywords of all categories are compiled once into one trie-shaped regex,
+so a resume is scanned in a single linear pass instead of once per keyword.
+Matches respect token boundaries: "git" does not match inside "digital".
+Aliases ("k8s", "node.js") are extra surface forms reported as their
+canonical keyword.
+"""
+
+import re
+from collections import defaultdict
+
+# Characters that may not touch either end of a keyword match
+_WORD_CHAR = re.compile(r"\w")
+# Spaces and hyphens inside keywords are interchangeable and may span line breaks
+_SEPARATORS = re.compile(r"[\s\-]+")
+_SEPARATOR_PATTERN = r"[\s\-]+"
+
+
+def normalize_keyword(term):
+    """Lowercase with runs of spaces and hyphens as one space (the form keywords are matched in)"""
+    return _SEPARATORS.sub(" ", term.strip().lower())
+
+
+def _plural_forms(term):
+    """Simple plural variants ("course" -> "courses") for longer alphabetic terms"""
+    if len(term) < 4 or not term[-1].isalpha():
+        return []
+    if term.endswith(("s", "x", "z", "ch", "sh")):
+        return [term + "es"]
+    return [term + "s"]
+
+
+def _trie_pattern(forms):
+    """Compile forms into a regex whose alternation is factored like a trie"""
+    trie = {}
+    for form in forms:
+        node = trie
+        for char in form:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        is_end = "" in node
+        branches = []
+        for char in sorted(k for k in node if k):
+            atom = _SEPARATOR_PATTERN if char == " " else re.escape(char)
+            branches.append(atom + build(node[char]))
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if is_end else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Compiled matcher for a ``{category: [keywords]}`` mapping.
+
+    ``scan`` returns every keyword found together with the offsets where it
+    occurs. Overlapping keywords are all reported, e.g. "project management"
+    yields both "project management" and "management" when both are keywords.
+    ``aliases`` maps other spellings to a keyword (``{"k8s": "kubernetes"}``).
+    """
+
+    def __init__(self, categories, plurals=True, aliases=None):
+        self.categories = {
+            category: list(dict.fromkeys(kw.lower() for kw in keywords))
+            for category, keywords in categories.items()
+        }
+
+        self.term_categories = defaultdict(list)
+        for category, keywords in self.categories.items():
+            for keyword in keywords:
+                self.term_categories[keyword].append(category)
+
+        # Every surface form (normalized) -> canonical keywords it stands for
+        surfaces = [(term, term) for term in self.term_categories]
+        surfaces += [(alias.lower(), term.lower()) for alias, term in (aliases or {}).items()
+                     if term.lower() in self.term_categories]
+        self._canonical = defaultdict(list)
+        for surface, term in surfaces:
+            forms = [normalize_keyword(surface)]
+            if plurals:
+                forms += _plural_forms(forms[0])
+            for form in forms:
+                if term not in self._canonical[form]:
+                    self._canonical[form].append(term)
+
+        # Shorter forms that end on a token boundary inside a longer one, e.g.
+        # "spring" in "spring boot". They start at the same offset, so the
+        # longest-match regex reports only the longer form.
+        self._prefix_terms = {}
+        for form, terms in self._canonical.items():
+            prefixes = []
+            for end in range(1, len(form)):
+                if not _WORD_CHAR.match(form[end]):
+                    prefixes += [t for t in self._canonical.get(form[:end], ()) if t not in terms + prefixes]
+            self._prefix_terms[form] = prefixes
+
+        pattern = _trie_pattern(self._canonical)
+        self._regex = re.compile(r"(?<!\w)(?=(" + pattern + r")(?!\w))") if pattern else None
+        self._surface_terms = {}
+
+    def _terms_for(self, surface):
+        """Canonical keywords for matched text (and those ending inside it), memoized per surface form"""
+        terms = self._surface_terms.get(surface)
+        if terms is None:
+            form = normalize_keyword(surface)
+            terms = self._canonical.get(form, []) + self._prefix_terms.get(form, [])
+            if len(self._surface_terms) < 10000:
+                self._surface_terms[surface] = terms
+        return terms
+
+    def scan(self, text):
+        """Return ``{keyword: [start offsets]}`` for every keyword in ``text``.
+
+        Offsets index into ``text.lower()``.
+        """
+        hits = defaultdict(list)
+        if not text or self._regex is None:
+            return hits
+
+        for match in self._regex.finditer(text.lower()):
+            start = match.start()
+            for term in self._terms_for(match.group(1)):
+                hits[term].append(start)
+        return hits
+
+    def categorize(self, hits):
+        """Group scan hits by category, keeping each category's keyword order"""
+        return {
+            category: [kw for kw in keywords if kw in hits]
+            for category, keywords in self.categories.items()
+        }
+
+    def counts(self, hits):
+        """Per-category ``{keyword: occurrences}`` for scan hits"""
+        return {
+            category: {kw: len(hits[kw]) for kw in keywords if kw in hits}
+            for category, keywords in self.categories.items()
+        }
@@ -0,0 +1,309 @@
+"""
+Lightweight instrumentation for AI ATS Resume Rater
+Counters and histograms for every analysis stage, rendered in the Prometheus
+text format for the ``/metrics`` endpoint (see server.py), plus an opt-in
+per-request cProfile hook. Has no third-party dependencies, so extraction
+workers can import it.
+"""
+
+import contextlib
+import cProfile
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from config import METRICS_CONFIG
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+CHARS_BUCKETS = (500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def _label_text(labelnames, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonic counter, optionally split by labels"""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(v)}" for key, v in values]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram, optionally split by labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket (non-cumulative) counts with +Inf last, then sum
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the ``with`` block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self, **labels):
+        """``{"count", "sum"}`` of one series"""
+        series = self._series.get(self._key(labels))
+        if series is None:
+            return {"count": 0, "sum": 0.0}
+        return {"count": sum(series[0]), "sum": series[1]}
+
+    def _samples(self):
+        with self._lock:
+            series = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        lines = []
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_label_text(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Counter or gauge read at scrape time: ``collect()`` returns ``{label values: value}``"""
+
+    def __init__(self, name, documentation, kind, collect, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def _samples(self):
+        values = sorted(self._collect().items())
+        return [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(v)}" for key, v in values]
+
+
+class MetricsRegistry:
+    """Holds metrics by name and renders them all for scraping"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, buckets=LATENCY_BUCKETS, labelnames=()):
+        return self._register(Histogram(name, documentation, buckets, labelnames))
+
+    def callback(self, name, documentation, kind, collect, labelnames=()):
+        return self._register(CallbackMetric(name, documentation, kind, collect, labelnames))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "ats_request_seconds", "End-to-end resume analysis latency", labelnames=("outcome",)
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "ats_stage_seconds", "Wall time of each pipeline stage", labelnames=("stage",)
+)
+STAGE_RESULTS = REGISTRY.counter(
+    "ats_stage_results_total", "Stage completions by status (ok, error, timeout)", ("stage", "status")
+)
+MODEL_SECONDS = REGISTRY.histogram(
+    "ats_model_seconds", "Time spent per model batch by step (tokenize, forward)",
+    labelnames=("model", "step")
+)
+MODEL_BATCH_SIZE = REGISTRY.histogram(
+    "ats_model_batch_size", "Inputs per model forward pass", COUNT_BUCKETS, ("model",)
+)
+TEXT_LENGTH = REGISTRY.histogram(
+    "ats_text_length_chars", "Characters of extracted resume text", CHARS_BUCKETS, ("format",)
+)
+PDF_PAGES = REGISTRY.histogram("ats_pdf_pages", "PDF pages read per extraction", COUNT_BUCKETS)
+PARAGRAPHS = REGISTRY.histogram("ats_paragraphs", "Paragraphs sent to section classification", COUNT_BUCKETS)
+SECTION_PARAGRAPHS = REGISTRY.counter(
+    "ats_section_paragraphs_total", "Paragraphs labeled by section detection, by route (header, model)", ("route",)
+)
+
+
+def register_cache_metrics(cache, registry=REGISTRY):
+    """Export an AnalysisCache's counters and sizes, read when /metrics is scraped"""
+    registry.callback(
+        "ats_cache_lookups_total", "Analysis cache lookups by result", "counter",
+        lambda: {("memory_hit",): cache.memory_hits, ("disk_hit",): cache.disk_hits, ("miss",): cache.misses},
+        ("result",),
+    )
+    registry.callback(
+        "ats_cache_evictions_total", "Analysis cache entries evicted by tier", "counter",
+        lambda: {("memory",): cache.evictions, ("disk",): cache.disk_evictions}, ("tier",),
+    )
+
+    # Both gauges come from one stats() call per scrape (it counts the SQLite rows):
+    # entries is rendered first and leaves its snapshot for memory_bytes
+    snapshot = {}
+
+    def entries():
+        stats = snapshot["stats"] = cache.stats()
+        return {("memory",): stats["entries"], ("disk",): stats["disk_entries"]}
+
+    def memory_bytes():
+        stats = snapshot.pop("stats", None) or cache.stats()
+        return {(): stats["memory_bytes"]}
+
+    registry.callback("ats_cache_entries", "Analysis cache entries by tier", "gauge", entries, ("tier",))
+    registry.callback(
+        "ats_cache_memory_bytes", "Bytes held by the in-memory cache tier", "gauge", memory_bytes
+    )
+
+
+def register_model_metrics(models, registry=REGISTRY):
+    """Export the backend and weight precision each loaded model of a ModelRegistry runs with"""
+    from inference_backends import weights_variant
+
+    registry.callback(
+        "ats_model_backend_info", "Inference backend of each loaded model (always 1)", "gauge",
+        lambda: {(name, weights_variant(models.get(name)) or "unknown"): 1
+                 for name in models.status() if models.is_loaded(name)},
+        ("model", "variant"),
+    )
+
+
+class RequestProfiler:
+    """Opt-in cProfile of whole requests.
+
+    ``arm(n)`` profiles the next ``n`` requests; each one is written to
+    ``output_dir/<name>-<timestamp>.prof`` (open with ``python -m pstats`` or
+    snakeviz). Unarmed requests pay only a counter check. cProfile only sees
+    the calling thread, so callers should run their work inline while
+    ``is_profiling()`` is true.
+    """
+
+    def __init__(self, output_dir="profiles"):
+        self.output_dir = output_dir
+        self._remaining = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def is_profiling(self):
+        """True inside a profiled request on this thread"""
+        return getattr(self._local, "active", False)
+
+    def arm(self, requests=1):
+        with self._lock:
+            self._remaining += max(0, int(requests))
+            return self._remaining
+
+    @property
+    def remaining(self):
+        return self._remaining
+
+    def _take(self):
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            return True
+
+    @contextlib.contextmanager
+    def profile(self, name="request"):
+        if not self._remaining or not self._take():
+            yield None
+            return
+
+        profiler = cProfile.Profile()
+        self._local.active = True
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            self._local.active = False
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(
+                self.output_dir,
+                f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{id(profiler):x}.prof"
+            )
+            profiler.dump_stats(path)
+            print(f"Wrote profile: {path}")
+
+
+profiler = RequestProfiler(METRICS_CONFIG.get("profile_dir", "profiles"))
+profiler.arm(METRICS_CONFIG.get("profile_first_requests", 0))
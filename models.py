@@ -0,0 +1,119 @@
+"""
+Lazy model registry for AI ATS Resume Rater
+Models are registered with a loader function and built on first use (or by a
+background warm-up thread), so importing the app never loads transformers.
+"""
+
+import threading
+import time
+
+NOT_LOADED = "not loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelRegistry:
+    """Thread-safe registry of lazily loaded models.
+
+    Concurrent ``get`` calls for a model that is still loading wait for the
+    single in-progress load instead of starting another one. A failed load is
+    remembered: ``get`` raises the same error without loading again until
+    ``retry_after`` seconds have passed (None: never), ``warm_up()`` runs or
+    ``reset()`` is called.
+    """
+
+    def __init__(self, retry_after=None):
+        self.retry_after = retry_after
+        self._loaders = {}
+        self._models = {}
+        self._locks = {}
+        self._state = {}
+        self._errors = {}
+        self._failures = {}
+        self._load_seconds = {}
+        self._warm_up_thread = None
+
+    def register(self, name, loader):
+        """Register ``loader`` (a zero-argument callable) under ``name``"""
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+        self._state[name] = NOT_LOADED
+        self._models.pop(name, None)
+        self._failures.pop(name, None)
+        self._errors.pop(name, None)
+
+    def reset(self, name=None):
+        """Allow failed loads of ``name`` (default: every model) to be retried on the next ``get``"""
+        for failed in [name] if name else list(self._failures):
+            self._failures.pop(failed, None)
+
+    def get(self, name):
+        """Return the model, loading it first if needed"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._locks[name]:
+            model = self._models.get(name)
+            if model is None:
+                failure = self._failures.get(name)
+                if failure is not None:
+                    error, failed_at = failure
+                    if self.retry_after is None or time.monotonic() - failed_at < self.retry_after:
+                        raise error
+                self._state[name] = LOADING
+                print(f"Loading AI model: {name}...")
+                started = time.perf_counter()
+                try:
+                    model = self._loaders[name]()
+                except Exception as e:
+                    self._state[name] = FAILED
+                    self._errors[name] = str(e)
+                    self._failures[name] = (e, time.monotonic())
+                    raise
+                self._load_seconds[name] = time.perf_counter() - started
+                self._models[name] = model
+                self._state[name] = READY
+                self._errors.pop(name, None)
+                self._failures.pop(name, None)
+        return model
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def is_ready(self):
+        """True once every registered model is loaded"""
+        return all(state == READY for state in self._state.values())
+
+    def status(self):
+        """``{name: {"state", "load_seconds", "error"}}`` for every registered model"""
+        return {
+            name: {
+                "state": state,
+                "load_seconds": self._load_seconds.get(name),
+                "error": self._errors.get(name),
+            }
+            for name, state in self._state.items()
+        }
+
+    def warm_up(self, names=None, background=True):
+        """Load ``names`` (default: all models), optionally in a daemon thread, retrying failed ones"""
+        names = list(names or self._loaders)
+        for name in names:
+            self.reset(name)
+
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"Error loading AI model {name}: {e}")
+
+        if not background:
+            load_all()
+            return None
+        if self._warm_up_thread is None or not self._warm_up_thread.is_alive():
+            self._warm_up_thread = threading.Thread(target=load_all, name="model-warm-up", daemon=True)
+            self._warm_up_thread.start()
+        return self._warm_up_thread
@@ -0,0 +1,480 @@
+"""
+Resume ranking index for AI ATS Resume Rater
+Keeps already-extracted resumes in a directory of flat binary arrays that are
+memory-mapped on read, so "rank 5,000 applicants for this job" never re-parses
+a file. Per resume the index stores:
+- the extracted text (one UTF-8 blob plus offsets)
+- a keyword hit vector over the ATS keyword vocabulary
+- hashed, log-scaled term frequencies (CSR arrays) for job description similarity
+- optionally a sentence embedding
+Resumes can be added and removed incrementally; removals are tombstones until
+``compact`` rewrites the index.
+
+Usage:
+    python ranking.py add resume_index/ resumes/ [--embeddings]
+    python ranking.py query resume_index/ --job-description-file job.txt --top 20
+    python ranking.py remove resume_index/ alice.pdf bob.docx
+    python ranking.py compact resume_index/
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+from functools import partial
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from jd_matching import analyze
+from keyword_matcher import KeywordMatcher
+
+FORMAT_VERSION = 1
+
+# name -> dtype of every array file; row-aligned arrays grow with each resume
+_ARRAYS = {
+    "texts": np.uint8,
+    "text_offsets": np.int64,
+    "keywords": np.uint8,
+    "tf_indptr": np.int64,
+    "tf_indices": np.int32,
+    "tf_data": np.float32,
+    "embeddings": np.float32,
+    "alive": np.uint8,
+}
+
+DEFAULT_WEIGHTS = {"job_similarity": 0.5, "keyword_overlap": 0.3, "embedding": 0.2}
+
+
+class ResumeIndex:
+    """On-disk index of extracted resumes answering top-k job description queries.
+
+    ``keywords`` (``{category: [keywords]}``) fixes the keyword vocabulary when
+    the index is created; later opens use the stored one. Only one process
+    should write to an index at a time; readers see the state of the last
+    completed ``add``/``remove``.
+    """
+
+    def __init__(self, path, keywords=None, hash_features=2 ** 20, ngram_range=(1, 2)):
+        self.path = path
+        self._lock = threading.Lock()
+        self._maps = {}
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if self.meta.get("format") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported resume index format in {path}")
+        else:
+            if keywords is None:
+                raise ValueError("keywords are required to create a new resume index")
+            os.makedirs(path, exist_ok=True)
+            self.meta = {
+                "format": FORMAT_VERSION,
+                "ids": [],
+                "text_bytes": 0,
+                "nnz": 0,
+                "embedding_dim": 0,
+                "hash_features": hash_features,
+                "ngram_range": list(ngram_range),
+                "keywords": keywords,
+            }
+            self._write_meta()
+
+        self.matcher = KeywordMatcher(self.meta["keywords"])
+        self.keyword_terms = list(dict.fromkeys(
+            kw.lower() for keywords in self.meta["keywords"].values() for kw in keywords
+        ))
+        self._keyword_columns = {term: i for i, term in enumerate(self.keyword_terms)}
+        self.hasher = HashingVectorizer(
+            analyzer=partial(analyze, ngram_range=tuple(self.meta["ngram_range"])),
+            n_features=self.meta["hash_features"],
+            alternate_sign=False,
+            norm=None,
+        )
+        self._rows = self._build_row_map()
+
+    # -- storage -------------------------------------------------------------
+
+    def _file(self, name):
+        return os.path.join(self.path, name + ".bin")
+
+    def _lengths(self):
+        """Expected element count of every array file for the committed state"""
+        n = len(self.meta["ids"])
+        return {
+            "texts": self.meta["text_bytes"],
+            "text_offsets": n,
+            "keywords": n * len(self.keyword_terms),
+            "tf_indptr": n,
+            "tf_indices": self.meta["nnz"],
+            "tf_data": self.meta["nnz"],
+            "embeddings": n * self.meta["embedding_dim"],
+            "alive": n,
+        }
+
+    def _array(self, name):
+        """Read-only memory map of one array (empty array if it has no data)"""
+        array = self._maps.get(name)
+        if array is None:
+            length = self._lengths()[name]
+            if length == 0:
+                array = np.zeros(0, dtype=_ARRAYS[name])
+            else:
+                array = np.memmap(self._file(name), dtype=_ARRAYS[name], mode="r", shape=(length,))
+            self._maps[name] = array
+        return array
+
+    def _write_meta(self):
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def _append(self, arrays):
+        """Append to every array file, then commit by rewriting meta.json.
+
+        Files are first truncated to their committed length, dropping any
+        tail left by an interrupted earlier append.
+        """
+        lengths = self._lengths()
+        for name, values in arrays.items():
+            itemsize = np.dtype(_ARRAYS[name]).itemsize
+            with open(self._file(name), "ab") as f:
+                f.truncate(lengths[name] * itemsize)
+                f.write(np.ascontiguousarray(values, dtype=_ARRAYS[name]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _build_row_map(self):
+        alive = self._array("alive")
+        return {
+            doc_id: row for row, doc_id in enumerate(self.meta["ids"])
+            if alive[row]
+        }
+
+    # -- writes --------------------------------------------------------------
+
+    def _term_rows(self, texts):
+        """Hashed log-scaled term frequencies (CSR) of ``texts``"""
+        matrix = self.hasher.transform(texts).tocsr()
+        matrix.sum_duplicates()
+        matrix.sort_indices()
+        matrix.data = 1 + np.log(matrix.data)
+        return matrix
+
+    def _keyword_rows(self, texts):
+        rows = np.zeros((len(texts), len(self.keyword_terms)), dtype=np.uint8)
+        for i, text in enumerate(texts):
+            for term in self.matcher.scan(text):
+                rows[i, self._keyword_columns[term]] = 1
+        return rows
+
+    def add(self, items, embedder=None):
+        """Add ``(doc_id, text)`` pairs; an existing ``doc_id`` is replaced.
+
+        ``embedder`` maps a list of texts to an ``(n, dim)`` array of
+        normalized embeddings. Once an index holds embeddings every batch must
+        include them.
+        """
+        # A repeated id within one batch keeps its last text
+        latest = {}
+        for doc_id, text in items:
+            latest.pop(str(doc_id), None)
+            latest[str(doc_id)] = text
+        if not latest:
+            return 0
+        ids = list(latest)
+        texts = list(latest.values())
+
+        embeddings = None
+        if embedder is not None:
+            embeddings = np.asarray(embedder(texts), dtype=np.float32)
+            dim = embeddings.shape[1]
+            if self.meta["embedding_dim"] and dim != self.meta["embedding_dim"]:
+                raise ValueError(f"Embedding size {dim} does not match the index ({self.meta['embedding_dim']})")
+        elif self.meta["embedding_dim"]:
+            raise ValueError("This index stores embeddings; pass an embedder")
+        if embeddings is not None and self.meta["ids"] and not self.meta["embedding_dim"]:
+            raise ValueError("This index was built without embeddings")
+
+        encoded = [text.encode("utf-8") for text in texts]
+        terms = self._term_rows(texts)
+        text_starts = self.meta["text_bytes"] + np.cumsum([0] + [len(b) for b in encoded[:-1]])
+
+        with self._lock:
+            replaced = [self._rows[doc_id] for doc_id in ids if doc_id in self._rows]
+            self._append({
+                "texts": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+                "text_offsets": text_starts,
+                "keywords": self._keyword_rows(texts).ravel(),
+                "tf_indptr": self.meta["nnz"] + terms.indptr[:-1],
+                "tf_indices": terms.indices,
+                "tf_data": terms.data,
+                "embeddings": embeddings.ravel() if embeddings is not None else np.zeros(0),
+                "alive": np.ones(len(ids), dtype=np.uint8),
+            })
+            self.meta["ids"].extend(ids)
+            self.meta["text_bytes"] += sum(len(b) for b in encoded)
+            self.meta["nnz"] += int(terms.nnz)
+            if embeddings is not None:
+                self.meta["embedding_dim"] = int(embeddings.shape[1])
+            self._write_meta()
+
+            self._maps = {}
+            self._tombstone(replaced)
+            start = len(self.meta["ids"]) - len(ids)
+            self._rows.update((doc_id, start + i) for i, doc_id in enumerate(ids))
+        return len(ids)
+
+    def _tombstone(self, rows):
+        if not rows:
+            return
+        with open(self._file("alive"), "r+b") as f:
+            for row in rows:
+                f.seek(row)
+                f.write(b"\0")
+            f.flush()
+            os.fsync(f.fileno())
+        self._maps.pop("alive", None)
+
+    def remove(self, doc_ids):
+        """Remove resumes by id; returns how many were present"""
+        with self._lock:
+            rows = [self._rows.pop(str(doc_id)) for doc_id in doc_ids if str(doc_id) in self._rows]
+            self._tombstone(rows)
+        return len(rows)
+
+    def compact(self):
+        """Rewrite the index without removed resumes"""
+        with self._lock:
+            live_rows = sorted(self._rows.values())
+            target = self.path.rstrip(os.sep) + ".compact"
+            shutil.rmtree(target, ignore_errors=True)
+            compacted = ResumeIndex(
+                target, self.meta["keywords"], self.meta["hash_features"], self.meta["ngram_range"]
+            )
+            dim = self.meta["embedding_dim"]
+            for start in range(0, len(live_rows), 1000):
+                rows = live_rows[start:start + 1000]
+                items = [(self.meta["ids"][row], self._text(row)) for row in rows]
+                embeddings = self._array("embeddings").reshape(-1, dim)[rows] if dim else None
+                compacted.add(items, embedder=(lambda texts, e=embeddings: e) if dim else None)
+
+            self._maps = {}
+            old = self.path.rstrip(os.sep) + ".old"
+            shutil.rmtree(old, ignore_errors=True)
+            os.replace(self.path, old)
+            os.replace(target, self.path)
+            shutil.rmtree(old)
+            with open(os.path.join(self.path, "meta.json"), "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            self._rows = self._build_row_map()
+
+    # -- reads ---------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, doc_id):
+        return str(doc_id) in self._rows
+
+    def ids(self):
+        return list(self._rows)
+
+    def _text(self, row):
+        offsets = self._array("text_offsets")
+        start = int(offsets[row])
+        stop = int(offsets[row + 1]) if row + 1 < len(offsets) else self.meta["text_bytes"]
+        return bytes(self._array("texts")[start:stop]).decode("utf-8")
+
+    def text(self, doc_id):
+        """Stored extracted text of one resume"""
+        return self._text(self._rows[str(doc_id)])
+
+    def _term_matrix(self):
+        n = len(self.meta["ids"])
+        indptr = np.append(self._array("tf_indptr"), self.meta["nnz"]).astype(np.int64)
+        return sp.csr_matrix(
+            (self._array("tf_data"), self._array("tf_indices"), indptr),
+            shape=(n, self.meta["hash_features"]),
+        )
+
+    def job_similarity(self, job_description):
+        """Cosine similarity of every row to the posting over the posting's terms
+        (the same measure as ``jd_matching.JobMatcher``)"""
+        n = len(self.meta["ids"])
+        query = self._term_rows([job_description])
+        if n == 0 or query.nnz == 0:
+            return np.zeros(n, dtype=np.float32)
+        weights = query.data / np.linalg.norm(query.data)
+        restricted = self._term_matrix()[:, query.indices]
+        dots = restricted @ weights
+        norms = np.sqrt(np.asarray(restricted.multiply(restricted).sum(axis=1)).ravel())
+        return np.divide(dots, norms, out=np.zeros(n), where=norms > 0)
+
+    def keyword_overlap(self, job_description):
+        """Share of the posting's ATS keywords found in every row (None without any)"""
+        wanted = [self._keyword_columns[term] for term in self.matcher.scan(job_description)]
+        if not wanted:
+            return None
+        hits = self._array("keywords").reshape(-1, len(self.keyword_terms))
+        return hits[:, wanted].sum(axis=1, dtype=np.float32) / len(wanted)
+
+    def top_k(self, job_description, k=10, weights=None, embedder=None):
+        """Best ``k`` resumes for a job description, best first.
+
+        Scores combine job term similarity, ATS keyword overlap and (with an
+        ``embedder`` and stored embeddings) embedding similarity, using
+        ``weights`` renormalized over the components that are available.
+        """
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        n = len(self.meta["ids"])
+        components = {"job_similarity": self.job_similarity(job_description)}
+        overlap = self.keyword_overlap(job_description)
+        if overlap is not None:
+            components["keyword_overlap"] = overlap
+        if embedder is not None and self.meta["embedding_dim"]:
+            query = np.asarray(embedder([job_description]), dtype=np.float32)[0]
+            components["embedding"] = self._array("embeddings").reshape(n, -1) @ query
+
+        total_weight = sum(weights[name] for name in components) or 1.0
+        scores = np.zeros(n, dtype=np.float64)
+        for name, values in components.items():
+            scores += (weights[name] / total_weight) * values
+        scores[self._array("alive")[:n] == 0] = -np.inf
+
+        k = min(k, len(self._rows))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {
+                "id": self.meta["ids"][row],
+                "score": round(float(scores[row]) * 100, 1),
+                **{name: round(float(values[row]), 4) for name, values in components.items()},
+            }
+            for row in top
+        ]
+
+    def stats(self):
+        return {
+            "resumes": len(self._rows),
+            "removed": len(self.meta["ids"]) - len(self._rows),
+            "text_bytes": self.meta["text_bytes"],
+            "term_entries": self.meta["nnz"],
+            "embedding_dim": self.meta["embedding_dim"],
+            "disk_bytes": sum(
+                os.path.getsize(self._file(name)) for name in _ARRAYS if os.path.exists(self._file(name))
+            ),
+        }
+
+
+def _embedder():
+    from config import MODEL_CONFIG
+    from section_classifier import EmbeddingSectionClassifier
+
+    return EmbeddingSectionClassifier(
+        MODEL_CONFIG["embedding_model"],
+        batch_size=MODEL_CONFIG.get("embedding_batch_size", 32),
+        model_config=MODEL_CONFIG,
+    ).embed
+
+
+def _open_index(path):
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return ResumeIndex(path)
+    from config import TAXONOMY_CONFIG
+    from taxonomy import load_taxonomy
+
+    taxonomy = load_taxonomy(TAXONOMY_CONFIG.get("path"))
+    return ResumeIndex(path, keywords={category: list(keywords) for category, keywords in taxonomy.categories.items()})
+
+
+def _add_command(args):
+    from concurrent.futures import ProcessPoolExecutor
+
+    from batch import _chunks, _extract_item, iter_resume_sources
+
+    index = _open_index(args.index)
+    embedder = _embedder() if args.embeddings else None
+    added = errors = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for chunk in _chunks(iter_resume_sources(args.source), args.batch_size):
+            items = []
+            for file_id, text, error in pool.map(_extract_item, chunk):
+                if error is None and text and len(text.strip()) >= 50:
+                    items.append((file_id, text))
+                else:
+                    errors += 1
+                    print(f"Skipped {file_id}: {error or 'Could not extract enough text from the file'}",
+                          file=sys.stderr)
+            added += index.add(items, embedder=embedder)
+    print(f"Added {added} resumes ({errors} skipped); index holds {len(index)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index resumes and rank them against job descriptions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Extract and index a directory or archive of resumes")
+    add.add_argument("index")
+    add.add_argument("source")
+    add.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    add.add_argument("--batch-size", type=int, default=64)
+    add.add_argument("--embeddings", action="store_true", help="Also store MODEL_CONFIG['embedding_model'] embeddings")
+
+    query = commands.add_parser("query", help="Top resumes for a job description")
+    query.add_argument("index")
+    query.add_argument("--job-description", default="")
+    query.add_argument("--job-description-file")
+    query.add_argument("--top", type=int, default=20)
+    query.add_argument("--embeddings", action="store_true", help="Use stored embeddings in the score")
+    query.add_argument("--json", action="store_true", help="Print results as JSON lines")
+
+    remove = commands.add_parser("remove", help="Remove resumes by id")
+    remove.add_argument("index")
+    remove.add_argument("ids", nargs="+")
+
+    compact = commands.add_parser("compact", help="Rewrite the index without removed resumes")
+    compact.add_argument("index")
+
+    stats = commands.add_parser("stats", help="Index size")
+    stats.add_argument("index")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "add":
+        _add_command(args)
+    elif args.command == "query":
+        job_description = args.job_description
+        if args.job_description_file:
+            with open(args.job_description_file, "r", encoding="utf-8") as f:
+                job_description = f.read()
+        index = ResumeIndex(args.index)
+        results = index.top_k(job_description, args.top, embedder=_embedder() if args.embeddings else None)
+        for rank, result in enumerate(results, 1):
+            if args.json:
+                print(json.dumps({"rank": rank, **result}))
+            else:
+                print(f"{rank:>4}. {result['score']:>5.1f}  {result['id']}")
+    elif args.command == "remove":
+        removed = ResumeIndex(args.index).remove(args.ids)
+        print(f"Removed {removed} resumes")
+    elif args.command == "compact":
+        index = ResumeIndex(args.index)
+        index.compact()
+        print(f"Compacted index holds {len(index)} resumes")
+    else:
+        print(json.dumps(ResumeIndex(args.index).stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
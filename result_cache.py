@@ -0,0 +1,188 @@
+"""
+Content-addressed cache for resume analysis results
+Results are keyed on a hash of the normalized extracted text, the job
+description and the model/config version. A bounded in-memory LRU tier sits
+in front of an optional SQLite tier that survives restarts; the SQLite tier
+drops its oldest entries beyond ``max_disk_entries``.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    """Normalize text so trivially different extractions share a cache key"""
+    text = unicodedata.normalize("NFC", text or "")
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def config_version(*parts):
+    """Short fingerprint of anything that changes analysis results (config, models)"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def make_cache_key(text, job_description="", version=""):
+    """Return the content address for one (resume text, job description, version)"""
+    digest = hashlib.sha256()
+    for part in (version, normalize_text(job_description), normalize_text(text)):
+        encoded = part.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """Two-tier (memory LRU + optional SQLite) cache of JSON-serializable results.
+
+    Values are stored serialized, so callers always get a fresh copy and the
+    memory tier can be bounded by both entry count and total bytes. The SQLite
+    tier keeps about ``max_disk_entries`` entries (None: unbounded), pruning
+    the least recently written ones. Its connection is opened on first use in
+    each process, so forked workers never share the parent's connection.
+    """
+
+    def __init__(self, max_entries=512, max_memory_mb=64, disk_path=None, max_disk_entries=None):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = int(max_memory_mb * 1024 * 1024)
+        self.disk_path = disk_path
+        self.max_disk_entries = int(max_disk_entries) if max_disk_entries else None
+        # Pruning counts the table, so it runs once per 1% of the bound in writes
+        self._prune_every = max(1, (self.max_disk_entries or 0) // 100)
+        self._writes_since_prune = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        self._inherited_dbs = []
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        if disk_path:
+            directory = os.path.dirname(os.path.abspath(disk_path))
+            os.makedirs(directory, exist_ok=True)
+
+    def _connection(self):
+        """This process's SQLite connection (None without a disk tier); call with the lock held"""
+        if not self.disk_path:
+            return None
+        if self._db_pid != os.getpid():
+            # A connection must not be used (or closed) across fork(): keep the
+            # parent's untouched and open one for this process
+            if self._db is not None:
+                self._inherited_dbs.append(self._db)
+            self._db = sqlite3.connect(self.disk_path, check_same_thread=False)
+            self._db_pid = os.getpid()
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+            self._prune(self._db)
+        return self._db
+
+    def _prune(self, db):
+        """Delete the least recently written rows beyond ``max_disk_entries``; call with the lock held"""
+        self._writes_since_prune = 0
+        if self.max_disk_entries is None:
+            return
+        excess = db.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0] - self.max_disk_entries
+        if excess > 0:
+            # INSERT OR REPLACE gives a rewritten key a new rowid, so rowid order is write order
+            db.execute(
+                "DELETE FROM analysis_cache WHERE rowid IN "
+                "(SELECT rowid FROM analysis_cache ORDER BY rowid LIMIT ?)", (excess,)
+            )
+            db.commit()
+            self.disk_evictions += excess
+
+    def _remember(self, key, payload):
+        """Insert into the memory tier and evict least recently used entries"""
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        if len(payload) > self.max_bytes:
+            return
+        self._memory[key] = payload
+        self._memory_bytes += len(payload)
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def get(self, key):
+        """Return the cached value for ``key``, or None"""
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return json.loads(payload)
+
+            db = self._connection()
+            if db is not None:
+                row = db.execute(
+                    "SELECT value FROM analysis_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    payload = row[0].encode("utf-8")
+                    self._remember(key, payload)
+                    self.disk_hits += 1
+                    return json.loads(payload)
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store a JSON-serializable value under ``key`` in every tier"""
+        payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self._remember(key, payload)
+            db = self._connection()
+            if db is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO analysis_cache (key, value) VALUES (?, ?)",
+                    (key, payload.decode("utf-8")),
+                )
+                db.commit()
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= self._prune_every:
+                    self._prune(db)
+
+    def clear(self):
+        """Drop every entry from both tiers (counters are kept)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            db = self._connection()
+            if db is not None:
+                db.execute("DELETE FROM analysis_cache")
+                db.commit()
+
+    def stats(self):
+        """Hit/miss/eviction counters and current usage of both tiers"""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            db = self._connection()
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_enabled": db is not None,
+                "disk_entries": db.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0] if db else 0,
+            }
@@ -0,0 +1,144 @@
+"""
+Concurrent analysis scheduler for AI ATS Resume Rater
+The analyzers only share their input text, so they run side by side on a
+thread pool (model inference releases the GIL). Each stage has a timeout;
+a stage that fails or runs over is replaced by its fallback value, so one slow
+model degrades the result instead of blocking the whole analysis.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class Stage:
+    """One analyzer: ``fn(*args)`` with a ``fallback(error)`` result and a timeout in seconds.
+
+    ``depends_on`` names the inputs the result is a function of (e.g.
+    ``("document", "job_description")``), so callers know which results a
+    changed input invalidates.
+    """
+
+    def __init__(self, name, fn, fallback, timeout=None, depends_on=("document",)):
+        self.name = name
+        self.fn = fn
+        self.fallback = fallback
+        self.timeout = timeout
+        self.depends_on = tuple(depends_on)
+
+
+class AnalysisScheduler:
+    """Runs independent stages concurrently on a shared thread pool.
+
+    ``run`` returns ``(results, timings)``: ``results`` maps stage name to its
+    value (or fallback) and ``timings`` maps stage name to
+    ``{"seconds", "status"}`` where status is "ok", "error" or "timeout".
+    At most ``max_workers`` stages run at once (later ones wait for a slot),
+    and a stage's timeout counts from when it starts running, so waiting for
+    a slot never times it out. A timed-out stage keeps running in the
+    background and its result is dropped; up to ``max_abandoned`` of them run
+    on spare threads and give their slot back, further ones keep their slot
+    until they finish.
+    """
+
+    def __init__(self, max_workers=8, max_abandoned=4):
+        self.max_workers = max_workers
+        self.max_abandoned = max_abandoned
+        self.abandoned = 0  # Timed-out stages still running on a spare thread
+        self._slots = threading.Semaphore(max_workers)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers + self.max_abandoned, thread_name_prefix="analysis"
+                )
+            return self._executor
+
+    def _abandon(self, state):
+        """Give a timed-out stage's slot back if a spare thread is left for it"""
+        with self._lock:
+            if state["done"] or state["abandoned"] or self.abandoned >= self.max_abandoned:
+                return
+            state["abandoned"] = True
+            self.abandoned += 1
+        self._slots.release()
+
+    def run(self, stages, *args):
+        executor = self._get_executor()
+        states = {stage.name: {"started": threading.Event(), "done": False, "abandoned": False}
+                  for stage in stages}
+
+        def timed(stage):
+            state = states[stage.name]
+            state["started_at"] = time.perf_counter()
+            state["started"].set()
+            try:
+                return stage.fn(*args)
+            finally:
+                state["finished_at"] = time.perf_counter()
+                with self._lock:
+                    state["done"] = True
+                    abandoned = state["abandoned"]
+                    if abandoned:
+                        self.abandoned -= 1
+                if not abandoned:
+                    self._slots.release()
+
+        futures = {}
+        for stage in stages:
+            self._slots.acquire()
+            futures[stage.name] = executor.submit(timed, stage)
+
+        # Wait for stages in order of their time limits, each measured from its own start
+        results = {}
+        timings = {}
+        for stage in sorted(stages, key=lambda s: float("inf") if s.timeout is None else s.timeout):
+            future = futures[stage.name]
+            state = states[stage.name]
+            if stage.timeout is None:
+                wait([future])
+            else:
+                state["started"].wait()
+                wait([future], timeout=max(0.0, state["started_at"] + stage.timeout - time.perf_counter()))
+
+            if not future.done():
+                self._abandon(state)
+                results[stage.name] = stage.fallback(f"{stage.name} timed out after {stage.timeout:g}s")
+                timings[stage.name] = {"seconds": time.perf_counter() - state["started_at"], "status": "timeout"}
+                print(f"Analysis stage '{stage.name}' timed out after {stage.timeout:g}s; using defaults")
+                continue
+
+            seconds = state["finished_at"] - state["started_at"]
+            try:
+                results[stage.name] = future.result()
+                timings[stage.name] = {"seconds": seconds, "status": "ok"}
+            except Exception as e:
+                results[stage.name] = stage.fallback(str(e))
+                timings[stage.name] = {"seconds": seconds, "status": "error"}
+                print(f"Analysis stage '{stage.name}' failed: {e}")
+
+        return results, {stage.name: timings[stage.name] for stage in stages}
+
+    def run_serial(self, stages, *args):
+        """Same contract as ``run`` without threads or timeouts (for debugging and benchmarks)"""
+        results = {}
+        timings = {}
+        for stage in stages:
+            started = time.perf_counter()
+            try:
+                results[stage.name] = stage.fn(*args)
+                status = "ok"
+            except Exception as e:
+                results[stage.name] = stage.fallback(str(e))
+                status = "error"
+            timings[stage.name] = {"seconds": time.perf_counter() - started, "status": status}
+        return results, timings
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
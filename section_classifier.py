@@ -0,0 +1,413 @@
+"""
+Section classification engines for AI ATS Resume Rater
+Two interchangeable backends, selected with MODEL_CONFIG["section_backend"]:
+- "zero_shot": BART-MNLI zero-shot classification, batched across paragraphs
+- "embedding": a small sentence encoder compared against cached prototypes
+HeaderSectionDetector runs before either of them and labels paragraphs that
+open with an unambiguous section header, so only the rest reach the model.
+"""
+
+import hashlib
+import inspect
+import os
+import re
+
+import numpy as np
+
+from metrics import MODEL_BATCH_SIZE, MODEL_SECONDS
+
+SECTION_LABELS = ["experience", "education", "skills", "summary", "achievements"]
+
+# Short descriptions of what each section typically contains. Paragraphs are
+# scored against the closest prototype of every label.
+SECTION_PROTOTYPES = {
+    "experience": [
+        "Work experience: job title, company name, employment dates and responsibilities",
+        "Developed, managed and delivered projects as an engineer at a company",
+        "Professional history with roles held and duties performed at each employer",
+    ],
+    "education": [
+        "Education: university degree, college, major and graduation year",
+        "Bachelor of Science, Master's degree, relevant coursework and GPA",
+        "Academic background, certifications and training courses completed",
+    ],
+    "skills": [
+        "Skills: programming languages, tools, frameworks and technologies",
+        "Technical skills such as Python, SQL, Docker, AWS and Git",
+        "Core competencies including communication, leadership and teamwork",
+    ],
+    "summary": [
+        "Professional summary describing the candidate's background and career goals",
+        "Objective: motivated professional seeking a role to apply my experience",
+        "Profile: experienced specialist with years of experience in the field",
+    ],
+    "achievements": [
+        "Achievements: awards, honors and recognition received",
+        "Won first place, employee of the year, dean's list, published papers",
+        "Accomplishments with measurable results and notable recognition",
+    ],
+}
+
+
+def section_candidate_indices(paragraphs, max_paragraphs=10, min_length=20):
+    """Positions of the paragraphs worth classifying"""
+    return [i for i, paragraph in enumerate(paragraphs[:max_paragraphs]) if len(paragraph) > min_length]
+
+
+def section_candidates(paragraphs, max_paragraphs=10, min_length=20, max_chars=512):
+    """Select the paragraphs worth classifying, truncated for the model"""
+    return [
+        paragraphs[i][:max_chars]
+        for i in section_candidate_indices(paragraphs, max_paragraphs, min_length)
+    ]
+
+
+# Header spellings of each label, compared after lowercasing, replacing "&"
+# with "and" and collapsing whitespace
+SECTION_HEADERS = {
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience", "career",
+        "employment", "employment history", "work history", "career history", "professional background",
+        "internship", "internships",
+    ],
+    "education": [
+        "education", "academic background", "education and training", "educational background",
+        "academic qualifications", "education and certifications",
+    ],
+    "skills": [
+        "skills", "technical skills", "key skills", "core skills", "core competencies", "competencies",
+        "skills and abilities", "skills and competencies", "technical proficiencies", "areas of expertise",
+    ],
+    "summary": [
+        "summary", "professional summary", "career summary", "executive summary", "profile",
+        "professional profile", "objective", "career objective", "about me",
+    ],
+    "achievements": [
+        "achievements", "key achievements", "accomplishments", "awards", "honors", "honours",
+        "awards and honors", "honors and awards", "awards and achievements", "recognition",
+    ],
+}
+
+# Words a title-case header may leave in lower case ("Education and Training")
+MINOR_WORDS = {"and", "&", "/", "of", "the", "in", "for", "to"}
+HEADER_LINE_PATTERN = re.compile(r"^[ \t]*(?P<header>[A-Za-z][A-Za-z &/]{1,40})[ \t]*(?P<colon>[:\-\u2013\u2014|])?[ \t]*(?P<rest>.*)$")
+
+
+class HeaderSectionDetector:
+    """Label paragraphs by their section header, without a model.
+
+    The first line of a paragraph is matched against SECTION_HEADERS:
+    - a paragraph whose first line is only a header ("EXPERIENCE") is the
+      strongest cue
+    - a header followed by content on the same line ("Skills: Python, SQL")
+    - paragraphs after a header line belong to its section, up to the next
+      header-like line
+    Headers that are not in capitals or title case are less certain. Results
+    are pipeline-style dicts, or None where no header applies.
+    """
+
+    def __init__(self, labels=SECTION_LABELS, headers=None, header_confidence=0.95,
+                 inline_header_confidence=0.9, following_confidence=0.9, lowercase_penalty=0.15):
+        self.labels = list(labels)
+        self.header_confidence = header_confidence
+        self.inline_header_confidence = inline_header_confidence
+        self.following_confidence = following_confidence
+        self.lowercase_penalty = lowercase_penalty
+        self._headers = {}
+        for label, spellings in (headers or SECTION_HEADERS).items():
+            if label in self.labels:
+                for spelling in spellings:
+                    self._headers[self._normalize(spelling)] = label
+
+    @staticmethod
+    def _normalize(header):
+        return " ".join(header.lower().replace("&", " and ").replace("/", " and ").split())
+
+    def _result(self, sequence, label, confidence):
+        others = [other for other in self.labels if other != label]
+        rest = (1.0 - confidence) / len(others) if others else 0.0
+        return {"sequence": sequence, "labels": [label] + others, "scores": [confidence] + [rest] * len(others)}
+
+    def _header(self, paragraph):
+        """``(label or None, confidence, header_line)`` for a header-like first line, else None;
+        ``header_line`` is False for a header with content after it on the same line"""
+        match = HEADER_LINE_PATTERN.match(paragraph.strip().split("\n", 1)[0])
+        if not match or (match.group("rest") and match.group("colon") != ":"):
+            return None
+        header = match.group("header").strip()
+        emphasized = header.isupper() or all(
+            word[0].isupper() for word in header.split() if word.lower() not in MINOR_WORDS
+        )
+        label = self._headers.get(self._normalize(header))
+        if label is None:
+            # An unknown header ("CERTIFICATIONS", "Languages: ...") still ends the previous section
+            return (None, 0.0, False) if emphasized and len(header.split()) <= 4 else None
+
+        confidence = self.inline_header_confidence if match.group("rest") else self.header_confidence
+        if not emphasized:
+            confidence -= self.lowercase_penalty
+        return label, confidence, not match.group("rest")
+
+    def detect(self, paragraph):
+        """Pipeline-style result for ``paragraph`` from its own header, or None"""
+        header = self._header(paragraph)
+        if header is None or header[0] is None:
+            return None
+        return self._result(paragraph, header[0], header[1])
+
+    def detect_all(self, paragraphs):
+        """Results for every paragraph of a document, in order, using the section each one falls in"""
+        results = []
+        current = None  # (label, confidence) of the section the paragraphs are in
+        for paragraph in paragraphs:
+            header = self._header(paragraph)
+            if header is None:
+                results.append(self._result(paragraph, *current) if current else None)
+                continue
+            label, confidence, header_line = header
+            results.append(self._result(paragraph, label, confidence) if label else None)
+            current = (label, min(confidence, self.following_confidence)) if label and header_line else None
+        return results
+
+
+class BatchedZeroShotClassifier:
+    """Batched drop-in for calling a zero-shot-classification pipeline in a loop.
+
+    Every (paragraph, label) pair is tokenized as an NLI premise/hypothesis
+    pair and sent through the pipeline's model in padded batches of
+    ``batch_size`` pairs. Scores are normalized exactly like the pipeline
+    does, so results match ``classifier(text, candidate_labels=labels)``.
+    """
+
+    def __init__(self, zero_shot_pipeline, batch_size=16, hypothesis_template="This example is {}."):
+        self.pipeline = zero_shot_pipeline
+        self.batch_size = max(1, int(batch_size))
+        self.hypothesis_template = hypothesis_template
+
+    @property
+    def entailment_id(self):
+        for label, ind in self.pipeline.model.config.label2id.items():
+            if label.lower().startswith("entail"):
+                return ind
+        return -1
+
+    def _forward_kwargs(self):
+        # Sequence classification heads should not build a decoder cache
+        if "use_cache" in inspect.signature(self.pipeline.model.forward).parameters:
+            return {"use_cache": False}
+        return {}
+
+    def _entailment_logits(self, pairs):
+        """Run all premise/hypothesis pairs through the model, in input order"""
+        import torch
+
+        tokenizer = self.pipeline.tokenizer
+        model = self.pipeline.model
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        forward_kwargs = self._forward_kwargs()
+
+        # Group pairs of similar length so each batch carries little padding
+        order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][0]))
+        logits = [None] * len(pairs)
+
+        with torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                batch_ids = order[start:start + self.batch_size]
+                MODEL_BATCH_SIZE.observe(len(batch_ids), model="sections")
+                with MODEL_SECONDS.time(model="sections", step="tokenize"):
+                    encoded = tokenizer(
+                        [pairs[i][0] for i in batch_ids],
+                        [pairs[i][1] for i in batch_ids],
+                        padding=True,
+                        truncation="only_first",
+                        return_tensors="pt",
+                    )
+                model_inputs = {
+                    k: encoded[k].to(model.device)
+                    for k in tokenizer.model_input_names if k in encoded
+                }
+                with MODEL_SECONDS.time(model="sections", step="forward"):
+                    batch_logits = model(**model_inputs, **forward_kwargs).logits.float().cpu().numpy()
+                for row, i in enumerate(batch_ids):
+                    logits[i] = batch_logits[row]
+
+        return np.stack(logits)
+
+    def classify(self, sequences, candidate_labels):
+        """Classify each sequence, returning pipeline-style result dicts.
+
+        Each result has ``labels`` sorted by likelihood and matching ``scores``.
+        """
+        if not sequences:
+            return []
+
+        pairs = [
+            (sequence, self.hypothesis_template.format(label))
+            for sequence in sequences
+            for label in candidate_labels
+        ]
+        logits = self._entailment_logits(pairs)
+        reshaped = logits.reshape((len(sequences), len(candidate_labels), -1))
+
+        entailment_id = self.entailment_id
+        if len(candidate_labels) == 1:
+            # softmax entailment vs. contradiction for a single label
+            contradiction_id = -1 if entailment_id == 0 else 0
+            entail_contr = reshaped[..., [contradiction_id, entailment_id]]
+            scores = np.exp(entail_contr) / np.exp(entail_contr).sum(-1, keepdims=True)
+            scores = scores[..., 1]
+        else:
+            # softmax the entailment logits over all candidate labels
+            entail = reshaped[..., entailment_id]
+            scores = np.exp(entail) / np.exp(entail).sum(-1, keepdims=True)
+
+        results = []
+        for sequence, row in zip(sequences, scores):
+            top_inds = list(reversed(row.argsort()))
+            results.append({
+                "sequence": sequence,
+                "labels": [candidate_labels[i] for i in top_inds],
+                "scores": row[top_inds].tolist(),
+            })
+        return results
+
+
+class EmbeddingSectionClassifier:
+    """Section classifier built on a small sentence-embedding model.
+
+    Paragraphs are mean-pooled into normalized embeddings and compared with
+    the prototype embeddings of every label in one cosine-similarity matrix
+    multiply. Each label scores its best-matching prototype, and the label
+    scores are softmax-normalized so results use the same contract and
+    confidence threshold as the zero-shot backend.
+    """
+
+    def __init__(self, model_name, prototypes=None, batch_size=32, max_length=256,
+                 temperature=0.05, cache_dir=None, model_config=None):
+        from transformers import AutoTokenizer
+
+        from inference_backends import load_model, weights_variant
+
+        self.model_name = model_name
+        self.prototypes = prototypes or SECTION_PROTOTYPES
+        self.batch_size = max(1, int(batch_size))
+        self.max_length = max_length
+        self.temperature = temperature
+        self.cache_dir = cache_dir
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = load_model(model_name, model_config or {}, task="feature-extraction")
+        self.weights = weights_variant(self.model)
+        self._label_cache = {}
+
+    def embed(self, texts):
+        """Return L2-normalized mean-pooled embeddings, one row per text"""
+        import torch
+
+        rows = []
+        with torch.inference_mode():
+            for start in range(0, len(texts), self.batch_size):
+                batch = list(texts[start:start + self.batch_size])
+                MODEL_BATCH_SIZE.observe(len(batch), model="sections")
+                with MODEL_SECONDS.time(model="sections", step="tokenize"):
+                    encoded = self.tokenizer(
+                        batch,
+                        padding=True,
+                        truncation=True,
+                        max_length=self.max_length,
+                        return_tensors="pt",
+                    )
+                with MODEL_SECONDS.time(model="sections", step="forward"):
+                    hidden = self.model(**encoded).last_hidden_state
+                mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)
+                rows.append(torch.nn.functional.normalize(pooled, dim=-1).float().cpu().numpy())
+        return np.concatenate(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+
+    def _cache_key(self, labels):
+        # Embeddings from the fp32, quantized and ONNX backends differ, so each keeps its own file
+        payload = repr((self.model_name, self.weights, self.max_length, [(label, self.prototypes[label]) for label in labels]))
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def label_embeddings(self, labels):
+        """Return (prototype embeddings, owning label index) for ``labels``.
+
+        Computed once per label set and kept in memory, and on disk as well
+        when ``cache_dir`` is set.
+        """
+        labels = tuple(labels)
+        if labels in self._label_cache:
+            return self._label_cache[labels]
+
+        owners = np.array([i for i, label in enumerate(labels) for _ in self.prototypes[label]])
+        cache_path = None
+        embeddings = None
+        if self.cache_dir:
+            cache_path = os.path.join(self.cache_dir, f"section_prototypes_{self._cache_key(labels)}.npy")
+            if os.path.exists(cache_path):
+                embeddings = np.load(cache_path)
+
+        if embeddings is None:
+            embeddings = self.embed([text for label in labels for text in self.prototypes[label]])
+            if cache_path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                np.save(cache_path, embeddings)
+
+        self._label_cache[labels] = (embeddings, owners)
+        return self._label_cache[labels]
+
+    def classify(self, sequences, candidate_labels):
+        """Classify each sequence, returning pipeline-style result dicts"""
+        if not sequences:
+            return []
+
+        prototypes, owners = self.label_embeddings(candidate_labels)
+        similarities = self.embed(sequences) @ prototypes.T  # (sequences, prototypes)
+
+        label_scores = np.full((len(sequences), len(candidate_labels)), -np.inf, dtype=np.float32)
+        for i in range(len(candidate_labels)):
+            label_scores[:, i] = similarities[:, owners == i].max(axis=1)
+
+        logits = label_scores / self.temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        scores = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+
+        results = []
+        for sequence, row in zip(sequences, scores):
+            top_inds = list(reversed(row.argsort()))
+            results.append({
+                "sequence": sequence,
+                "labels": [candidate_labels[i] for i in top_inds],
+                "scores": row[top_inds].tolist(),
+            })
+        return results
+
+
+def create_section_engine(model_config, zero_shot_pipeline=None):
+    """Build the section classifier selected by ``model_config["section_backend"]``"""
+    backend = model_config.get("section_backend", "zero_shot")
+
+    if backend == "embedding":
+        return EmbeddingSectionClassifier(
+            model_config.get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2"),
+            batch_size=model_config.get("embedding_batch_size", 32),
+            temperature=model_config.get("embedding_temperature", 0.05),
+            cache_dir=model_config.get("embedding_cache_dir"),
+            model_config=model_config,
+        )
+
+    if backend == "zero_shot":
+        if zero_shot_pipeline is None:
+            from inference_backends import load_pipeline
+
+            zero_shot_pipeline = load_pipeline(
+                "zero-shot-classification",
+                model_config.get("classification_model", "facebook/bart-large-mnli"),
+                model_config
+            )
+        return BatchedZeroShotClassifier(
+            zero_shot_pipeline,
+            batch_size=model_config.get("classification_batch_size", 16)
+        )
+
+    raise ValueError(f"Unknown section_backend: {backend!r} (expected 'zero_shot' or 'embedding')")
@@ -0,0 +1,65 @@
+"""
+HTTP server for AI ATS Resume Rater
+Serves the Gradio UI together with the JSON scoring API (api.py,
+API_CONFIG["enabled"]) and operational endpoints on one port:
+- /v1/score, /v1/score/batch, /v1/health: structured scoring API
+- GET /metrics: Prometheus text-format metrics (METRICS_CONFIG["metrics_endpoint"])
+- POST /debug/profile?requests=N: cProfile the next N analyses (METRICS_CONFIG["profiling_endpoint"])
+
+Usage: python server.py [--host 0.0.0.0] [--port 7860] (python app.py starts here too)
+"""
+
+import argparse
+
+import gradio as gr
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+
+import api
+import app as ats_app
+from config import API_CONFIG, METRICS_CONFIG, MODEL_CONFIG
+from metrics import CONTENT_TYPE, REGISTRY, profiler
+
+
+def create_server(ui=True):
+    """FastAPI app with the API and operational routes, plus the Gradio UI when ``ui``"""
+    server = FastAPI(title="AI ATS Resume Rater")
+
+    @server.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        if not METRICS_CONFIG.get("metrics_endpoint", True):
+            raise HTTPException(status_code=404)
+        return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    @server.post("/debug/profile")
+    def profile(requests: int = 1):
+        if not METRICS_CONFIG.get("profiling_endpoint", False):
+            raise HTTPException(status_code=404)
+        return {"armed_requests": profiler.arm(requests), "output_dir": profiler.output_dir}
+
+    if API_CONFIG.get("enabled", True):
+        server.include_router(api.router)
+
+    if not ui:
+        return server
+    # Mounted last so the routes above take precedence over the UI
+    return gr.mount_gradio_app(server, ats_app.demo, path="/")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the resume rater UI with the JSON API and /metrics.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7860)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    if MODEL_CONFIG.get("warm_up_on_launch", True):
+        ats_app.models.warm_up(background=True)
+    # API clients reuse connections across requests instead of reconnecting
+    uvicorn.run(create_server(), host=args.host, port=args.port,
+                timeout_keep_alive=API_CONFIG.get("keep_alive_seconds", 75))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Keyword taxonomy for AI ATS Resume Rater
+The scored keyword categories, the related keyword lists and the aliases in
+config.py are compiled once into an immutable index: each distinct keyword
+(by normalized form) gets a bit, each category a bitmask of its keywords, and
+one KeywordMatcher finds every keyword and alias in a single pass. Scoring a
+resume is then that scan plus integer mask operations.
+
+A JSON file (TAXONOMY_CONFIG["path"]) may override any of the lists.
+TaxonomyStore checks it for changes and swaps in the recompiled taxonomy, so
+running workers pick up edits without a restart.
+
+Usage:
+    python taxonomy.py export taxonomy.json   # Write the config.py taxonomy as a starting point
+    python taxonomy.py check taxonomy.json    # Compile a file and print its version and sizes
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from types import MappingProxyType
+
+from keyword_matcher import KeywordMatcher, normalize_keyword
+from result_cache import config_version
+
+# What a malformed taxonomy file can raise while it is read and compiled
+LOAD_ERRORS = (OSError, ValueError, KeyError, TypeError, AttributeError)
+
+
+def _popcount(bits):
+    return bin(bits).count("1")
+
+
+def _iter_bits(bits):
+    """Positions of the set bits of ``bits``, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class Taxonomy:
+    """Compiled keyword taxonomy. Treat it as read-only: a new version is a new object.
+
+    ``categories`` (``{category: [keywords]}``) are scored; ``related`` adds
+    keywords per category that count as found but not towards the score;
+    ``aliases`` maps other spellings to a keyword. Related keywords that are
+    plain words shorter than ``min_related_length`` are left out.
+    """
+
+    def __init__(self, categories, related=None, aliases=None, version=None, min_related_length=3):
+        related = related or {}
+        aliases = aliases or {}
+        self.fingerprint = config_version(categories, related, aliases, min_related_length)
+        self.version = str(version or self.fingerprint)
+
+        alias_forms = {normalize_keyword(alias) for alias in aliases}
+        terms = []
+        term_by_form = {}
+        scored = {category: [] for category in categories}
+        members = {category: [] for category in categories}
+        # Scored keywords take the lowest bits, so found keywords list them first
+        for source, is_scored in ((categories, True), (related, False)):
+            for category, keywords in source.items():
+                if category not in members:
+                    raise ValueError(f"Related keywords for unknown category {category!r}")
+                for keyword in keywords:
+                    keyword = keyword.strip().lower()
+                    form = normalize_keyword(keyword)
+                    if not form:
+                        continue
+                    if form in alias_forms:
+                        if is_scored:
+                            raise ValueError(f"{keyword!r} is both a scored keyword and an alias")
+                        continue
+                    if not is_scored and form not in term_by_form and len(form) < min_related_length \
+                            and form.isalpha():
+                        continue
+                    if form not in term_by_form:
+                        term_by_form[form] = len(terms)
+                        terms.append(keyword)
+                    members[category].append(term_by_form[form])
+                    if is_scored:
+                        scored[category].append(terms[term_by_form[form]])
+        for category, keywords in scored.items():
+            if not keywords:
+                raise ValueError(f"Scored category {category!r} has no keywords")
+
+        self.terms = tuple(terms)
+        self._bits = {term: 1 << i for i, term in enumerate(terms)}
+        self.categories = MappingProxyType({category: tuple(dict.fromkeys(keywords)) for category, keywords in scored.items()})
+        self.masks = MappingProxyType({
+            category: sum(self._bits[term] for term in keywords) for category, keywords in self.categories.items()
+        })
+        self.vocabulary_masks = MappingProxyType({
+            category: sum(1 << i for i in set(ids)) for category, ids in members.items()
+        })
+        self._sizes = {category: len(keywords) for category, keywords in self.categories.items()}
+        # Multi-word scored keywords, which job matching treats as phrases
+        self.phrases = tuple(term for keywords in self.categories.values() for term in keywords if " " in term)
+
+        resolved = {}
+        for alias, keyword in aliases.items():
+            form = normalize_keyword(keyword)
+            if form not in term_by_form:
+                raise ValueError(f"Alias {alias!r} points to unknown keyword {keyword!r}")
+            resolved[alias.strip().lower()] = terms[term_by_form[form]]
+        self.aliases = MappingProxyType(resolved)
+
+        self.matcher = KeywordMatcher(
+            {category: [terms[i] for i in sorted(set(ids))] for category, ids in members.items()},
+            aliases=resolved
+        )
+
+    def __len__(self):
+        return len(self.terms)
+
+    def bits(self, terms):
+        """Bitmap of the given canonical keywords (unknown ones are ignored)"""
+        bits = 0
+        for term in terms:
+            bits |= self._bits.get(term, 0)
+        return bits
+
+    def terms_in(self, bits):
+        """Canonical keywords of a bitmap, scored ones first"""
+        return [self.terms[i] for i in _iter_bits(bits)]
+
+    def match(self, text):
+        """Bitmap of every keyword (or alias of one) in ``text``"""
+        return self.bits(self.matcher.scan(text))
+
+    def analyze(self, text):
+        """``(scores, found_keywords)``: per scored category, the share of its keywords
+        found (0-100) and the scored and related keywords found"""
+        found = self.match(text)
+        scores = {
+            category: min(100, _popcount(found & mask) / self._sizes[category] * 100)
+            for category, mask in self.masks.items()
+        }
+        found_keywords = {category: self.terms_in(found & mask) for category, mask in self.vocabulary_masks.items()}
+        return scores, found_keywords
+
+    def missing(self, category, found_keywords, limit=None):
+        """Scored keywords of ``category`` not among ``found_keywords``, in category order"""
+        absent = self.masks[category] & ~self.bits(found_keywords)
+        return [term for term in self.categories[category] if self._bits[term] & absent][:limit]
+
+    @classmethod
+    def from_dict(cls, spec):
+        """Compile a definition shaped like ``default_spec()``"""
+        return cls(spec["categories"], spec.get("related"), spec.get("aliases"), spec.get("version"),
+                   spec.get("min_related_length", 3))
+
+
+def default_spec():
+    """The taxonomy defined by the keyword lists in config.py"""
+    from config import ATS_KEYWORDS, KEYWORD_ALIASES, RELATED_KEYWORDS, TAXONOMY_CONFIG
+
+    return {
+        "version": None,
+        "categories": ATS_KEYWORDS,
+        "related": RELATED_KEYWORDS,
+        "aliases": KEYWORD_ALIASES,
+        "min_related_length": TAXONOMY_CONFIG.get("min_related_length", 3),
+    }
+
+
+def load_taxonomy(path=None):
+    """Compile the config.py taxonomy, with the keys of the JSON file at ``path`` replacing its lists"""
+    spec = default_spec()
+    if path:
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+        if not isinstance(overrides, dict):
+            raise ValueError(f"{path} must hold a JSON object")
+        spec.update(overrides)
+        missing = set(default_spec()["categories"]) - set(spec["categories"])
+        if missing:
+            raise ValueError(f"{path} lacks scored categories: {', '.join(sorted(missing))}")
+    return Taxonomy.from_dict(spec)
+
+
+class TaxonomyStore:
+    """The current taxonomy, recompiled when its file changes.
+
+    ``current()`` checks the file's modification time and size at most every
+    ``check_interval`` seconds. A changed file is compiled in the calling
+    thread and swapped in whole; requests keep using the taxonomy they started
+    with. A file that fails to load is reported and the previous taxonomy stays
+    (at startup, the one built from the config.py lists).
+    """
+
+    def __init__(self, path=None, check_interval=5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._checked = time.monotonic()
+        try:
+            self._taxonomy = load_taxonomy(path)
+        except LOAD_ERRORS as e:
+            print(f"Using the config.py keyword taxonomy: failed to load {path}: {e}")
+            self._taxonomy = load_taxonomy()
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except (TypeError, OSError):
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def current(self):
+        """The taxonomy to use for one request"""
+        if self.path and time.monotonic() - self._checked >= self.check_interval:
+            self.reload()
+        return self._taxonomy
+
+    def reload(self, force=False):
+        """Recompile the file if it changed (or ``force``); True when a new taxonomy was swapped in"""
+        # One thread reloads; the others carry on with the current taxonomy
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked = time.monotonic()
+            stamp = self._file_stamp()
+            if stamp is None or (stamp == self._stamp and not force):
+                return False
+            self._stamp = stamp
+            try:
+                taxonomy = load_taxonomy(self.path)
+            except LOAD_ERRORS as e:
+                print(f"Keeping keyword taxonomy {self._taxonomy.version}: failed to load {self.path}: {e}")
+                return False
+            self._taxonomy = taxonomy
+            print(f"Loaded keyword taxonomy {taxonomy.version} from {self.path} ({len(taxonomy)} keywords)")
+            return True
+        finally:
+            self._lock.release()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or check a keyword taxonomy file.")
+    parser.add_argument("command", choices=["export", "check"])
+    parser.add_argument("path", help="Taxonomy JSON file")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        spec = default_spec()
+        with open(args.path, "w", encoding="utf-8") as f:
+            json.dump(spec, f, indent=2)
+            f.write("\n")
+        print(f"Wrote taxonomy {load_taxonomy().version} to {args.path}; set \"version\" to name your edits")
+        return 0
+
+    try:
+        taxonomy = load_taxonomy(args.path)
+    except LOAD_ERRORS as e:
+        print(f"{args.path}: {e}", file=sys.stderr)
+        return 1
+    print(f"Taxonomy {taxonomy.version} (fingerprint {taxonomy.fingerprint}): {len(taxonomy)} keywords, "
+          f"{len(taxonomy.aliases)} aliases")
+    for category, keywords in taxonomy.categories.items():
+        print(f"  {category:<17} {len(keywords):>4} scored  "
+              f"{_popcount(taxonomy.vocabulary_masks[category]):>4} recognized")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""Shared setup for the AI ATS Resume Rater tests: import path and stub models"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "benchmarks")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
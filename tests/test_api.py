@@ -0,0 +1,43 @@
+"""JSON scoring API: requests are timed on /metrics and can be profiled"""
+
+import glob
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api
+import app as ats_app
+from metrics import REQUEST_SECONDS, profiler
+from stub_models import install_stub_models
+
+RESUME = (
+    "EXPERIENCE\nSenior Software Engineer, Acme Corp (2019 - Present)\n"
+    "- Led a team of 5 engineers to deliver a microservices platform on AWS with Python and Docker\n\n"
+    "SKILLS\nPython, Java, SQL, Docker, Kubernetes, communication, leadership"
+)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    install_stub_models(ats_app)
+    monkeypatch.setattr(ats_app, "analysis_cache", None)
+    monkeypatch.setattr(profiler, "output_dir", str(tmp_path))
+    server = FastAPI()
+    server.include_router(api.router)
+    return TestClient(server)
+
+
+def test_score_observes_request_seconds(client):
+    before = REQUEST_SECONDS.snapshot(outcome="ok")["count"]
+    response = client.post("/v1/score", json={"text": RESUME})
+    assert response.status_code == 200
+    assert REQUEST_SECONDS.snapshot(outcome="ok")["count"] == before + 1
+
+
+def test_batch_consumes_armed_profile(client, tmp_path):
+    profiler.arm(1)
+    response = client.post("/v1/score/batch", json={"resumes": [{"text": RESUME}, {"text": RESUME}]})
+    assert response.status_code == 200
+    assert profiler.remaining == 0
+    assert glob.glob(str(tmp_path / "score_submissions-*.prof"))
@@ -0,0 +1,66 @@
+"""Bulk scoring: near-duplicates never reuse the row of an original that failed"""
+
+import types
+
+import batch
+from config import UPLOAD_CONFIG
+from dedup import DuplicateIndex
+
+RESUME = (
+    "Senior software engineer with eight years of experience building Python services on AWS, "
+    "leading teams of engineers and mentoring juniors in testing, Docker and Kubernetes."
+)
+
+
+def fake_app(fail_first_call):
+    calls = []
+
+    def run_analysis_batch(texts, job_description=""):
+        calls.append(len(texts))
+        if fail_first_call and len(calls) == 1:
+            raise RuntimeError("model crashed")
+        return [{"text": text} for text in texts]
+
+    app = types.SimpleNamespace(run_analysis_batch=run_analysis_batch, calculate_overall_score=lambda a: 70)
+    return app, calls
+
+
+def test_duplicate_of_failed_original_is_scored(monkeypatch):
+    monkeypatch.setattr(batch, "_result_row", lambda file_id, text, analysis, score: {"file": file_id, "score": score})
+    dedup = batch._Deduplicator(DuplicateIndex(threshold=0.8))
+    app, calls = fake_app(fail_first_call=True)
+
+    rows = batch._analyze_chunk(app, [("a.txt", RESUME, None), ("b.txt", RESUME + " ", None)], "", dedup)
+    assert "error" in rows[0]
+    assert rows[1] == {"file": "b.txt", "score": 70}
+    assert "a.txt" not in dedup.rows and "a.txt" in dedup.failed
+
+    # A later chunk's duplicate of the failed original is scored too
+    rows = batch._analyze_chunk(app, [("c.txt", RESUME, None)], "", dedup)
+    assert rows[0] == {"file": "c.txt", "score": 70}
+    assert calls == [1, 1, 1]
+
+
+def test_duplicate_reuses_successful_original(monkeypatch):
+    monkeypatch.setattr(batch, "_result_row", lambda file_id, text, analysis, score: {"file": file_id, "score": score})
+    dedup = batch._Deduplicator(DuplicateIndex(threshold=0.8))
+    app, calls = fake_app(fail_first_call=False)
+
+    rows = batch._analyze_chunk(app, [("a.txt", RESUME, None), ("b.txt", RESUME, None)], "", dedup)
+    assert rows[1]["duplicate_of"] == "a.txt" and rows[1]["file"] == "b.txt"
+    assert calls == [1]
+
+
+def test_oversized_archive_member_is_not_read(tmp_path, monkeypatch):
+    import zipfile
+
+    monkeypatch.setitem(UPLOAD_CONFIG, "max_file_size_mb", 0.001)
+    archive = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive, "w") as f:
+        f.writestr("big.txt", "x" * 5000)
+        f.writestr("small.txt", RESUME)
+
+    items = {file_id: payload for file_id, payload, _ in batch.iter_resume_sources(str(archive))}
+    assert isinstance(items["big.txt"], batch.FileTooLargeError)
+    assert items["small.txt"] == RESUME.encode("utf-8")
+    assert "too large" in batch._extract_item(("big.txt", items["big.txt"], "big.txt"))[2]
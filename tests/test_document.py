@@ -0,0 +1,13 @@
+"""Document segmentation keeps the analyzers' original paragraph boundaries"""
+
+from document import Document
+
+
+def test_paragraphs_split_on_blank_lines_only():
+    text = "EXPERIENCE\nEngineer at Acme\n\nSKILLS\nPython\n \nSQL\n\n\n\nEDUCATION\n  BSc  "
+    assert Document(text).paragraphs == [
+        "EXPERIENCE\nEngineer at Acme",
+        "SKILLS\nPython\n \nSQL",
+        "EDUCATION\n  BSc",
+    ]
+    assert Document(text).paragraphs == [p.strip() for p in text.split("\n\n") if p.strip()]
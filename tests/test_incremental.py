@@ -0,0 +1,36 @@
+"""Re-analyzing an upload with a new job description only reruns job matching"""
+
+import pytest
+
+import app as ats_app
+from metrics import STAGE_RESULTS
+from stub_models import install_stub_models
+
+RESUME = (
+    "EXPERIENCE\nSenior Software Engineer, Acme Corp (2019 - Present)\n"
+    "- Led a team of 5 engineers to deliver a microservices platform on AWS with Python and Docker\n\n"
+    "SKILLS\nPython, Java, SQL, Docker, Kubernetes, communication, leadership"
+)
+
+
+@pytest.fixture
+def resume_path(tmp_path, monkeypatch):
+    install_stub_models(ats_app)
+    monkeypatch.setattr(ats_app, "analysis_cache", None)
+    path = tmp_path / "resume.txt"
+    path.write_text(RESUME, encoding="utf-8")
+    return str(path)
+
+
+def _ran(stage):
+    return sum(STAGE_RESULTS.value(stage=stage, status=status) for status in ("ok", "error", "timeout"))
+
+
+def test_new_job_description_reruns_only_job_match_without_cache(resume_path):
+    assert not ats_app.analyze_resume(resume_path, "Python developer with AWS").startswith("❌")
+    before = {stage: _ran(stage) for stage in ("keywords", "sentiment", "sections", "readability", "job_match")}
+
+    assert not ats_app.analyze_resume(resume_path, "Java engineer with Kubernetes").startswith("❌")
+    assert _ran("job_match") == before["job_match"] + 1
+    for stage in ("keywords", "sentiment", "sections", "readability"):
+        assert _ran(stage) == before[stage]
@@ -0,0 +1,43 @@
+"""Model registry: failed loads are remembered instead of retried per call"""
+
+import pytest
+
+from models import FAILED, READY, ModelRegistry
+
+
+def test_failed_load_is_not_retried_until_warm_up():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("hub unreachable")
+        return "model"
+
+    registry = ModelRegistry()
+    registry.register("sentiment", loader)
+    for _ in range(3):
+        with pytest.raises(OSError):
+            registry.get("sentiment")
+    assert len(calls) == 1
+    assert registry.status()["sentiment"]["state"] == FAILED
+
+    registry.warm_up(background=False)
+    assert registry.get("sentiment") == "model"
+    assert len(calls) == 2
+    assert registry.status()["sentiment"]["state"] == READY
+
+
+def test_failed_load_is_retried_after_retry_after():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        raise OSError("hub unreachable")
+
+    registry = ModelRegistry(retry_after=0)
+    registry.register("sections", loader)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            registry.get("sections")
+    assert len(calls) == 2
@@ -0,0 +1,174 @@
+"""
+Pre-fork multi-worker server for AI ATS Resume Rater
+The parent process binds the listening socket and loads the models once, then
+forks workers that all accept connections on that socket. Workers inherit the
+model weights copy-on-write: the weights are never written after loading and
+the garbage collector is frozen before forking, so their pages stay shared and
+each extra worker costs its own Python heap instead of another copy of the
+models. Use benchmarks/bench_worker_memory.py to check the savings.
+
+Workers serve the JSON API and operational endpoints (server.py). The Gradio
+UI keeps per-process queue state, so --with-ui needs a proxy with sticky
+sessions in front of the workers.
+Usage: python workers.py [--workers 4] [--host 0.0.0.0] [--port 7860] [--with-ui] [--no-preload]
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+import app as ats_app
+import server
+from config import API_CONFIG, SERVING_CONFIG
+
+
+def _torch_modules(model):
+    """torch modules behind a loaded model (pipelines and the classifiers wrap them)"""
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return []
+    candidates = [model, getattr(model, "model", None), getattr(getattr(model, "pipeline", None), "model", None)]
+    return [candidate for candidate in candidates if isinstance(candidate, torch.nn.Module)]
+
+
+def freeze_model_weights(model):
+    """Make sure nothing writes to a model's weights after loading, so forked
+    workers keep sharing their pages; returns the bytes of weights found"""
+    size = 0
+    for module in _torch_modules(model):
+        module.eval()
+        module.requires_grad_(False)
+        size += sum(t.numel() * t.element_size() for t in list(module.parameters()) + list(module.buffers()))
+    return size
+
+
+def preload_models():
+    """Load every model in this (parent) process before workers are forked"""
+    # One intra-op thread while loading: OpenMP thread pools do not survive fork()
+    torch = sys.modules.get("torch")
+    if torch is None:
+        try:
+            import torch
+        except ImportError:
+            torch = None
+    if torch is not None:
+        torch.set_num_threads(1)
+
+    ats_app.models.warm_up(background=False)
+    total = 0
+    for name, info in ats_app.models.status().items():
+        if info["state"] == "ready":
+            total += freeze_model_weights(ats_app.models.get(name))
+    print(f"Preloaded models in parent {os.getpid()}: {total / 2**20:.0f} MiB of weights shared with workers")
+
+
+def _run_worker(sock, with_ui, threads, preloaded):
+    import uvicorn
+
+    # Restore default handlers; uvicorn installs its own for a graceful shutdown
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+    if not preloaded:
+        ats_app.models.warm_up(background=False)
+
+    config = uvicorn.Config(
+        server.create_server(ui=with_ui),
+        timeout_keep_alive=API_CONFIG.get("keep_alive_seconds", 75),
+    )
+    print(f"Worker {os.getpid()} ready", flush=True)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(workers, host="0.0.0.0", port=7860, preload=True, with_ui=False, threads=None):
+    """Bind ``host:port``, optionally preload the models, and keep ``workers``
+    forked worker processes running until SIGTERM/SIGINT"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    if preload:
+        preload_models()
+    threads = threads or max(1, (os.cpu_count() or 1) // workers)
+
+    # Objects that exist now live as long as the workers; moving them to the
+    # permanent generation keeps collections in workers from writing to their pages
+    gc.collect()
+    gc.freeze()
+
+    children = set()
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(sock, with_ui, threads, preload)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"Serving on http://{host}:{port} with {workers} workers ({threads} torch threads each)")
+    # Buffered output would otherwise be copied into, and printed again by, every worker
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for _ in range(workers):
+        spawn()
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            print(f"Worker {pid} exited with status {status}; starting a replacement")
+            time.sleep(1)  # Avoid a tight respawn loop when workers crash on startup
+            spawn()
+    sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the resume rater API from pre-forked workers.")
+    parser.add_argument("--workers", type=int, default=SERVING_CONFIG.get("workers", 2))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7860)
+    parser.add_argument("--threads", type=int, default=SERVING_CONFIG.get("threads_per_worker"),
+                        help="torch intra-op threads per worker (default: CPU count / workers)")
+    parser.add_argument("--with-ui", action="store_true", help="Also mount the Gradio UI (needs sticky sessions)")
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        default=SERVING_CONFIG.get("preload_models", True),
+                        help="Load the models in every worker instead of once in the parent")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    serve(args.workers, args.host, args.port, preload=args.preload, with_ui=args.with_ui, threads=args.threads)
+
+
+if __name__ == "__main__":
+    main()